@@ -1,4 +1,5 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,9 +9,71 @@ ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD")
 
 ADMIN_URL = "https://pre.bonp.me/member/"
 WAITING_TIMEOUT_MS = 15000 # 15 seconds
+CLEANUP_API_CONCURRENCY = 5 # Max parallel delete requests of the API cleanup
+UPLOAD_MAX_IN_FLIGHT = 3 # Max media uploads to /api/bot/action pending at the same time
+
+# Adaptive timeouts: latencies observed per operation class (login, deploy, image_upload,
+# api_preview) are kept across runs, and timeouts are derived as p99 x margin.
+ADAPTIVE_TIMEOUT_FILE = Path(__file__).parent / ".cache" / "latency_stats.json"
+ADAPTIVE_TIMEOUT_MARGIN = 3.0           # timeout = p99 x margin
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 20       # below this, the fixed defaults are used
+ADAPTIVE_TIMEOUT_FLOOR_MS = 5000        # never wait less than 5 seconds
+ADAPTIVE_TIMEOUT_CEILING_MS = 90000     # never wait more than 90 seconds
+
+# Record-and-replay network cache for static assets and read-only APIs (`--network-cache`)
+NETWORK_CACHE_DIR = Path(__file__).parent / ".cache" / "network"
+NETWORK_CACHE_TTL_S = 24 * 60 * 60      # entries expire after one day
+NETWORK_CACHE_MAX_BYTES = 200 * 1024 * 1024  # least recently used entries are evicted above 200 MB
+
+# Asset URLs of already uploaded test media, reused instead of uploading again (`--reuse-media`)
+MEDIA_REGISTRY_FILE = Path(__file__).parent / ".cache" / "media_registry.json"
+MEDIA_REGISTRY_TTL_S = 7 * 24 * 60 * 60 # forget asset URLs after a week
+
+# Warm browser context pool (`--reuse-contexts`): contexts stay logged in on the bot's
+# chatflow screen between tests and are replaced after a number of tests
+CONTEXT_POOL_SIZE = 1                   # warm contexts opened and kept per bot and worker
+CONTEXT_POOL_MAX_USES = 5               # recycle a context after 5 tests
+
+# Performance history of the test steps (see tests/web/utils/perf_history.py)
+PERF_HISTORY_DB = Path(__file__).parent / "report" / "perf_history.sqlite"
+PERF_BASELINE_RUNS = 7                  # rolling baseline = median of the previous 7 runs
+PERF_REGRESSION_THRESHOLD = 0.25        # flag steps more than 25% slower than the baseline
+
+# Stress scenarios (`--stress NxMxK`, see tests/web/utils/stress_scenarios.py): the bot grows to
+# N groups of M items with K button reactions each, and is measured at several sizes on the way
+STRESS_MEASURE_POINTS = 5               # sizes (numbers of groups) at which the bot is measured
+STRESS_RENDER_TIMEOUT_MS = 120000       # big bots take long to render; never wait more than 2 minutes
+STRESS_CURVE_DIR = Path(__file__).parent / "report" / "stress"
+
+# Page object locator usage profile (`--profile-locators`, see tests/web/page_objects/locators.py)
+LOCATOR_USAGE_FILE = Path(__file__).parent / "report" / "locator_usage.json"
+
+# Selector performance audit (`--selector-audit`, see tests/web/utils/selector_audit.py)
+SELECTOR_AUDIT_FILE = Path(__file__).parent / "report" / "selector_audit.json"
+SELECTOR_AUDIT_SAMPLES = 5              # timed queries per locator (the median is reported)
+SELECTOR_AUDIT_RETRIES = 2              # extra polls before a locator counts as not found on a screen
+SELECTOR_AUDIT_RETRY_INTERVAL_MS = 100
+SELECTOR_AUDIT_SLOW_MS = 15             # locators whose query takes longer are ranked as slow
+
+# Recorded staging responses replayed by the local mock server (`--target=mock`).
+# Recorded with `--record-mock`; contains session cookies, so it is git-ignored.
+MOCK_RECORDINGS_DIR = Path(__file__).parent / "mock_recordings"
+
+# Directory holding the cached login session (Playwright storage state).
+# Contains session cookies, so it is git-ignored.
+AUTH_STATE_DIR = Path(__file__).parent / ".auth"
 
 # Dictionary to hold version-specific bot names
 BOT_NAMES = {
     "1.0": {"name": "Jarr_regression_2509_API1"},
     "2.0": {"name": "Jarr_regression_2509_API2"}
-}
\ No newline at end of file
+}
+
+# Pools of bots used when running in parallel with pytest-xdist (`-n N`).
+# Each worker gets its own bot (gw0 -> first entry, gw1 -> second, ...) so the
+# Group1..Group5 flows of different workers never collide. The first entry must
+# stay the same as BOT_NAMES, the others have to exist on the admin site.
+BOT_POOLS = {
+    "1.0": [BOT_NAMES["1.0"]["name"], "Jarr_regression_2509_API1_w1", "Jarr_regression_2509_API1_w2", "Jarr_regression_2509_API1_w3"],
+    "2.0": [BOT_NAMES["2.0"]["name"], "Jarr_regression_2509_API2_w1", "Jarr_regression_2509_API2_w2", "Jarr_regression_2509_API2_w3"],
+}
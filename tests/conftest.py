@@ -1,12 +1,43 @@
 import pytest
 import logging
-from playwright.sync_api import Page
+import time
+import shutil
+from playwright.sync_api import Browser, BrowserContext, Page
 from pathlib import Path
 from tests.web.test_data import IMAGES
+from tests.web.utils.auth_helpers import storage_state_path, save_storage_state
+from tests.web.utils.timeouts import adaptive_timeouts
+from tests.web.utils.step_runner import (
+    StepRunner, reset_step_metrics, run_step_metrics_files, step_metrics_html, write_step_metrics
+    )
+from tests.web.utils.perf_history import PerfHistory, current_git_commit, load_step_records
+from tests.web.utils.har_analyzer import HAR_DIR, format_summary, har_path, write_summaries
+from tests.web.utils.mock_server import MockAdminServer, Recordings
+from tests.web.utils.network_cache import NetworkCache
+from tests.web.utils.media_registry import MediaRegistry
+from tests.web.utils.context_pool import ContextPool
+from tests.web.utils.resource_blocker import ResourceBlocker
+from tests.web.utils.popup_manager import PopupManager
+from tests.web.utils.api_helpers import ApiUnavailableError, bot_id_from_url
+from tests.web.utils.api_seeding import ApiSeeder
+from tests.web.utils.chatflow_compiler import load_definition
+from tests.web.utils.stress_scenarios import parse_scale
+from tests.web.utils.flow_graph import (
+    artifact_registry, flow_artifacts, flow_branches, flow_scope, order_by_dependencies
+    )
 
 # --- Import config and page objects ---
-from config import ADMIN_EMAIL, ADMIN_PASSWORD, ADMIN_URL, BOT_NAMES
-from tests.web.page_objects import LoginPage, BotListViewPage
+from config import (
+    ADMIN_EMAIL, ADMIN_PASSWORD, ADMIN_URL, BOT_NAMES, BOT_POOLS, AUTH_STATE_DIR, MOCK_RECORDINGS_DIR,
+    NETWORK_CACHE_DIR, NETWORK_CACHE_TTL_S, NETWORK_CACHE_MAX_BYTES, CONTEXT_POOL_SIZE, CONTEXT_POOL_MAX_USES,
+    STRESS_MEASURE_POINTS, MEDIA_REGISTRY_FILE, MEDIA_REGISTRY_TTL_S, LOCATOR_USAGE_FILE
+    )
+from tests.web.page_objects import LoginPage, BotListViewPage, ChatflowPage, CheckClearData
+from tests.web.utils.locator_registry import locator_registry
+from tests.web.test_data import CACHEABLE_API_GLOBS, PREREQUISITE_GROUPS, MEDIA_URL_KEYS
+from tests.web.resource_blocking import (
+    BLOCK_PROFILES, DEFAULT_HEADLESS_BLOCK_PROFILE, ESTIMATED_BYTES_PER_RESOURCE, ESTIMATED_BYTES_DEFAULT
+    )
 
 # --- Logging Configuration ---
 logging.basicConfig(
@@ -19,12 +50,209 @@ logger = logging.getLogger(__name__)
 def pytest_addoption(parser):
     """Adds a custom command-line option to pytest for API version."""
     parser.addoption(
-        "--api-version", action="store", default="2.0", help="Specify the API version to test: 1.0 or 2.0"
+        "--api-version", action="store", default="2.0",
+        help="Specify the API version to test: 1.0, 2.0, a comma separated list (1.0,2.0) or 'all'"
+    )
+    parser.addoption(
+        "--target", action="store", default="staging", choices=("staging", "mock"),
+        help="Run against the staging admin site or the local mock server replaying recorded responses"
+    )
+    parser.addoption(
+        "--record-mock", action="store_true", default=False,
+        help="Record full HAR files (with content) into MOCK_RECORDINGS_DIR for the mock server"
+    )
+    parser.addoption(
+        "--network-cache", action="store_true", default=False,
+        help="Replay static assets and whitelisted read-only APIs from an on-disk cache across contexts and runs"
+    )
+    parser.addoption(
+        "--api-cleanup", action="store_true", default=False,
+        help="Delete previous groups, coupons and segments through the backend API (CLEANUP_API_ENDPOINTS) "
+             "instead of the UI; the endpoints are not confirmed against every admin site yet"
+    )
+    parser.addoption(
+        "--api-seeding", action="store_true", default=False,
+        help="Create the prerequisite groups of a test through /api/bot/action (SEED_ACTION_PAYLOADS) instead of "
+             "the UI; the payloads are not confirmed against every admin site yet"
+    )
+    parser.addoption(
+        "--reuse-media", action="store_true", default=False,
+        help="Give video items the URL of an earlier upload of the same file instead of uploading it again"
+    )
+    parser.addoption(
+        "--block-profile", action="store", default=None, choices=sorted(BLOCK_PROFILES),
+        help=f"Resource blocking profile (tests/web/resource_blocking.py); defaults to '{DEFAULT_HEADLESS_BLOCK_PROFILE}' "
+             "for headless runs and 'none' for headed runs"
+    )
+    parser.addoption(
+        "--reuse-contexts", action="store_true", default=False,
+        help="Keep warm logged-in browser contexts on the bot's chatflow between tests (faster, less isolated)"
+    )
+    parser.addoption(
+        "--chatflow-def", action="append", default=[],
+        help="Chatflow definition (name in tests/web/chatflows/ or path) built by test_chatflow_definition; repeatable"
+    )
+    parser.addoption(
+        "--stress", action="store", default=None, metavar="NxMxK",
+        help="Run the stress scenario: grow the bot to N groups x M items x K reactions per item (e.g. 20x30x2)"
+    )
+    parser.addoption(
+        "--stress-points", action="store", type=int, default=STRESS_MEASURE_POINTS,
+        help="Number of bot sizes at which the stress scenario measures the chatflow page and the deploy"
+    )
+    parser.addoption(
+        "--record-har", action="store_true", default=False,
+        help="Record a HAR file per test in report/har/ and summarise the deploy/upload/API latencies"
+    )
+    parser.addoption(
+        "--selector-audit", action="store_true", default=False,
+        help="Run test_selector_audit: time every page object locator on the chatflow, coupon and user screens"
+    )
+    parser.addoption(
+        "--run-dependents", action="store_true", default=False,
+        help="Also run the tests whose prerequisites (producer test, cleanup, login) failed, instead of skipping them"
+    )
+    parser.addoption(
+        "--profile-locators", action="store_true", default=False,
+        help="Count which page object locators the tests use and write the usage report to report/locator_usage.json"
     )
 
-# --- Test Collection Hook: Ensure setup tests run first ---
+def _requested_api_versions(config) -> list:
+    """Parses --api-version into the list of versions to run ('all' expands to every entry of BOT_NAMES)."""
+    option = config.getoption("--api-version")
+    if option == "all":
+        return list(BOT_NAMES)
+    versions = [version.strip() for version in option.split(",") if version.strip()]
+    unknown = [version for version in versions if version not in BOT_NAMES]
+    if not versions or unknown:
+        raise pytest.UsageError(f"Unknown --api-version '{option}'. Choose from {', '.join(BOT_NAMES)} or 'all'.")
+    return versions
+
+def _is_api_matrix(config) -> bool:
+    """True when one invocation runs more than one API version."""
+    return len(_requested_api_versions(config)) > 1
+
+def pytest_generate_tests(metafunc):
+    """
+    Parametrize the whole session over every requested API version (--api-version=1.0,2.0 or all),
+    and test_chatflow_definition over the --chatflow-def definitions.
+    """
+    versions = _requested_api_versions(metafunc.config)
+    if len(versions) > 1 and "api_version" in metafunc.fixturenames:
+        metafunc.parametrize(
+            "api_version", versions, indirect=True, scope="session", ids=[f"api{version}" for version in versions]
+        )
+    # Definitions are loaded (and validated) at collection time, so a broken file fails before any browser starts
+    if "chatflow_definition" in metafunc.fixturenames:
+        names = metafunc.config.getoption("--chatflow-def")
+        if names:
+            metafunc.parametrize("chatflow_definition", [load_definition(name) for name in names], ids=names)
+        else:
+            metafunc.parametrize("chatflow_definition", [
+                pytest.param(None, marks=pytest.mark.skip(reason="No chatflow definition selected (--chatflow-def)."))
+            ])
+
+# --- Parallel (pytest-xdist) helpers ---
+def _xdist_worker_id(config) -> str:
+    """Returns the pytest-xdist worker id (e.g. 'gw0'), or None when not running on a worker."""
+    workerinput = getattr(config, "workerinput", None)
+    return workerinput["workerid"] if workerinput else None
+
+def pytest_configure(config):
+    """Give every xdist worker its own log file so parallel workers do not overwrite each other."""
+    worker_id = _xdist_worker_id(config)
+    if worker_id and config.option.log_file:
+        log_file = Path(config.option.log_file)
+        config.option.log_file = str(log_file.with_name(f"{log_file.stem}_{worker_id}{log_file.suffix}"))
+    locator_registry.profiling = config.getoption("--profile-locators")
+    # Replayed responses are much faster than staging; learning from them would shrink the staging timeouts
+    adaptive_timeouts.recording = config.getoption("--target") != "mock"
+
+def _write_locator_usage(config):
+    """Writes the page object locator usage of this process (one file per xdist worker)."""
+    worker_id = _xdist_worker_id(config)
+    path = LOCATOR_USAGE_FILE.with_name(f"{LOCATOR_USAGE_FILE.stem}_{worker_id}.json") if worker_id else LOCATOR_USAGE_FILE
+    summary = locator_registry.write_usage(path)
+    logger.info(
+        f"Locator usage: {summary['used']} of {summary['definitions']} page object locators used "
+        f"({summary['distinct_chains']} distinct selector chains), {summary['built']} built, "
+        f"{summary['reused']} reads served from the registry. Report: {path}"
+    )
+
+# --- Per-version log files for API matrix runs ---
+_version_log_handlers = {}
+
+def _version_log_handler(config, version: str) -> logging.Handler:
+    """Returns (and lazily opens) the log file handler of one API version, e.g. report/test_run_api1.log."""
+    if version not in _version_log_handlers:
+        log_dir = Path(config.option.log_file).parent if config.option.log_file else Path("report")
+        log_dir.mkdir(parents=True, exist_ok=True)
+        handler = logging.FileHandler(log_dir / f"test_run_api{version.split('.')[0]}.log", mode="w", encoding="utf-8")
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+        _version_log_handlers[version] = handler
+    return _version_log_handlers[version]
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """In an API matrix run, also write each test's log records to its version's own log file."""
+    version = getattr(item, "callspec", None) and item.callspec.params.get("api_version")
+    if not version:
+        yield
+        return
+    handler = _version_log_handler(item.config, version)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(handler)
+    try:
+        yield
+    finally:
+        root_logger.removeHandler(handler)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionstart(session):
+    """Start every run with empty step metrics files (before any xdist worker starts writing)."""
+    reset_step_metrics(session.config)
+    if session.config.getoption("--record-har") and not _xdist_worker_id(session.config):
+        shutil.rmtree(HAR_DIR, ignore_errors=True)
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Persist the latencies observed in this run, so the next run derives its timeouts from them,
+    and store the run's step timings in the performance history database (both only against staging).
+    """
+    adaptive_timeouts.save()
+    if session.config.getoption("--profile-locators"):
+        _write_locator_usage(session.config)
+    if _xdist_worker_id(session.config):
+        return
+    records = load_step_records(run_step_metrics_files(session.config))
+    if records and session.config.getoption("--target") == "mock":
+        logger.info("Step timings of --target=mock runs are not recorded in the performance history.")
+    elif records:
+        history = PerfHistory()
+        try:
+            run_ids = history.record_run(records, current_git_commit())
+        finally:
+            history.close()
+        logger.info(f"Recorded step timings of this run in the performance history: {run_ids}")
+    if session.config.getoption("--record-har"):
+        for api_version, summary in write_summaries(HAR_DIR).items():
+            logger.info(f"Network latency breakdown:\n{format_summary(api_version, summary)}")
+
+def pytest_unconfigure(config):
+    """Close the per-version log files."""
+    for handler in _version_log_handlers.values():
+        handler.close()
+    _version_log_handlers.clear()
+
+# --- Test Collection Hook: Ensure setup tests run first, then flows in dependency order ---
+# tryfirst: pytest-xdist reads the `xdist_group` markers in its own pytest_collection_modifyitems
+# (adding the "@group" suffix to the node ids), so they must be set before it runs.
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
-    """Reorder tests so setup-marked tests run before all others."""
+    """
+    Reorder tests so setup-marked tests run before all others, and the remaining tests
+    run in the topological order of their declared `flow` dependencies.
+    """
     setup_tests = []
     other_tests = []
     
@@ -34,51 +262,495 @@ def pytest_collection_modifyitems(config, items):
         else:
             other_tests.append(item)
     
+    other_tests = order_by_dependencies(other_tests)
     items[:] = setup_tests + other_tests
 
+    # In an API matrix run, keep all tests of one version in the same xdist group, so with
+    # `-n 2 --dist loadgroup` every version runs in its own process, in parallel with the others.
+    if _is_api_matrix(config):
+        for item in items:
+            version = getattr(item, "callspec", None) and item.callspec.params.get("api_version")
+            if version:
+                item.add_marker(pytest.mark.xdist_group(name=f"api{version}"))
+    # Otherwise keep every dependency branch on one worker (and its bot), so with
+    # `--dist loadgroup` independent branches run concurrently on different workers.
+    else:
+        for item, branch in flow_branches(other_tests).items():
+            item.add_marker(pytest.mark.xdist_group(name=branch))
+
+    # Stress scenarios take long and fill the bot, so they only run when asked for
+    if not config.getoption("--stress"):
+        skip_stress = pytest.mark.skip(reason="Stress scenarios only run with --stress NxMxK.")
+        for item in items:
+            if item.get_closest_marker("stress"):
+                item.add_marker(skip_stress)
+    if not config.getoption("--selector-audit"):
+        skip_audit = pytest.mark.skip(reason="The selector audit only runs with --selector-audit.")
+        for item in items:
+            if item.get_closest_marker("selector_audit"):
+                item.add_marker(skip_audit)
+
+    # In parallel runs the cleanup already ran once per worker (see `worker_bot_cleanup`),
+    # against that worker's own bot, so the single setup test would only repeat it on one of them.
+    if _xdist_worker_id(config):
+        skip_setup = pytest.mark.skip(reason="Cleanup runs once per xdist worker in the `worker_bot_cleanup` fixture.")
+        for item in setup_tests:
+            item.add_marker(skip_setup)
+
+# --- Failure fast-path: skip the tests that depend on a failed one ---
+def _root_cause(item, when: str) -> str:
+    """
+    The failed test and, if it ran through the StepRunner, its failed step,
+    e.g. 'test_chatflow_kaiwa [2] FAILED to create new text items.'
+    """
+    failed_step = next((step for step in getattr(item, "step_metrics", []) if step["status"] == "failed"), None)
+    if not failed_step:
+        return f"{item.name} (failed in {when})"
+    description = failed_step["description"]
+    if not description.lstrip().startswith(f"[{failed_step['step_id']}]"):
+        description = f"[{failed_step['step_id']}] {description}"
+    return f"{item.name} {description}"
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_setup(item):
+    """
+    Skips a test before its fixtures log in and navigate when a prerequisite already failed in this run:
+    a producer of an artifact it consumes, the setup (cleanup) test or the login to the bot.
+    Its own artifacts are marked as failed with the same root cause, so the skip propagates down the flow.
+    """
+    if item.config.getoption("--run-dependents"):
+        return
+    scope = flow_scope(item)
+    produces, consumes = flow_artifacts(item)
+    cause = artifact_registry.failure_cause(scope, consumes)
+    if cause:
+        artifact_registry.record_failure(scope, produces, cause)
+        logger.warning(f"Skipping {item.name}, a prerequisite failed. Root cause: {cause}")
+        pytest.skip(f"Prerequisite failed. Root cause: {cause}")
+
+def pytest_collection_finish(session):
+    """
+    With --dist loadgroup, check on every worker that pytest-xdist applied the groups set above
+    (it appends "@<group>" to the node ids). Without them, the tests of one flow branch or API version
+    are spread across workers and bots, and the branch's artifacts and failures are not shared.
+    """
+    config = session.config
+    if not _xdist_worker_id(config) or getattr(config.option, "dist", None) != "loadgroup":
+        return
+    ungrouped = [item.nodeid for item in session.items if item.get_closest_marker("xdist_group") and "@" not in item.nodeid]
+    if ungrouped:
+        raise pytest.UsageError(
+            f"pytest-xdist ignored the xdist_group markers of {len(ungrouped)} tests (e.g. {ungrouped[0]}); "
+            "pytest_collection_modifyitems must run before xdist's own hook."
+        )
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Remember the artifacts of every passed flow, so later consumers reuse them instead of rebuilding them,
+    and the root cause of every failed one, so its consumers are skipped (see `pytest_runtest_setup`).
+    Publish the step metrics of the test (JSON file + timing table in the HTML report).
+    """
+    outcome = yield
+    report = outcome.get_result()
+    # Let fixtures see the outcome of the test in their teardown (e.g. `logged_in_chatflow_page`)
+    setattr(item, f"rep_{report.when}", report)
+    if report.failed and report.when in ("setup", "call"):
+        produces, _ = flow_artifacts(item)
+        artifact_registry.record_failure(flow_scope(item), produces, _root_cause(item, report.when))
+        if item.get_closest_marker("setup"):
+            artifact_registry.block(flow_scope(item), f"setup test {_root_cause(item, report.when)}")
+    if report.when != "call":
+        return
+    if report.passed:
+        produces, _ = flow_artifacts(item)
+        artifact_registry.record(flow_scope(item), produces)
+
+    step_metrics = getattr(item, "step_metrics", None)
+    if step_metrics:
+        write_step_metrics(item.config, item.nodeid, flow_scope(item) or _requested_api_versions(item.config)[0], step_metrics)
+        pytest_html = item.config.pluginmanager.getplugin("html")
+        if pytest_html is not None:
+            report.extras = getattr(report, "extras", []) + [pytest_html.extras.html(step_metrics_html(step_metrics))]
+
 # --- Session-Scoped Fixtures ---
 # These are set up once for the entire test run for efficiency.
 @pytest.fixture(scope="session")
 def api_version(request) -> str:
-    """Gets the API version from the command line, available for the whole session."""
-    return request.config.getoption("--api-version")
+    """Gets the API version from the command line (or the current matrix entry), available for the whole session."""
+    return getattr(request, "param", None) or _requested_api_versions(request.config)[0]
 
 @pytest.fixture(scope="session")
-def bot_name(api_version: str) -> str:
-    """Provides the correct bot name STRING based on the session's API version."""
-    return BOT_NAMES[api_version]["name"]
+def worker_index(request) -> int:
+    """Index of the current xdist worker (gw0 -> 0, gw1 -> 1, ...). Always 0 for sequential runs."""
+    worker_id = _xdist_worker_id(request.config)
+    return int(worker_id.lstrip("gw")) if worker_id else 0
+
+@pytest.fixture(scope="session")
+def bot_name(request, api_version: str, worker_index: int) -> str:
+    """
+    Provides the correct bot name STRING based on the session's API version.
+
+    In parallel runs every xdist worker gets its own bot from BOT_POOLS. In an API matrix run
+    each version runs in its own process against its own BOT_NAMES entry instead.
+    """
+    if worker_index == 0 or _is_api_matrix(request.config):
+        return BOT_NAMES[api_version]["name"]
+    pool = BOT_POOLS[api_version]
+    if worker_index >= len(pool):
+        raise ValueError(
+            f"Only {len(pool)} bots are configured in BOT_POOLS for API {api_version}, "
+            f"but worker #{worker_index} needs one. Add bots to the pool or lower the worker count."
+        )
+    return pool[worker_index]
+
+@pytest.fixture(scope="session")
+def mock_server(request) -> MockAdminServer:
+    """The local stand-in for the admin site when running with --target=mock, else None."""
+    if request.config.getoption("--target") != "mock":
+        return None
+    recordings = Recordings.load(MOCK_RECORDINGS_DIR)
+    if not len(recordings):
+        raise pytest.UsageError(f"No recordings in {MOCK_RECORDINGS_DIR}. Run against staging once with --record-mock first.")
+    server = MockAdminServer(recordings).start()
+    request.addfinalizer(server.stop)
+    return server
+
+@pytest.fixture(scope="session")
+def admin_url(mock_server: MockAdminServer) -> str:
+    """The admin site URL of this run: ADMIN_URL on staging, the local mock server's URL with --target=mock."""
+    return mock_server.admin_url if mock_server else ADMIN_URL
+
+@pytest.fixture(scope="session")
+def auth_state_path(browser: Browser, admin_url: str, mock_server: MockAdminServer) -> Path:
+    """
+    Logs in once per session and caches the authenticated storage state on disk.
+
+    The cache is keyed by ADMIN_EMAIL + ADMIN_URL ("mock" for the local mock server, whose port
+    changes every run) and reused across runs. It is only refreshed when the server rejects it
+    (see `logged_in_chatflow_page`).
+    """
+    path = storage_state_path(AUTH_STATE_DIR, ADMIN_EMAIL, "mock" if mock_server else admin_url)
+    if path.is_file():
+        logger.info(f"Session: Reusing cached login state from {path}.")
+        return path
+
+    start = time.perf_counter()
+    context = browser.new_context()
+    try:
+        login_page = LoginPage(context.new_page())
+        login_page.navigate(admin_url)
+        login_page.login(ADMIN_EMAIL, ADMIN_PASSWORD)
+        save_storage_state(context, path)
+    finally:
+        context.close()
+    logger.info(f"Session: Logged in as {ADMIN_EMAIL} and cached login state in {time.perf_counter() - start:.2f}s.")
+    return path
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args: dict, auth_state_path: Path) -> dict:
+    """Extends pytest-playwright's context args so every new context starts already logged in."""
+    return {**browser_context_args, "storage_state": str(auth_state_path)}
+
+@pytest.fixture(scope="session")
+def network_cache(request, mock_server: MockAdminServer) -> NetworkCache:
+    """The on-disk network cache when running with --network-cache (not needed against the local mock), else None."""
+    if not request.config.getoption("--network-cache") or mock_server:
+        yield None
+        return
+    cache = NetworkCache(NETWORK_CACHE_DIR, NETWORK_CACHE_TTL_S, NETWORK_CACHE_MAX_BYTES, CACHEABLE_API_GLOBS)
+    yield cache
+    cache.save()
+
+@pytest.fixture(scope="session")
+def api_cleanup(request) -> bool:
+    """True when the cleanup may use the backend API (--api-cleanup), else it only goes through the UI."""
+    return request.config.getoption("--api-cleanup")
+
+@pytest.fixture(scope="session")
+def media_registry(request, mock_server: MockAdminServer) -> MediaRegistry:
+    """The registry of uploaded test media when running with --reuse-media (not against the local mock), else None."""
+    if not request.config.getoption("--reuse-media") or mock_server:
+        yield None
+        return
+    registry = MediaRegistry(MEDIA_REGISTRY_FILE, MEDIA_REGISTRY_TTL_S, MEDIA_URL_KEYS)
+    yield registry
+    registry.save()
+
+@pytest.fixture(scope="session")
+def resource_blocker(request) -> ResourceBlocker:
+    """The resource blocking profile of this run (--block-profile), or None if it blocks nothing."""
+    profile_name = request.config.getoption("--block-profile")
+    if profile_name is None:
+        profile_name = "none" if request.config.getoption("--headed", default=False) else DEFAULT_HEADLESS_BLOCK_PROFILE
+    blocker = ResourceBlocker(profile_name, BLOCK_PROFILES[profile_name], ESTIMATED_BYTES_PER_RESOURCE, ESTIMATED_BYTES_DEFAULT)
+    if blocker.is_empty():
+        yield None
+        return
+    yield blocker
+    logger.info(blocker.summary())
+
+@pytest.fixture(scope="session")
+def popup_manager() -> PopupManager:
+    """Closes the tutorials popup and handles native dialogs on every page opened for a test (see popup_manager.py)."""
+    manager = PopupManager()
+    yield manager
+    logger.info(manager.summary())
+
+def _configure_context(browser_context: BrowserContext, mock_server: MockAdminServer, network_cache: NetworkCache,
+                       resource_blocker: ResourceBlocker) -> BrowserContext:
+    """
+    Installs the routes of this run (mock server, network cache, resource blocking) on a new browser context.
+    The handler registered last runs first, so blocked requests never reach the cache or the mock.
+    """
+    if mock_server:
+        # Keep mock runs offline: other hosts are served from the recordings too
+        browser_context.route("**/*", mock_server.route_handler)
+    if network_cache:
+        browser_context.route("**/*", network_cache.handle)
+    if resource_blocker:
+        browser_context.route("**/*", resource_blocker.handle)
+    return browser_context
 
-# --- Core Setup Fixture ---
 @pytest.fixture(scope="function")
-def logged_in_chatflow_page(page: Page, bot_name: str) -> Page:
+def context(new_context, request, mock_server: MockAdminServer, network_cache: NetworkCache,
+            resource_blocker: ResourceBlocker) -> BrowserContext:
     """
-    Provides a page object that is already logged in and has navigated to the correct bot's chatflow.
-    
-    The `scope="function"` ensures this runs fresh for every single test, guaranteeing isolation.
+    pytest-playwright's browser context, optionally recording a HAR file for the test
+    (--record-mock: full recording for the mock server, --record-har: timings only).
+    The HAR file is written when the context closes at the end of the test.
     """
-    logger.info("--- Fixture Setup: Starting new test in a clean browser state ---")
+    api_version = flow_scope(request.node) or _requested_api_versions(request.config)[0]
+    if request.config.getoption("--record-mock"):
+        path = har_path(request.node.nodeid, api_version, har_dir=MOCK_RECORDINGS_DIR)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        browser_context = new_context(record_har_path=str(path), record_har_content="embed")
+    elif request.config.getoption("--record-har"):
+        path = har_path(request.node.nodeid, api_version)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        browser_context = new_context(record_har_path=str(path), record_har_content="omit")
+    else:
+        browser_context = new_context()
+    return _configure_context(browser_context, mock_server, network_cache, resource_blocker)
 
-    # Step 1: Login
-    # The 'page' fixture is provided automatically by pytest-playwright.
-    # Your LoginPage object should handle navigating to the URL.
+# --- Core Setup Fixture ---
+def _login(page: Page, admin_url: str, auth_state_path: Path):
+    """Opens the admin site, logging in again (and refreshing the cached state) only if the cached session was rejected."""
     login_page = LoginPage(page)
-    login_page.navigate(ADMIN_URL)
-    login_page.login(ADMIN_EMAIL, ADMIN_PASSWORD)
-    logger.info(f"Fixture: Login successful as {ADMIN_EMAIL}.")
+    login_page.navigate(admin_url)
+    if login_page.ensure_logged_in(ADMIN_EMAIL, ADMIN_PASSWORD):
+        save_storage_state(page.context, auth_state_path)
+        logger.info(f"Fixture: Cached login state was rejected. Logged in again as {ADMIN_EMAIL} and refreshed the cache.")
+    else:
+        logger.info(f"Fixture: Reused cached login state for {ADMIN_EMAIL}.")
 
-    # Step 2: Search for and open the specified bot
+def _open_bot_chatflow(page: Page, bot_name: str, admin_url: str, auth_state_path: Path, bot_chatflow_urls: dict,
+                       popup_manager: PopupManager):
+    """
+    Registers the popup handlers on the page, logs it in (from the cached storage state if possible)
+    and opens the bot's chatflow.
+
+    The first time a bot is opened in the session it is searched in the bot list and its chatflow
+    URL is remembered. Afterwards the page navigates straight to that URL, logging in first if
+    the server redirects to the login form.
+    """
+    popup_manager.install(page)
     bot_list_view_page = BotListViewPage(page)
+    chatflow_url = bot_chatflow_urls.get(bot_name)
+    if chatflow_url:
+        try:
+            if not bot_list_view_page.open_bot_by_url(chatflow_url):
+                _login(page, admin_url, auth_state_path)
+                if not bot_list_view_page.open_bot_by_url(chatflow_url):
+                    raise RuntimeError(f"{chatflow_url} still redirects to the login form")
+            logger.info(f"Fixture: Opened bot '{bot_name}' directly at {chatflow_url}. Page is ready for the test.")
+            return
+        except Exception as e:
+            # E.g. mock recordings made before deep links were used; forget the URL and search again
+            logger.warning(f"Fixture: Deep link to bot '{bot_name}' failed, searching the bot list instead. ({e})")
+            del bot_chatflow_urls[bot_name]
+
+    # Step 1: Login
+    # The page already carries the cached storage state. Only log in again if the server rejected it.
+    _login(page, admin_url, auth_state_path)
+
+    # Step 2: Search for and open the specified bot
     bot_list_view_page.search_and_select_bot(bot_name)
+    bot_id = bot_id_from_url(page.url)
+    if bot_id:
+        bot_chatflow_urls[bot_name] = page.url
+        logger.info(f"Fixture: Bot '{bot_name}' has id {bot_id}; later tests open {page.url} directly.")
     logger.info(f"Fixture: Navigation to bot '{bot_name}' complete. Page is ready for the test.")
 
+@pytest.fixture(scope="session")
+def bot_chatflow_urls() -> dict:
+    """Chatflow URL of every bot opened in this session (bot name -> URL), filled by the first search for the bot."""
+    return {}
+
+@pytest.fixture(scope="session")
+def context_pool(request, bot_name: str, browser: Browser, browser_context_args: dict, admin_url: str, auth_state_path: Path,
+                 bot_chatflow_urls: dict, mock_server: MockAdminServer, network_cache: NetworkCache,
+                 resource_blocker: ResourceBlocker, popup_manager: PopupManager) -> ContextPool:
+    """
+    The pool of warm browser contexts when running with --reuse-contexts, else None.
+    One warm context (CONTEXT_POOL_SIZE) is opened on the session's bot before the first test.
+
+    Pooled contexts are created outside pytest-playwright, so they are not used while
+    recording HAR files (which are written per test when the context closes).
+    """
+    if not request.config.getoption("--reuse-contexts"):
+        yield None
+        return
+    if request.config.getoption("--record-mock") or request.config.getoption("--record-har"):
+        logger.warning("--reuse-contexts is ignored while recording HAR files; every test gets a fresh context.")
+        yield None
+        return
+
+    def open_page(bot_name: str) -> Page:
+        browser_context = _configure_context(
+            browser.new_context(**browser_context_args), mock_server, network_cache, resource_blocker
+            )
+        page = browser_context.new_page()
+        try:
+            _open_bot_chatflow(page, bot_name, admin_url, auth_state_path, bot_chatflow_urls, popup_manager)
+        except Exception:
+            browser_context.close()
+            raise
+        return page
+
+    pool = ContextPool(open_page, lambda page: ChatflowPage(page).return_to_chatflow(), CONTEXT_POOL_SIZE, CONTEXT_POOL_MAX_USES)
+    pool.warm(bot_name)
+    yield pool
+    pool.close()
+
+@pytest.fixture(scope="function")
+def logged_in_chatflow_page(request, bot_name: str, admin_url: str, auth_state_path: Path,
+                            bot_chatflow_urls: dict, context_pool: ContextPool, popup_manager: PopupManager) -> Page:
+    """
+    Provides a page object that is already logged in and has navigated to the correct bot's chatflow.
+    
+    By default this runs fresh for every single test (pytest-playwright's function-scoped `page`),
+    guaranteeing isolation. The login itself is reused from the session's cached storage state.
+    With --reuse-contexts the page comes from the warm context pool instead and is reset to the
+    chatflow screen after the test.
+    If the login or the navigation to the bot fails, the remaining tests of the run are skipped.
+    """
+    if context_pool:
+        logger.info("--- Fixture Setup: Starting new test in a warm pooled browser context ---")
+    else:
+        logger.info("--- Fixture Setup: Starting new test in a clean browser state ---")
+    setup_start = time.perf_counter()
+
+    try:
+        if context_pool:
+            page = context_pool.acquire(bot_name)
+        else:
+            # The page (and its context) is only created when the pool is not used
+            page = request.getfixturevalue("page")
+            _open_bot_chatflow(page, bot_name, admin_url, auth_state_path, bot_chatflow_urls, popup_manager)
+    except Exception as e:
+        # Every later test would time out on the same login/navigation, so they are skipped instead
+        error = str(e).splitlines()[0] if str(e) else type(e).__name__
+        artifact_registry.block(flow_scope(request.node), f"opening bot '{bot_name}' failed in {request.node.name} ({error})")
+        raise
+    logger.info(f"Fixture: Setup took {time.perf_counter() - setup_start:.2f}s.")
+
     # The fixture hands over control to the test function
     yield page
 
     # Teardown: This code runs after the test finishes.
-    # The pytest-playwright `page` fixture handles closing the page/context automatically.
+    # The pytest-playwright `page` fixture handles closing the page/context automatically,
+    # pooled pages go back to the pool unless the test failed.
+    if context_pool:
+        report = getattr(request.node, "rep_call", None)
+        context_pool.release(page, reusable=report is not None and report.passed)
     logger.info("--- Fixture Teardown: Test finished ---")
 
 
+@pytest.fixture(scope="session", autouse=True)
+def worker_bot_cleanup(request, bot_name: str, admin_url: str, bot_chatflow_urls: dict):
+    """
+    In parallel runs, clears the previous created data of this worker's bot once, before its first test.
+
+    This is the per-worker equivalent of `test_clear_previous_created_data`; it does nothing in sequential runs.
+    """
+    if not _xdist_worker_id(request.config):
+        return
+    logger.info(f"--- Worker Setup: Clearing previous created data of bot '{bot_name}' ---")
+    browser = request.getfixturevalue("browser")
+    context = _configure_context(
+        browser.new_context(**request.getfixturevalue("browser_context_args")),
+        request.getfixturevalue("mock_server"), request.getfixturevalue("network_cache"),
+        request.getfixturevalue("resource_blocker"),
+        )
+    try:
+        page = context.new_page()
+        # Also resolves the bot's chatflow URL, so every test of this worker opens the bot directly
+        _open_bot_chatflow(
+            page, bot_name, admin_url, request.getfixturevalue("auth_state_path"), bot_chatflow_urls,
+            request.getfixturevalue("popup_manager"),
+            )
+        CheckClearData(page, use_api=request.getfixturevalue("api_cleanup")).clear_all_previous_data()
+    finally:
+        context.close()
+    logger.info(f"--- Worker Setup: Bot '{bot_name}' is clean ---")
+
+
+@pytest.fixture(scope="function")
+def step_runner(request, logged_in_chatflow_page: Page) -> StepRunner:
+    """Provides the step executor of the test; its per-step metrics end up in the JSON file and the HTML report."""
+    runner = StepRunner(logged_in_chatflow_page)
+    request.node.step_metrics = runner.metrics
+    yield runner
+    runner.close()
+
+@pytest.fixture(scope="session")
+def stress_scale(request) -> tuple:
+    """(groups, items per group, reactions per item) of the stress scenario, from --stress NxMxK."""
+    return parse_scale(request.config.getoption("--stress"))
+
+@pytest.fixture(scope="function")
+def produced_artifacts(request) -> frozenset:
+    """The artifacts (e.g. Group1, Group2) already produced by earlier tests of this run on this bot."""
+    return artifact_registry.produced(flow_scope(request.node))
+
+@pytest.fixture(scope="function")
+def seeded_groups(request, logged_in_chatflow_page: Page, produced_artifacts: frozenset) -> frozenset:
+    """
+    Creates the groups the test consumes (see PREREQUISITE_GROUPS) through the backend API (--api-seeding),
+    unless an earlier test of this run already produced them. Returns every artifact available to the test.
+
+    Groups that cannot be seeded (or all of them without --api-seeding) are left out, so the page object
+    builds them through the UI as before.
+    """
+    _, consumes = flow_artifacts(request.node)
+    missing = sorted(artifact for artifact in consumes if artifact in PREREQUISITE_GROUPS and artifact not in produced_artifacts)
+    if not missing:
+        return produced_artifacts
+
+    # Groups left on the bot (e.g. when the cleanup did not run) are used as they are
+    group_pane = ChatflowPage(logged_in_chatflow_page).group_pane
+    existing = {group_name for group_name in missing if group_pane.get_by_text(group_name, exact=True).is_visible()}
+    missing = [group_name for group_name in missing if group_name not in existing]
+
+    seeded = set()
+    if missing and request.config.getoption("--api-seeding"):
+        start = time.perf_counter()
+        try:
+            seeder = ApiSeeder(logged_in_chatflow_page)
+            for group_name in missing:
+                seeder.seed_group(group_name)
+                seeded.add(group_name)
+        except ApiUnavailableError as e:
+            logger.warning(f"Fixture: API seeding unavailable ({e}). Building the remaining prerequisites through the UI.")
+    if seeded:
+        # Reload the chatflow so the editor shows the seeded groups
+        BotListViewPage(logged_in_chatflow_page).open_bot_by_url(logged_in_chatflow_page.url)
+        artifact_registry.record(flow_scope(request.node), seeded)
+        logger.info(f"Fixture: Seeded {sorted(seeded)} through the API in {time.perf_counter() - start:.2f}s.")
+    return produced_artifacts | existing | seeded
+
+
 # --- Set project root ---
 @pytest.fixture(scope="session")
 def project_root() -> Path:
@@ -2,6 +2,7 @@
 from .login_page import LoginPage
 from .bot_list_view_page import BotListViewPage
 from .chatflow_page import ChatflowPage
+from .chatflow_builder import ChatflowBuilder
 from .check_clear_data import CheckClearData
 from .chatflow_create_chat import CreateChat
 from .coupon_function import CouponFunction
@@ -1,30 +1,41 @@
 # page_objects/bot_list_view_page.py
 from playwright.sync_api import Page, expect
 from config import WAITING_TIMEOUT_MS
+from .locators import on_page, GROUP_PANE, LIST_VIEW
 
 class BotListViewPage:
     """Page object for the main bot list view after login."""
+    # Locators
+    all_apps_button = on_page.locator("dd[hint='全てのアプリ一覧']")
+    search_input = on_page.get_by_placeholder("ボット名またはIDで検索")
+    bot_list_view = LIST_VIEW
+    # The bot's chatflow screen (its conversation popup is closed by the PopupManager)
+    chatflow_group_pane = GROUP_PANE
+    # Shown instead of the bot when a deep link is redirected to the login form
+    login_email_input = on_page.locator("input[name='email']")
+
     def __init__(self, page: Page):
         self.page = page
-        # Locators
-        self.all_apps_button = page.locator("dd[hint='全てのアプリ一覧']")
-        self.search_input = page.get_by_placeholder("ボット名またはIDで検索")
-        self.bot_list_view = page.locator(".list-view")
-        self.conversation_popup = page.locator(".popup:has-text('チャットボットの会話方法を選択')")
-        self.close_popup_button = self.conversation_popup.locator(".icon.close")
 
     # ==================================================================
     # Verification start
     # ==================================================================
     # --- Test search and select bot ---
     def search_and_select_bot(self, bot_name: str):
-        """Searches for a bot by name, selects it, and handles the popup."""
+        """Searches for a bot by name and opens its chatflow screen."""
         self.all_apps_button.click()
         self.search_input.fill(bot_name)
         self.search_input.press("Enter")
         expect(self.bot_list_view).to_contain_text(bot_name, timeout=WAITING_TIMEOUT_MS)
         self.bot_list_view.get_by_text(bot_name).click()
-        # Close popup.
-        expect(self.conversation_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.close_popup_button.click()
-        expect(self.conversation_popup).to_be_hidden()
\ No newline at end of file
+        expect(self.chatflow_group_pane).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+
+    # --- Open a bot directly by its chatflow URL ---
+    def open_bot_by_url(self, chatflow_url: str) -> bool:
+        """
+        Navigates straight to a bot's chatflow URL (remembered from `search_and_select_bot`).
+        Returns False when the server redirected to the login form instead, so the caller can log in and retry.
+        """
+        self.page.goto(chatflow_url)
+        expect(self.chatflow_group_pane.or_(self.login_email_input)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        return not self.login_email_input.is_visible()
@@ -0,0 +1,298 @@
+# page_objects/chatflow_builder.py
+from playwright.sync_api import Page, expect
+from config import WAITING_TIMEOUT_MS
+from tests.web.utils.network_helpers import deploy_and_wait_for_response
+from tests.web.utils.upload_pipeline import UploadPipeline
+from tests.web.utils.media_registry import MediaRegistry
+from tests.web.test_data import PREREQUISITE_GROUPS, APP_JSON_DEPLOY_API
+from .locators import (
+    on_page, AUTOCOMPLETE_LIST, BUTTON_NAME_INPUT, DEPLOY_BUTTON,
+    DEPLOY_COMPLETE_POPUP, DEPLOY_OK_BUTTON, DEPLOY_POPUP, GROUP_LIST,
+    KAIWA_TEXT_LIST, MEDIA_CARDS, NODES_PANE, REACT_CONTENT_CARDS,
+    )
+
+# Items whose "ボタンを追加" is on their card instead of in the nodes pane
+CARD_ITEM_TYPES = ("card", "imagecard")
+
+class ChatflowBuilder:
+    """
+    Shared builder for groups, items (会話) and button reactions in the 会話フロー screen.
+
+    Works from a declarative spec:
+        {"group": "Group1", "items": [
+            {"rt": "text", "name": "Textitem1", "msg": "Text1",
+             "reactions": [{"type": "button", "name": "text1 button"}]},
+            {"rt": "card", "name": "carousel1", "title": "Test Carousel1 Title"},
+            {"rt": "logical", "name": "condition1", "condition": {
+                "key": "User key", "value": "{{user.choice}}=choice1", "then": "1:Textitem1", "else": "2:carousel2"}},
+        ]}
+    `rt` is the item type of the "会話を追加" menu (text, card, image, video, imagecard, imagemap, logical).
+    Playwright's actions already wait for their target, so only the results are asserted
+    (no separate "textbox editable" or "popup visible" waits).
+
+    With `dry_run=True` nothing is sent to the page; the builder only records the UI actions and
+    waits it would issue (see `actions`, `action_count`, `wait_count`), to measure a flow's cost.
+    With a `media_registry` (--reuse-media), videos already on the server are set by URL in `upload_media`.
+    """
+    # Group creation
+    add_group_button = on_page.get_by_role("button", name="グループ追加")
+    add_group_newgroup = on_page.locator("dd[act='group']")
+    new_name_textbox = on_page.locator("li.editing").get_by_role("textbox")
+    group_list = GROUP_LIST
+    # Item creation
+    add_kaiwa_button = on_page.get_by_role("button", name="会話を追加")
+    kaiwa_text_list = KAIWA_TEXT_LIST
+    kaiwa_text_msg = on_page.locator("textarea.msg.with-emoticon")
+    react_content_cards = REACT_CONTENT_CARDS
+    # Image/video item uploads
+    media_cards = MEDIA_CARDS
+    # Button reactions
+    react_button_add = NODES_PANE
+    react_button_name_input = BUTTON_NAME_INPUT
+    # Condition (logical) item setting
+    moshi_dropdown = on_page.locator("div[class='ui-dropdown']").first
+    moshi_dropdown_options = on_page.locator("ul[class='ui-dropdown-opts']")
+    moshi_condition_input = on_page.locator(".condition-box input[name='condition']")
+    then_condition_input = on_page.locator("input[target_name='then']")
+    else_condition_input = on_page.locator("input[target_name='else']")
+    condition_selected = on_page.locator("span[class='autocomplete-select tooltip fixed']")
+    condition_ul = AUTOCOMPLETE_LIST
+    # Deploy button and popups
+    deploy_button = DEPLOY_BUTTON
+    deploy_popup = DEPLOY_POPUP
+    deploy_ok_button = DEPLOY_OK_BUTTON
+    deploy_complete_popup = DEPLOY_COMPLETE_POPUP
+
+    def __init__(self, page: Page = None, dry_run: bool = False, media_registry: MediaRegistry = None):
+        self.page = page
+        self.dry_run = dry_run
+        self.media_registry = media_registry
+        # (kind, description) of every action/wait issued, or planned in dry-run mode
+        self.actions = []
+        if page is None:
+            if not dry_run:
+                raise ValueError("A page is required unless dry_run=True")
+            return
+    # ==================================================================
+
+
+    # ==================================================================
+    # Reusable Helper Methods
+    # ==================================================================
+    # --- Action / wait recording (executed unless dry-run) ---
+    def _action(self, description: str, func):
+        """Issues one UI action (click, hover, fill, press)."""
+        self.actions.append(("action", description))
+        if not self.dry_run:
+            func()
+
+    def _wait(self, description: str, func):
+        """Issues one wait/assertion."""
+        self.actions.append(("wait", description))
+        if not self.dry_run:
+            func()
+
+    @property
+    def action_count(self) -> int:
+        return sum(1 for kind, _ in self.actions if kind == "action")
+
+    @property
+    def wait_count(self) -> int:
+        return sum(1 for kind, _ in self.actions if kind == "wait")
+
+    # --- Reusable Helper Methods for the name textbox of new groups/items ---
+    def _enter_new_name(self, name: str):
+        # `.last`: the previous item may still be saving when its listed-wait was deferred (verify=False)
+        self._action(f"fill name '{name}'", lambda: self.new_name_textbox.last.fill(name))
+        self._action("press Enter", lambda: self.new_name_textbox.last.press("Enter"))
+
+    # ==================================================================
+    # Building blocks
+    # ==================================================================
+    # --- Groups ---
+    def create_group(self, name: str):
+        """Creates a new group (it becomes the selected group); its tutorials popup is closed by the PopupManager."""
+        self._action("hover グループ追加", lambda: self.add_group_button.hover())
+        self._action("click new group", lambda: self.add_group_newgroup.click())
+        self._enter_new_name(name)
+        self._wait(f"group '{name}' listed", lambda: expect(self.group_list.get_by_text(name, exact=True)).to_be_visible(timeout=WAITING_TIMEOUT_MS))
+
+    def select_group(self, name: str):
+        """Selects an existing group."""
+        self._action(f"select group '{name}'", lambda: self.group_list.get_by_text(name, exact=True).click())
+
+    # --- Items ---
+    def open_item(self, name: str):
+        """Selects an item of the current group."""
+        self._action(f"open item '{name}'", lambda: self.kaiwa_text_list.get_by_text(name).click())
+
+    def add_item(self, item: dict, index: int = 0, verify: bool = True):
+        """
+        Adds an item (see the class docstring) to the current group, fills its message/title, adds its
+        reactions and sets its condition. `index` is the item's position in the group, used to find its
+        reaction buttons. With `verify=False` the "item listed" wait is left to a later `verify_items`
+        (only for items without message, title, reactions or condition).
+        """
+        rt, name = item["rt"], item["name"]
+        self._action("hover 会話を追加", lambda: self.add_kaiwa_button.hover())
+        self._action(f"click {rt} item", lambda: self.page.locator(f"dd[rt='{rt}']").click())
+        self._enter_new_name(name)
+        if verify:
+            self._wait(f"item '{name}' listed", lambda: expect(self.kaiwa_text_list).to_contain_text(name, timeout=WAITING_TIMEOUT_MS))
+
+        if "msg" in item:
+            self._action("fill message", lambda: self.kaiwa_text_msg.last.fill(item["msg"]))
+            self._action("press Enter", lambda: self.kaiwa_text_msg.last.press("Enter"))
+            self._wait("message saved", lambda: expect(self.kaiwa_text_msg.last).to_have_value(item["msg"], timeout=WAITING_TIMEOUT_MS))
+        if "title" in item:
+            def card_title():
+                return self.react_content_cards.last.locator("input[placeholder='タイトル']").first
+            self._action("fill card title", lambda: card_title().fill(item["title"]))
+            self._action("press Enter", lambda: card_title().press("Enter"))
+        for reaction in item.get("reactions", ()):
+            self.add_reaction(reaction, index, in_card=rt in CARD_ITEM_TYPES)
+        if "condition" in item:
+            self.set_condition(item["condition"])
+
+    def verify_items(self, names: list):
+        """One wait for items added with `verify=False`; items are listed in creation order, so once the last is listed the rest are checked immediately."""
+        def all_listed():
+            for name in reversed(names):
+                expect(self.kaiwa_text_list).to_contain_text(name, timeout=WAITING_TIMEOUT_MS)
+        self._wait(f"{len(names)} items listed", all_listed)
+
+    def add_items(self, items: list, first_index: int = 0):
+        """Adds several items to the current group, the first one at position `first_index`."""
+        for offset, item in enumerate(items):
+            self.add_item(item, first_index + offset)
+
+    # --- Reactions ---
+    def add_reaction(self, reaction: dict, index: int, in_card: bool = False):
+        """
+        Adds a button reaction to the item at `index` of the current group.
+        `type` is "button" (ボタンを追加) or "choice_button" (選択式ボタンを追加).
+        With `in_card=True` (card items) the button is added on the last card, the item just added.
+        """
+        label = {"button": "ボタンを追加", "choice_button": "選択式ボタンを追加"}[reaction["type"]]
+        name = reaction["name"]
+        # exact: "ボタンを追加" is also a substring of "選択式ボタンを追加"
+        if in_card:
+            def add_button():
+                return self.react_content_cards.last.get_by_text(label, exact=True).first
+            def button_shown():
+                return self.react_content_cards.last.get_by_text(name).first
+        else:
+            def add_button():
+                return self.react_button_add.get_by_text(label, exact=True).nth(index)
+            def button_shown():
+                return self.react_button_add.get_by_text(name).nth(0)
+        self._action(f"click {label}", lambda: add_button().click())
+        self._action(f"fill button name '{name}'", lambda: self.react_button_name_input.fill(name))
+        self._action("press Enter", lambda: self.react_button_name_input.press("Enter"))
+        self._wait(f"button '{name}' shown", lambda: expect(button_shown()).to_be_visible(timeout=WAITING_TIMEOUT_MS))
+
+    # --- Conditions ---
+    def set_condition(self, condition: dict):
+        """
+        Sets the もし condition of the selected logical item:
+        {"key": "User key", "value": "{{user.choice}}=choice1", "then": "1:Textitem1", "else": "2:carousel2"}.
+        `then`/`else` are the "<group no>:<item name>" labels of the autocomplete list.
+        """
+        key, value = condition.get("key", "User key"), condition["value"]
+        self._action("open もし dropdown", lambda: self.moshi_dropdown.click())
+        self._action(f"select {key}", lambda: self.moshi_dropdown_options.get_by_text(key).click())
+        self._wait(f"もし is {key}", lambda: expect(self.moshi_dropdown).to_have_text(key, timeout=WAITING_TIMEOUT_MS))
+        self._action("click condition input", lambda: self.moshi_condition_input.click())
+        self._action(f"fill condition '{value}'", lambda: self.moshi_condition_input.fill(value))
+        self._action("press Enter", lambda: self.moshi_condition_input.press("Enter"))
+        self._wait("condition saved", lambda: expect(self.moshi_condition_input).to_have_value(value, timeout=WAITING_TIMEOUT_MS))
+        if "then" in condition:
+            then_act = condition["then"]
+            self._action(f"fill then '{then_act}'", lambda: self.then_condition_input.fill(then_act))
+            self._action(f"select '{then_act}'", lambda: self.condition_ul.get_by_text(then_act).last.click())
+            self._wait("then selected", lambda: expect(self.condition_selected.nth(0).get_by_text(then_act)).to_be_visible(timeout=WAITING_TIMEOUT_MS))
+        if "else" in condition:
+            else_act = condition["else"]
+            self._action(f"fill else '{else_act}'", lambda: self.else_condition_input.fill(else_act))
+            self._action("press Enter", lambda: self.else_condition_input.press("Enter"))
+            # Typing a space re-opens the autocomplete list after Enter closed it
+            self._action("type space", lambda: self.else_condition_input.press_sequentially(" "))
+            self._action(f"select '{else_act}'", lambda: self.condition_ul.get_by_text(else_act).last.click())
+            self._wait("else selected", lambda: expect(self.condition_selected.nth(1).get_by_text(else_act)).to_be_visible(timeout=WAITING_TIMEOUT_MS))
+
+    # --- Media uploads ---
+    def _upload_trigger(self, upload: dict):
+        """Upload icon of the item's card: the image, the video file or the video's thumbnail."""
+        icon = {
+            "image": "i[class='icon camera large upload-btn']",
+            "video": "i[class='icon video large upload-btn left_b']",
+            "thumbnail": "i[class='icon camera large upload-btn left_t']",
+        }[upload["kind"]]
+        return self.media_cards.nth(upload["index"]).locator(icon)
+
+    def _enter_media_url(self, upload: dict, url: str):
+        """Sets the video of a video item by URL."""
+        card = self.media_cards.nth(upload["index"])
+        card.locator("i[class='icon link large upload-btn']").click()
+        card.get_by_placeholder("MP4動画のURL入力").fill(url)
+        card.get_by_placeholder("MP4動画のURL入力").press("Enter")
+
+    def upload_media(self, uploads: list):
+        """
+        Uploads files to image/video items of the current group through an UploadPipeline: the uploads
+        overlap (up to UPLOAD_MAX_IN_FLIGHT at a time) and one wait covers all their responses.
+        Each upload is {"item": name, "index": position in the group,
+        "kind": "image" | "video" | "thumbnail", "path": file path}.
+        """
+        pipeline = None if self.dry_run else UploadPipeline(self.page, media_registry=self.media_registry)
+        for upload in uploads:
+            self.open_item(upload["item"])
+            label = f"{upload['kind']} of '{upload['item']}'"
+            # Only video items accept a URL instead of a file
+            enter_url = (lambda url, upload=upload: self._enter_media_url(upload, url)) if upload["kind"] == "video" else None
+            self._action(f"upload {label}", lambda upload=upload, label=label, enter_url=enter_url: pipeline.submit_file(
+                label, self._upload_trigger(upload), upload["path"], enter_url=enter_url
+                ))
+        self._wait(f"{len(uploads)} uploads answered", lambda: pipeline.wait_all())
+
+    # --- Deploy ---
+    def deploy(self, timeout_ms: int = None):
+        """
+        Deploys the bot (公開する → OK) and waits for the app.json response and the completion popup.
+        `timeout_ms` replaces the adaptive deploy timeout (see deploy_and_wait_for_response).
+        """
+        self._action("deploy", lambda: deploy_and_wait_for_response(
+            page=self.page,
+            deploy_button=self.deploy_button,
+            deploy_popup=self.deploy_popup,
+            ok_button=self.deploy_ok_button,
+            deploy_complete_popup=self.deploy_complete_popup,
+            url_glob=APP_JSON_DEPLOY_API,
+            timeout_ms=timeout_ms,
+            ))
+
+    # ==================================================================
+    # Declarative build
+    # ==================================================================
+    def build(self, spec: dict):
+        """Creates the spec's group (or selects it with "existing": True) and adds all its items."""
+        if spec.get("existing"):
+            self.select_group(spec["group"])
+        else:
+            self.create_group(spec["group"])
+        if spec.get("items"):
+            self.add_items(spec["items"])
+
+    def ensure_groups(self, group_names: tuple, existing_groups: frozenset = frozenset()):
+        """
+        Builds the prerequisite groups (see PREREQUISITE_GROUPS) that do not exist yet.
+        Groups known to exist (produced or seeded earlier in this run) are waited for instead of probed,
+        so a group list that is still rendering never triggers a duplicate rebuild.
+        """
+        for group_name in group_names:
+            if group_name in existing_groups:
+                self._wait(f"group '{group_name}' listed", lambda: expect(
+                    self.group_list.get_by_text(group_name, exact=True)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+                    )
+            elif self.dry_run or not self.group_list.get_by_text(group_name, exact=True).is_visible():
+                self.build({"group": group_name, "items": PREREQUISITE_GROUPS[group_name]})
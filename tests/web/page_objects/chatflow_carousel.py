@@ -2,58 +2,55 @@
 from playwright.sync_api import Page, Locator, expect
 from tests.web.utils.network_helpers import deploy_and_wait_for_response
 from config import WAITING_TIMEOUT_MS
+from tests.web.utils.timeouts import adaptive_timeouts
 from tests.web.test_data import (
     GROUP_NAME_CAROUSEL, CHAT_FLOW_CAROUSEL_NAME, 
     REACTION_CAROUSEL1_API, REACTION_CAROUSEL1_NAME, REACTION_CAROUSEL2_NAME, CAROUSEL2_COUPON_NAME,
     APP_JSON_DEPLOY_API
     )
+from .chatflow_builder import ChatflowBuilder
+from .locators import (
+    on_page, BUTTON_NAME_INPUT, CARD_SRC_SELECT, COUPON_CREATE_BUTTON,
+    COUPON_CREATE_POPUP, COUPON_NAME_INPUT, DEPLOY_BUTTON, DEPLOY_COMPLETE_POPUP,
+    DEPLOY_OK_BUTTON, DEPLOY_POPUP, HEADER_APP_TAB, KAIWA_TEXT_LIST,
+    LIST_VIEW, REACT_API_INPUT, REACT_CONTENT_CARDS, THREE_DOTS_ICON,
+    THREE_DOTS_POPUP,
+    )
  
 class CreateCarousel:
     """Page object for the test create Carousel (カルーセル) in 会話フロー screen."""
+    # Access coupon screen
+    three_dots_icon = THREE_DOTS_ICON
+    three_dots_popup = THREE_DOTS_POPUP
+    coupon_initial_screen = on_page.locator("//section[@class='coupons']")
+    # Create new coupon
+    create_coupon_button = COUPON_CREATE_BUTTON
+    coupon_create_popup = COUPON_CREATE_POPUP
+    coupon_name_input = COUPON_NAME_INPUT
+    coupon_list_view = LIST_VIEW
+    # Access chat flow screen
+    header_app_tab = HEADER_APP_TAB
+    # Action carousel
+    kaiwa_text_list = KAIWA_TEXT_LIST
+    # For carousel1 reaction setting
+    card_src_select = CARD_SRC_SELECT
+    react_api_input = REACT_API_INPUT
+    react_content_cards = REACT_CONTENT_CARDS
+    react_carousel1_content_lists = react_content_cards.nth(0).locator("> ol")
+    react_big_button_name_input = BUTTON_NAME_INPUT
+    # For carousel2 reaction setting
+    react_content_dropdown = on_page.locator("p[class='srcs src-content']").nth(1).get_by_role("button")
+    react_content_dropdown_coupon = on_page.locator("ul[class='ui-dropdown-opts']").get_by_text("クーポン", exact=True)
+    # Deploy button and popups
+    deploy_button = DEPLOY_BUTTON
+    deploy_popup = DEPLOY_POPUP
+    deploy_ok_button = DEPLOY_OK_BUTTON
+    deploy_complete_popup = DEPLOY_COMPLETE_POPUP
+
     def __init__(self, page: Page):
         self.page = page
-        # Access coupon screen
-        self.three_dots_icon = page.locator("header[scope='controller']").locator("a[class='miniapps icon dots-v']")
-        self.three_dots_popup = page.locator("//section[@class='popover bottom white']")
-        self.coupon_initial_screen = page.locator("//section[@class='coupons']")
-        # Create new coupon
-        self.create_coupon_button = page.get_by_role("button", name="クーポン発行")
-        self.coupon_create_popup = page.locator("//section[@class='popup white form coupon-edit-popup']")
-        self.coupon_name_input = self.coupon_create_popup.locator("input[placeholder='クーポン名']")
-        self.coupon_list_view = page.locator(".list-view")
-        # Access chat flow screen
-        self.header_app_tab = page.locator("//a[@name='bot_edit_view']")
-        # Group creation
-        self.add_group_button = page.get_by_role("button", name="グループ追加")
-        self.add_group_newgroup = page.locator("dd[act='group']")
-        self.new_name_textbox = page.locator("li.editing").get_by_role("textbox")
-        self.group_list = page.locator("ul.groups")
-        # Tutorials popup
-        self.tutorials_popup = page.locator(".popup:has-text('チャットボットの会話方法を選択')")
-        self.close_popup_button = self.tutorials_popup.locator(".icon.close")
-        # Action carousel
-        self.add_kaiwa_button = page.get_by_role("button", name="会話を追加")
-        self.add_kaiwa_carousel = page.locator("dd[rt='card']")
-        self.kaiwa_text_list = page.locator(".actions")
-        # For carousel1 reaction setting
-        self.card_src_select = page.locator("dl[class='card-src']")
-        self.react_api_input = page.locator("input[placeholder='Your API URL']")
-        self.react_content_cards = page.locator("div[class='cells rt-card rt-image rt-video rt-audio rt-imagemap rt-flyer rt-imagecard rt-flex']")
-        self.react_carousel1_content_lists = self.react_content_cards.nth(0).locator("> ol")     
-        self.react_big_button_name_input = page.locator("input[id='input_bot_btn']")
-        # For carousel2 reaction setting
-        self.react_content_dropdown = page.locator("p[class='srcs src-content']").nth(1).get_by_role("button")
-        self.react_content_dropdown_coupon = page.locator("ul[class='ui-dropdown-opts']").get_by_text("クーポン", exact=True)
-        self.react_button_add = page.locator("//section[@class='nodes-pane']")
-        self.react_button_name_input = page.locator("input[id='input_bot_btn']")
-        # For textitem for verification
-        self.add_kaiwa_text = page.locator("dd[rt='text']")
-        self.kaiwa_text_msg = page.locator("textarea.msg.with-emoticon")
-        # Deploy button and popups
-        self.deploy_button = page.get_by_role("button", name="公開する")
-        self.deploy_popup = page.locator(".popup:has-text('[公開]すると、以下のfacebook page、またはLINEアカウントに反映されます。')")
-        self.deploy_ok_button = self.deploy_popup.get_by_role("button", name="OK")
-        self.deploy_complete_popup = page.locator(".popup:has-text('デプロイが完了しました！')")
+        # Group, item and button reaction creation
+        self.builder = ChatflowBuilder(page)
     # ==================================================================
 
 
@@ -68,18 +65,12 @@ class CreateCarousel:
         """
         return self.react_carousel1_content_lists.count()
 
-    # --- Reusable Helper Methods for Popups ---
-    def _close_tutorials_popup_if_visible(self):
-        """Helper to close the tutorials popup if it is visible."""
-        expect(self.tutorials_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.close_popup_button.click()
-        expect(self.tutorials_popup).to_be_hidden(timeout=WAITING_TIMEOUT_MS)
-    
     # --- Reusable Helper Methods for Waiting for API response when input API content and press enter ---
     def _wait_for_api_response_after_enter(self, url_glob: str, action_locator: Locator):
         """Helper to wait for API response after pressing Enter."""
-        with self.page.expect_response(url_glob, timeout=WAITING_TIMEOUT_MS * 2) as response_info:
-            action_locator.press("Enter")
+        with adaptive_timeouts.track("api_preview") as preview_timeout_ms:
+            with self.page.expect_response(url_glob, timeout=preview_timeout_ms) as response_info:
+                action_locator.press("Enter")
         response = response_info.value
         if not response.ok:
             raise AssertionError(f"Carousel content import API failed with status {response.status}: {response.text()}")  
@@ -109,28 +100,14 @@ class CreateCarousel:
         """Creates a new chat group."""
         # Access chat flow screen
         self.header_app_tab.click()
-        self._close_tutorials_popup_if_visible()
         # Create Group2
-        self.add_group_button.hover()
-        self.add_group_newgroup.click()
-        expect(self.new_name_textbox).to_be_editable()
-        self.new_name_textbox.fill(GROUP_NAME_CAROUSEL)
-        self.new_name_textbox.press("Enter")
-        expect(self.group_list.get_by_text(GROUP_NAME_CAROUSEL, exact=True)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        # Close popup.
-        self._close_tutorials_popup_if_visible()
+        self.builder.create_group(GROUP_NAME_CAROUSEL)
 
     # --- Create Carousels ---
     def create_new_carousel_items(self):
         """Create new 2 carousel items."""
-        for i in range(2):
-            # 会話追加 (カルーセル)
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_carousel.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(CHAT_FLOW_CAROUSEL_NAME[i])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(CHAT_FLOW_CAROUSEL_NAME[i], timeout=WAITING_TIMEOUT_MS)
+        # 会話追加 (カルーセル)
+        self.builder.add_items([{"rt": "card", "name": carousel_name} for carousel_name in CHAT_FLOW_CAROUSEL_NAME])
 
     # --- Set reaction for carousel1 ---
     def setting_reaction_carousel1(self):
@@ -161,27 +138,16 @@ class CreateCarousel:
         self.react_content_dropdown_coupon.click()
         expect(self.react_content_cards.nth(1).locator(f"input[data-value='{CAROUSEL2_COUPON_NAME}']").last).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         # Adding a button to carousel item
-        self.react_button_add.get_by_text("選択式ボタンを追加").nth(1).click()
-        self.react_button_name_input.fill(REACTION_CAROUSEL2_NAME)
-        self.react_button_name_input.press("Enter")
-        expect(self.react_button_add.get_by_text(REACTION_CAROUSEL2_NAME)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.builder.add_reaction({"type": "choice_button", "name": REACTION_CAROUSEL2_NAME}, index=1)
 
     # --- Create a new text item for verification purpose ---
     def create_new_textitem_for_verification(self):
         """Creates a new text item for verification purpose."""
-        # Create Textitem for verification
-        self.add_kaiwa_button.hover()
-        self.add_kaiwa_text.click()
-        expect(self.new_name_textbox).to_be_editable()
-        self.new_name_textbox.fill("Carousel2:Textitem")
-        self.new_name_textbox.press("Enter")
-        expect(self.kaiwa_text_list).to_contain_text("Carousel2:Textitem", timeout=WAITING_TIMEOUT_MS)
-        # Add text to Textitem for verification
-        self.kaiwa_text_msg.last.fill("Verify next chatflow content after selecting coupon in carousel2.")
-        self.kaiwa_text_msg.last.press("Enter")
-        # Close popup.
-        self._close_tutorials_popup_if_visible()
-        expect(self.kaiwa_text_msg.last).to_have_value("Verify next chatflow content after selecting coupon in carousel2.", timeout=WAITING_TIMEOUT_MS)
+        # Create Textitem for verification, with its text
+        self.builder.add_item({
+            "rt": "text", "name": "Carousel2:Textitem",
+            "msg": "Verify next chatflow content after selecting coupon in carousel2.",
+        })
 
     # --- Test Deploy and verify API call ---
     def deploy_and_verify(self):
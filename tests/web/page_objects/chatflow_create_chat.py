@@ -9,111 +9,76 @@ from tests.web.test_data import (
     REACTION_TEXTITEM3_ACT, 
     APP_JSON_DEPLOY_API
     )
+from .chatflow_builder import ChatflowBuilder
+from .locators import (
+    on_page, AUTOCOMPLETE_LIST, DEPLOY_BUTTON, DEPLOY_COMPLETE_POPUP,
+    DEPLOY_OK_BUTTON, DEPLOY_POPUP, DESTINATION_CONVERSATION, DESTINATION_CONVERSATION_SELECT,
+    ICON_SIGNOUT, KAIWA_TEXT_LIST, NODES_PANE, SAVE_BUTTON,
+    )
 
 class CreateChat:
     """Page object for the test create chat (会話) in 会話フロー screen."""
+    # Action chat
+    kaiwa_text_list = KAIWA_TEXT_LIST
+    # Action button set
+    react_button_add = NODES_PANE
+    # For textitem2 reaction setting
+    user_attribute_key_name = on_page.locator("input[placeholder='ユーザの属性キー名']")
+    next_kaiwa_action2 = on_page.locator("section[class='pop-inline btns-form fullscreen']")
+    destination_conversation = DESTINATION_CONVERSATION
+    destination_conversation_select = DESTINATION_CONVERSATION_SELECT
+    destination_conversation_ul = AUTOCOMPLETE_LIST
+    save_button = SAVE_BUTTON
+    icon_signout = ICON_SIGNOUT
+    # For textitem3 reaction setting
+    moji_input_ato_dropdown1 = on_page.get_by_role("listitem", name="判定方法", exact=True).locator("div").nth(1)
+    pattern_option = on_page.get_by_text("パターン", exact=True)
+    moji_input_ato_dropdown2 = on_page.get_by_role("listitem", name="方法", exact=True).locator("div").nth(1)
+    len_1 = on_page.get_by_text("指定なし", exact=True)
+    next_kaiwa_action3 = on_page.locator("section[class='pop-inline ipts-form']")
+    # For textitem4 reaction setting
+    react_files = on_page.locator("section[class='pop-inline ipts-form']")
+    # Deploy button and popups
+    deploy_button = DEPLOY_BUTTON
+    deploy_popup = DEPLOY_POPUP
+    deploy_ok_button = DEPLOY_OK_BUTTON
+    deploy_complete_popup = DEPLOY_COMPLETE_POPUP
+
     def __init__(self, page: Page):
         self.page = page
-        # Group creation
-        self.add_group_button = page.get_by_role("button", name="グループ追加")
-        self.add_group_newgroup = page.locator("dd[act='group']")
-        self.new_name_textbox = page.locator("li.editing").get_by_role("textbox")
-        self.group_list = page.locator("ul.groups")
-        # Tutorials popup
-        self.tutorials_popup = page.locator(".popup:has-text('チャットボットの会話方法を選択')")
-        self.close_popup_button = self.tutorials_popup.locator(".icon.close")
-        # Action chat
-        self.add_kaiwa_button = page.get_by_role("button", name="会話を追加")
-        self.add_kaiwa_text = page.locator("dd[rt='text']")
-        self.kaiwa_text_list = page.locator(".actions")
-        self.kaiwa_text_msg = page.locator("textarea.msg.with-emoticon")
-        # Action button set
-        self.react_button_add = page.locator("section[class='nodes-pane']")
-        self.react_button_name_input = page.locator("input[id='input_bot_btn']")
-        # For textitem2 reaction setting
-        self.user_attribute_key_name = page.locator("input[placeholder='ユーザの属性キー名']")
-        self.next_kaiwa_action2 = page.locator("section[class='pop-inline btns-form fullscreen']")
-        self.destination_conversation = page.locator("input[target_name='act']")
-        self.destination_conversation_select = page.locator("span[class='autocomplete-select']")
-        self.destination_conversation_ul = page.locator("ul#form-item-autocomplete")
-        self.save_button = page.locator("button[id='save_btn_purple']")
-        self.icon_signout = page.locator(".icon.signout")
-        # For textitem3 reaction setting
-        self.moji_input_ato_dropdown1 = page.get_by_role("listitem", name="判定方法", exact=True).locator("div").nth(1)
-        self.pattern_option = page.get_by_text("パターン", exact=True)
-        self.moji_input_ato_dropdown2 = page.get_by_role("listitem", name="方法", exact=True).locator("div").nth(1)
-        self.len_1 = page.get_by_text("指定なし", exact=True)
-        self.next_kaiwa_action3 = page.locator("section[class='pop-inline ipts-form']")
-        # For textitem4 reaction setting
-        self.react_files = page.locator("section[class='pop-inline ipts-form']")
-        # Deploy button and popups
-        self.deploy_button = page.get_by_role("button", name="公開する")
-        self.deploy_popup = page.locator(".popup:has-text('[公開]すると、以下のfacebook page、またはLINEアカウントに反映されます。')")
-        self.deploy_ok_button = self.deploy_popup.get_by_role("button", name="OK")
-        self.deploy_complete_popup = page.locator(".popup:has-text('デプロイが完了しました！')")
+        # Group, item and button reaction creation
+        self.builder = ChatflowBuilder(page)
     # ==================================================================
     
 
-    # ==================================================================
-    # Reusable Helper Methods
-    # ==================================================================
-    # --- Reusable Helper Methods for Popups ---
-    def _close_tutorials_popup_if_visible(self):
-        """Helper to close the tutorials popup if it is visible."""
-        expect(self.tutorials_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.close_popup_button.click()
-        expect(self.tutorials_popup).to_be_hidden(timeout=WAITING_TIMEOUT_MS)
-
     # ==================================================================
     # Verification start
     # ==================================================================
     # --- Test create new chat group ---
     def create_new_chat_group(self):
         """Creates a new chat group."""
-        self.add_group_button.hover()
-        self.add_group_newgroup.click()
-        expect(self.new_name_textbox).to_be_editable()
-        self.new_name_textbox.fill(GROUP_NAME_KAIWA)
-        self.new_name_textbox.press("Enter")
-        expect(self.group_list.get_by_text(GROUP_NAME_KAIWA, exact=True)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        # Close popup.
-        self._close_tutorials_popup_if_visible()
+        self.builder.create_group(GROUP_NAME_KAIWA)
 
     # --- Test create new 会話 ---
     def create_new_text_items(self):
         """Create new 4 text items."""
-        for i in range(4):
-            # 会話追加 (Textitem)
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_text.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(CHAT_FLOW_TEXT_ITEMS[i])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(CHAT_FLOW_TEXT_ITEMS[i], timeout=WAITING_TIMEOUT_MS)
-            # Add text to text item
-            self.kaiwa_text_msg.last.fill(CHAT_FLOW_TEXT_ITEMS[i+4])
-            self.kaiwa_text_msg.last.press("Enter")
-            self.close_popup_button.click()
-            expect(self.kaiwa_text_msg.last).to_have_value(CHAT_FLOW_TEXT_ITEMS[i+4])
+        # 会話追加 (Textitem) with its text
+        self.builder.add_items([
+            {"rt": "text", "name": CHAT_FLOW_TEXT_ITEMS[i], "msg": CHAT_FLOW_TEXT_ITEMS[i+4]} for i in range(4)
+        ])
 
     # --- Test Set reaction for Textitem1 ---
     def setting_reaction_textitem1(self):
         """Setting a reaction to Textitem1 ."""
-        self.kaiwa_text_list.get_by_text(CHAT_FLOW_TEXT_ITEMS[0]).click()
-        self.react_button_add.get_by_text("ボタンを追加").nth(0).click()
-        self.react_button_name_input.fill(REACTION_TEXTITEM1_NAME)
-        self.react_button_name_input.press("Enter")
-        expect(self.react_button_add.get_by_text(REACTION_TEXTITEM1_NAME).nth(0)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.builder.open_item(CHAT_FLOW_TEXT_ITEMS[0])
+        self.builder.add_reaction({"type": "button", "name": REACTION_TEXTITEM1_NAME}, index=0)
 
     # --- Test Set reaction for Textitem2 ---
     def setting_reaction_textitem2(self):
         """Setting a reaction to Textitem2 ."""
-        self.kaiwa_text_list.get_by_text(CHAT_FLOW_TEXT_ITEMS[1]).click()
-        for i in range(2):
-            self.react_button_add.get_by_text("選択式ボタンを追加").nth(1).click()
-            self.react_button_name_input.fill(REACTION_TEXTITEM2_NAME[i])
-            self.react_button_name_input.press("Enter")
-            expect(self.react_button_add.get_by_text(REACTION_TEXTITEM2_NAME[i])).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.builder.open_item(CHAT_FLOW_TEXT_ITEMS[1])
+        for choice_name in REACTION_TEXTITEM2_NAME:
+            self.builder.add_reaction({"type": "choice_button", "name": choice_name}, index=1)
         self.react_button_add.get_by_text("一括編集").nth(1).click()
         self.user_attribute_key_name.fill(USER_ATTRIBUTE_KEY_NAME)
         self.next_kaiwa_action2.get_by_text("手動で指定").click()
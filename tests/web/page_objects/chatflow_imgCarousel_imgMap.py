@@ -2,63 +2,58 @@
 from playwright.sync_api import Page, expect, Locator
 from tests.web.utils.network_helpers import deploy_and_wait_for_response
 from config import WAITING_TIMEOUT_MS
+from tests.web.utils.timeouts import adaptive_timeouts
 from tests.web.test_data import (
     GROUP_NAME_IMAGECAROUSEL, IMAGE_CAROUSEL_NAME, IMAGE_MAP_NAME, 
     REACTION_IMGCAROUSEL_API, REACTION_IMGCAROUSEL_BTN_NAME, 
     GROUP_NAME_KAIWA, CHAT_FLOW_TEXT_ITEMS, GROUP_NAME_CAROUSEL, CHAT_FLOW_CAROUSEL_NAME,
     APP_JSON_DEPLOY_API
     )
+from .chatflow_builder import ChatflowBuilder
+from .locators import (
+    on_page, AUTOCOMPLETE_LIST, BUTTON_NAME_INPUT, CARD_SRC_SELECT,
+    DEPLOY_BUTTON, DEPLOY_COMPLETE_POPUP, DEPLOY_OK_BUTTON, DEPLOY_POPUP,
+    DESTINATION_CONVERSATION, DESTINATION_CONVERSATION_SELECT, ICON_SIGNOUT, REACT_API_INPUT,
+    REACT_CONTENT_CARDS, SAVE_BUTTON,
+    )
  
 class CreateImageCarouselMap:
     """Page object for the test create Image Carousel (イメージカルーセル) and Image Map (イメージマップ) in 会話フロー screen."""
-    def __init__(self, page: Page):
+    # For image carousel reaction setting
+    card_src_select = CARD_SRC_SELECT
+    react_api_input = REACT_API_INPUT
+    react_content_cards = REACT_CONTENT_CARDS
+    react_carousel1_content_lists = react_content_cards.nth(0).locator("> ol")
+    react_big_button_name_input = BUTTON_NAME_INPUT
+    # For image map draw area
+    image_map_card = react_content_cards.last.locator("> ol")
+    image_map_upload_icon = image_map_card.locator("i[class='icon camera large upload-btn']")
+    image_map_preview = image_map_card.locator("li.data.imagecard")
+    image_map_brush_icon = image_map_card.locator("i[class='icon brush large upload-btn']")
+    image_map_image_area = on_page.locator("div[class='image-pane']")
+    image_area = on_page.locator("div[class='imagemap']")
+    image_area_save_button = on_page.get_by_role("button", name="保存")
+    # For image map area reaction setting
+    image_map_react_button = on_page.locator("div[class='react-btns']")
+    image_map_react_popup = on_page.locator("section[class='pop-inline btns-form']")
+    next_kaiwa_action = on_page.locator("div[class='form-type-radio']").nth(1)
+    destination_conversation = DESTINATION_CONVERSATION
+    destination_conversation_select = DESTINATION_CONVERSATION_SELECT
+    destination_conversation_ul = AUTOCOMPLETE_LIST
+    save_button = SAVE_BUTTON
+    icon_signout = ICON_SIGNOUT
+    # Deploy button and popups
+    deploy_button = DEPLOY_BUTTON
+    deploy_popup = DEPLOY_POPUP
+    deploy_ok_button = DEPLOY_OK_BUTTON
+    deploy_complete_popup = DEPLOY_COMPLETE_POPUP
+
+    def __init__(self, page: Page, existing_groups: frozenset = frozenset()):
         self.page = page
-        # Group creation
-        self.add_group_button = page.get_by_role("button", name="グループ追加")
-        self.add_group_newgroup = page.locator("dd[act='group']")
-        self.new_name_textbox = page.locator("li.editing").get_by_role("textbox")
-        self.group_list = page.locator("ul.groups")
-        # Tutorials popup
-        self.tutorials_popup = page.locator(".popup:has-text('チャットボットの会話方法を選択')")
-        self.close_popup_button = self.tutorials_popup.locator(".icon.close")
-        # Action carousel
-        self.add_kaiwa_button = page.get_by_role("button", name="会話を追加")
-        self.add_kaiwa_imagecarousel = page.locator("dd[rt='imagecard']")
-        self.add_kaiwa_imagemap= page.locator("dd[rt='imagemap']")
-        self.kaiwa_text_list = page.locator(".actions")
-        # For image carousel reaction setting
-        self.card_src_select = page.locator("dl[class='card-src']")
-        self.react_api_input = page.locator("input[placeholder='Your API URL']")
-        self.react_content_cards = page.locator("div[class='cells rt-card rt-image rt-video rt-audio rt-imagemap rt-flyer rt-imagecard rt-flex']")
-        self.react_content_cards_title = self.react_content_cards.last.locator("input[placeholder='タイトル']")
-        self.react_carousel1_content_lists = self.react_content_cards.nth(0).locator("> ol")     
-        self.react_big_button_name_input = page.locator("input[id='input_bot_btn']")
-        # For image map draw area
-        self.image_map_card = self.react_content_cards.last.locator("> ol")
-        self.image_map_upload_icon = self.image_map_card.locator("i[class='icon camera large upload-btn']")
-        self.image_map_preview = self.image_map_card.locator("li.data.imagecard")
-        self.image_map_brush_icon = self.image_map_card.locator("i[class='icon brush large upload-btn']")
-        self.image_map_image_area = page.locator("div[class='image-pane']")
-        self.image_area = page.locator("div[class='imagemap']")
-        self.image_area_save_button = page.get_by_role("button", name="保存")
-        # For image map area reaction setting
-        self.image_map_react_button = page.locator("div[class='react-btns']")
-        self.image_map_react_popup = page.locator("section[class='pop-inline btns-form']")
-        self.next_kaiwa_action = page.locator("div[class='form-type-radio']").nth(1)
-        self.destination_conversation = page.locator("input[target_name='act']")
-        self.destination_conversation_select = page.locator("span[class='autocomplete-select']")
-        self.destination_conversation_ul = page.locator("ul#form-item-autocomplete")
-        self.save_button = page.locator("button[id='save_btn_purple']")
-        self.icon_signout = page.locator(".icon.signout")
-        # For textitem reaction setting
-        self.add_kaiwa_text = page.locator("dd[rt='text']")
-        self.kaiwa_text_msg = page.locator("textarea.msg.with-emoticon")
-        self.add_kaiwa_carousel = page.locator("dd[rt='card']")
-        # Deploy button and popups
-        self.deploy_button = page.get_by_role("button", name="公開する")
-        self.deploy_popup = page.locator(".popup:has-text('[公開]すると、以下のfacebook page、またはLINEアカウントに反映されます。')")
-        self.deploy_ok_button = self.deploy_popup.get_by_role("button", name="OK")
-        self.deploy_complete_popup = page.locator(".popup:has-text('デプロイが完了しました！')")
+        # Groups already produced by earlier tests of this run (see flow_graph.py)
+        self.existing_groups = existing_groups
+        # Group, item and button reaction creation
+        self.builder = ChatflowBuilder(page)
     # ==================================================================
         
     # ==================================================================
@@ -80,8 +75,9 @@ class CreateImageCarouselMap:
         file_chooser = fc_info.value
 
         # Waiting for API response to make sure image uploaded successfully
-        with self.page.expect_response(api_url_glob, timeout=WAITING_TIMEOUT_MS * 2) as response_info:
-            file_chooser.set_files(image_path)
+        with adaptive_timeouts.track("image_upload") as upload_timeout_ms:
+            with self.page.expect_response(api_url_glob, timeout=upload_timeout_ms) as response_info:
+                file_chooser.set_files(image_path)
 
         response = response_info.value
         if not response.ok:
@@ -110,64 +106,6 @@ class CreateImageCarouselMap:
         self.page.mouse.up()
         expect(self.page.locator(f"input[data-value='{area_name}']")).to_be_editable(timeout=WAITING_TIMEOUT_MS)
 
-    # --- Reusable Helper Methods for Tutorials Popups ---
-    def _close_tutorials_popup_if_visible(self):
-        """Helper to close the tutorials popup if it is visible."""
-        expect(self.tutorials_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.close_popup_button.click()
-        expect(self.tutorials_popup).to_be_hidden(timeout=WAITING_TIMEOUT_MS)
-
-    # --- Reusable Helper Methods for Group1 Creation ---
-    def _create_group1_if_not_exists(self):
-        """Helper to create Group1 if it does not exist."""
-        if not self.group_list.get_by_text(GROUP_NAME_KAIWA).is_visible():
-            # Create Group1 if it does not exist
-            self.add_group_button.hover()
-            self.add_group_newgroup.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(GROUP_NAME_KAIWA)
-            self.new_name_textbox.press("Enter")
-            # Close popup.
-            self._close_tutorials_popup_if_visible()
-            # Create Textitem1 under Group1
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_text.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(CHAT_FLOW_TEXT_ITEMS[0])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(CHAT_FLOW_TEXT_ITEMS[0], timeout=WAITING_TIMEOUT_MS)
-            # Add text to Textitem1
-            self.kaiwa_text_msg.last.fill(CHAT_FLOW_TEXT_ITEMS[4])
-            self.kaiwa_text_msg.last.press("Enter")
-            # Close popup.
-            self._close_tutorials_popup_if_visible()
-            expect(self.kaiwa_text_msg.last).to_have_value(CHAT_FLOW_TEXT_ITEMS[4])
-        expect(self.group_list.get_by_text(GROUP_NAME_KAIWA)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-
-    # --- Reusable Helper Methods for Group2 Creation ---
-    def _create_group2_if_not_exists(self):
-        """Helper to create Group2 if it does not exist."""
-        if not self.group_list.get_by_text(GROUP_NAME_CAROUSEL).is_visible():
-            # Create Group2 if it does not exist
-            self.add_group_button.hover()
-            self.add_group_newgroup.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(GROUP_NAME_CAROUSEL)
-            self.new_name_textbox.press("Enter")
-            # Close popup.
-            self._close_tutorials_popup_if_visible()
-            # Create Carousel1 under Group2
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_carousel.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(CHAT_FLOW_CAROUSEL_NAME[0])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(CHAT_FLOW_CAROUSEL_NAME[0], timeout=WAITING_TIMEOUT_MS)
-            # Setting title for Carousel1
-            self.react_content_cards_title.nth(0).fill("Test Carousel1 Title")
-            self.react_content_cards_title.nth(0).press("Enter")
-        expect(self.group_list.get_by_text(GROUP_NAME_CAROUSEL)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-
     # --- Reusable Helper Methods for Deploy and verify ---
     def _deploy_and_verify(self):
         """Deploys the application and presses Escape after successful API call."""
@@ -192,33 +130,15 @@ class CreateImageCarouselMap:
         """Creates a new chat group."""
         # Check if Group1 and Group2 exists, if not, create it. 
         # Because Group3's reaction depends on Group1 and Group2.
-        if not self.group_list.get_by_text(GROUP_NAME_KAIWA).is_visible():
-            self._create_group1_if_not_exists() # Create Group1 and Textitem1
-            # self._deploy_and_verify() # Call the reusable helper function
-        if not self.group_list.get_by_text(GROUP_NAME_CAROUSEL).is_visible():
-            self._create_group2_if_not_exists() # Create Group2 and Carousel1
-            # self._deploy_and_verify() # Call the reusable helper function
+        self.builder.ensure_groups((GROUP_NAME_KAIWA, GROUP_NAME_CAROUSEL), self.existing_groups)
         # Create Group3
-        self.add_group_button.hover()
-        self.add_group_newgroup.click()
-        expect(self.new_name_textbox).to_be_editable()
-        self.new_name_textbox.fill(GROUP_NAME_IMAGECAROUSEL)
-        self.new_name_textbox.press("Enter")
-        expect(self.group_list.get_by_text(GROUP_NAME_IMAGECAROUSEL, exact=True)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        # Close popup.
-        self._close_tutorials_popup_if_visible()
+        self.builder.create_group(GROUP_NAME_IMAGECAROUSEL)
     
     # --- Test create new イメージカルーセル ---
     def create_new_image_carousel(self):
         """Creates a new イメージカルーセル."""
-        for i in range(1):
-            # 会話追加 (イメージカルーセル)
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_imagecarousel.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(IMAGE_CAROUSEL_NAME[i])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(IMAGE_CAROUSEL_NAME[i], timeout=WAITING_TIMEOUT_MS)
+        # 会話追加 (イメージカルーセル)
+        self.builder.add_items([{"rt": "imagecard", "name": image_carousel_name} for image_carousel_name in IMAGE_CAROUSEL_NAME])
 
     # --- Test create reaction for イメージカルーセル ---
     def setting_reaction_imagecarousell(self):
@@ -239,14 +159,8 @@ class CreateImageCarouselMap:
     # --- Test create new イメージマップ ---
     def create_new_image_map(self):
         """Creates a new イメージマップ."""
-        for i in range(1):
-            # 会話追加 (イメージマップ)
-            self.add_kaiwa_button.hover()
-            self.add_kaiwa_imagemap.click()
-            expect(self.new_name_textbox).to_be_editable()
-            self.new_name_textbox.fill(IMAGE_MAP_NAME[i])
-            self.new_name_textbox.press("Enter")
-            expect(self.kaiwa_text_list).to_contain_text(IMAGE_MAP_NAME[i], timeout=WAITING_TIMEOUT_MS)
+        # 会話追加 (イメージマップ)
+        self.builder.add_items([{"rt": "imagemap", "name": image_map_name} for image_map_name in IMAGE_MAP_NAME])
 
     # --- Test draw area for イメージマップ ---
     def setting_area_imagemap(self, image_path: str):
@@ -301,19 +215,11 @@ class CreateImageCarouselMap:
     # --- Create new text item for verification purpose ---
     def create_new_textitem_for_verification(self):
         """Creates a new text item for verification purpose."""
-        # Create Textitem2 under Group3
-        self.add_kaiwa_button.hover()
-        self.add_kaiwa_text.click()
-        expect(self.new_name_textbox).to_be_editable()
-        self.new_name_textbox.fill("Area3:Textitem")
-        self.new_name_textbox.press("Enter")
-        expect(self.kaiwa_text_list).to_contain_text("Area3:Textitem", timeout=WAITING_TIMEOUT_MS)
-        # Add text to Textitem2
-        self.kaiwa_text_msg.last.fill("Verify next chatflow content from Image Map Area 3.")
-        self.kaiwa_text_msg.last.press("Enter")
-        # Close popup.
-        self._close_tutorials_popup_if_visible()
-        expect(self.kaiwa_text_msg.last).to_have_value("Verify next chatflow content from Image Map Area 3.", timeout=WAITING_TIMEOUT_MS)
+        # Create Textitem2 under Group3, with its text
+        self.builder.add_item({
+            "rt": "text", "name": "Area3:Textitem",
+            "msg": "Verify next chatflow content from Image Map Area 3.",
+        })
 
     # --- Test Deploy and verify API call ---
     def deploy_and_verify(self):
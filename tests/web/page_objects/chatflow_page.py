@@ -1,18 +1,49 @@
 # page_objects/chatflow_page.py
+import time
 from playwright.sync_api import Page, expect
 from config import WAITING_TIMEOUT_MS
+from .locators import on_page, GROUP_PANE, HEADER_APP_TAB
 
 class ChatflowPage:
     """Page object for the Chatflow (会話フロー) screen."""
+    # Locators for different panes
+    group_pane = GROUP_PANE
+    action_pane = on_page.locator("section[class='left-pane action-pane']")
+    canv_pane = on_page.locator("section[class='center-pane canv']")
+    add_group_button = on_page.get_by_role("button", name="グループ追加")
+    # Access chat flow screen
+    header_app_tab = HEADER_APP_TAB
+
     def __init__(self, page: Page):
         self.page = page
-        # Locators for different panes
-        self.group_pane = page.locator("section[class='left-pane group-pane']")
-        self.action_pane = page.locator("section[class='left-pane action-pane']")
-        self.canv_pane = page.locator("section[class='center-pane canv']")
     # ==================================================================
     
 
+    # ==================================================================
+    # Navigation
+    # ==================================================================
+    # --- Return to 会話フロー page (used to reset pooled contexts) ---
+    def return_to_chatflow(self):
+        """Opens the chatflow screen from any screen of the bot (its tutorials popup is closed by the PopupManager)."""
+        self.header_app_tab.click()
+        expect(self.group_pane).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+
+    # --- Reload and time the 会話フロー page (used by the stress scenarios) ---
+    def measure_load(self, last_group_name: str, timeout_ms: int) -> dict:
+        """
+        Reloads the chatflow screen and returns, in ms from the start of the reload:
+        tti_ms (the グループ追加 button can be used) and group_pane_ms (`last_group_name` is rendered).
+        """
+        start = time.perf_counter()
+        self.page.reload(wait_until="commit")
+        expect(self.add_group_button).to_be_enabled(timeout=timeout_ms)
+        tti_ms = round((time.perf_counter() - start) * 1000, 1)
+        expect(self.group_pane.get_by_text(last_group_name, exact=True)).to_be_visible(timeout=timeout_ms)
+        group_pane_ms = round((time.perf_counter() - start) * 1000, 1)
+        return {"tti_ms": tti_ms, "group_pane_ms": group_pane_ms}
+    # ==================================================================
+
+
     # ==================================================================
     # Verification start
     # ==================================================================
@@ -1,95 +1,122 @@
 # page_objects/check_clear_data.py
-from playwright.sync_api import Page, expect, Locator
-from typing import Optional
+from playwright.sync_api import Page, expect
 from config import WAITING_TIMEOUT_MS
-# from tests.web.test_data import (
-
-#     )
+from tests.web.test_data import GROUPS_TO_KEEP
+from tests.web.utils.api_cleanup import ApiCleanupEngine
+from tests.web.utils.api_helpers import ApiUnavailableError
+from .chatflow_page import ChatflowPage
+from .locators import (
+    on_page, CONFIRM_POPUP, COUPON_CREATE_BUTTON, COUPON_DATA_ROWS,
+    COUPON_DELETE_CONFIRM_BUTTON, COUPON_DELETE_ICON, COUPON_LIST_VIEW_FIRST, HEADER_USER_TAB,
+    LEFT_MENU_ALL_BUTTON, LEFT_MENU_BAR, MID_MENU_BAR, SEGMENT_POPUP,
+    THREE_DOTS_ICON, THREE_DOTS_POPUP,
+    )
 
 class CheckClearData:
     """Page object for Check and Clear previous created data before run the test."""
-    def __init__(self, page: Page):
+    # Delete Group (Chatflow) Locators
+    group_list_items = on_page.locator("section.groups > ul.groups > li")
+    group_delete_popup = on_page.locator("section[class='popover right group-form']")
+    group_delete_confirm_button = group_delete_popup.get_by_role("button", name="削除")
+    group_delete_confirm_popup = CONFIRM_POPUP
+    group_delete_yes_button = group_delete_confirm_popup.get_by_role("button", name="はい")
+    # Access coupon screen Locators
+    three_dots_icon = THREE_DOTS_ICON
+    three_dots_popup = THREE_DOTS_POPUP
+    coupon_create_button = COUPON_CREATE_BUTTON
+    # Delete coupon Locators
+    coupon_list_view_first = COUPON_LIST_VIEW_FIRST
+    coupon_delete_icon = COUPON_DELETE_ICON
+    coupon_delete_popup = CONFIRM_POPUP
+    coupon_delete_confirm_button = COUPON_DELETE_CONFIRM_BUTTON
+    coupon_data_rows = COUPON_DATA_ROWS
+    # Access user screen Locators
+    header_user_tab = HEADER_USER_TAB
+    left_menu_bar = LEFT_MENU_BAR
+    left_menu_all_button = LEFT_MENU_ALL_BUTTON
+    mid_menu_bar = MID_MENU_BAR
+    # Delete Segment Locators
+    segment_list_items = on_page.locator("section > ul.filters > li.filter")
+    segment_popup = SEGMENT_POPUP
+    segment_delete_button = segment_popup.get_by_role("button", name="削除")
+
+    def __init__(self, page: Page, use_api: bool = False):
         self.page = page
-        # Tutorials popup Locators
-        self.tutorials_popup = page.locator(".popup:has-text('チャットボットの会話方法を選択')")
-        self.close_popup_button = self.tutorials_popup.locator(".icon.close")
-        # Delete Group (Chatflow) Locators
-        self.group_list_items = page.locator("section.groups > ul.groups > li")
-        self.group_delete_popup = page.locator("section[class='popover right group-form']")
-        self.group_delete_confirm_button = self.group_delete_popup.get_by_role("button", name="削除")
-        self.group_delete_confirm_popup = page.locator("section[class='popup popup-confirm']")
-        self.group_delete_yes_button = self.group_delete_confirm_popup.get_by_role("button", name="はい")
-        # Access coupon screen Locators
-        self.three_dots_icon = page.locator("header[scope='controller']").locator("a[class='miniapps icon dots-v']")
-        self.three_dots_popup = page.locator("//section[@class='popover bottom white']")
-        self.coupon_create_button = page.get_by_role("button", name="クーポン発行")
-        # Delete coupon Locators
-        self.coupon_list_view_first = page.locator(".list-view").locator("tr[i='0']")
-        self.coupon_delete_icon = self.coupon_list_view_first.locator("i.icon.trash")
-        self.coupon_delete_popup = page.locator("section[class='popup popup-confirm']")
-        self.coupon_delete_confirm_button = self.coupon_delete_popup.get_by_role("button", name="確定")
-        self.coupon_data_rows = page.locator("table.list-view tr[i]")
-        # Access user screen Locators
-        self.header_user_tab = page.locator("//a[@name='user_list_view']")
-        self.left_menu_bar = page.locator("//section[@class='left-pane with-thumb']")
-        self.left_menu_all_button = self.left_menu_bar.get_by_text("すべて", exact=True)
-        self.mid_menu_bar = page.locator("//section[@class='left-pane subgroups']")   
-        # Delete Segment Locators
-        self.segment_list_items = page.locator("section > ul.filters > li.filter")
-        self.segment_popup = page.locator("//div[@class='wide-window']")
-        self.segment_delete_button = self.segment_popup.get_by_role("button", name="削除")
+        # With --api-cleanup, prefer the backend API for bulk deletes and fall back to the UI when it is unavailable
+        self.use_api = use_api
+        self._api_engine = None
     # ==================================================================
 
 
     # ==================================================================
     # Reusable Helper Methods
     # ==================================================================
-    # --- Reusable Helper Methods for Popups ---
-    def _close_tutorials_popup_if_visible(self):
-        """Helper to close the tutorials popup if it is visible."""
-        expect(self.tutorials_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.close_popup_button.click()
-        expect(self.tutorials_popup).to_be_hidden(timeout=WAITING_TIMEOUT_MS)
+    # --- Reusable Helper Methods for API cleanup ---
+    def _clear_with_api(self, kind: str) -> bool:
+        """
+        Deletes all unwanted records of a kind ('groups', 'coupons', 'segments') through the backend API.
+        Returns False when the API is unavailable, so the caller falls back to the UI path.
+        """
+        if not self.use_api:
+            return False
+        try:
+            if self._api_engine is None:
+                # Created on first use, while the page is still on the bot's chatflow URL
+                self._api_engine = ApiCleanupEngine(self.page)
+            deleted = self._api_engine.clear(kind)
+        except ApiUnavailableError as e:
+            print(f"API cleanup of {kind} unavailable ({e}). Falling back to the UI.")
+            self.use_api = False
+            return False
+        print(f"Deleted {deleted} {kind} through the API.")
+        return True
 
     # --- Reusable Helper Methods for Groups (ChatFlow) ---
-    def _find_next_unwanted_group(self) -> Optional[Locator]:
+    def _snapshot_groups(self) -> list:
         """
-        Finds the first group that should be deleted.
-        Returns its locator, or None if no unwanted groups are found.
+        Reads the whole group pane in a single round-trip.
+        Returns one dict per group: {"name": str, "deletable": bool, "index": DOM index}.
         """
-        groups_to_keep = {"定期配信", "アーカイブ", "デフォルトグループ"}
-        # Use .all() to get a static list for the current scan
-        for group_locator in self.group_list_items.all():
-            group_name = group_locator.locator("h5").inner_text()
-            cog_icon_exists = group_locator.locator("i.icon.cog").count() > 0
-
-            if group_name not in groups_to_keep and cog_icon_exists:
-                return group_locator  # Return the locator of the first match
-        return None  # No unwanted groups were found
+        return self.group_list_items.evaluate_all(
+            """(items) => items.map((item, index) => ({
+                name: (item.querySelector('h5')?.innerText || '').trim(),
+                deletable: item.querySelector('i.icon.cog') !== null,
+                index,
+            }))"""
+        )
 
     # --- Reusable Helper Methods for Delete unwanted group in Chatflow ---
     def _delete_unwanted_groups(self):
         """Helper method to delete all groups not in the 'keep' list."""
         while True:
-            group_to_delete = self._find_next_unwanted_group()
-            if group_to_delete is None:
+            snapshot = self._snapshot_groups()
+            unwanted_groups = [
+                group for group in snapshot
+                if group["deletable"] and group["name"] not in GROUPS_TO_KEEP
+            ]
+            if not unwanted_groups:
                 # This is the exit condition: no more deletable groups were found.
                 break
-            
-            group_name = group_to_delete.locator("h5").inner_text()
-            print(f"Found unwanted group: '{group_name}'. Deleting it...")
-
-            # Click the cog icon within that specific group's locator
-            group_to_delete.locator("i.icon.cog").click()
-            
-            # Handle the popup confirmation
-            expect(self.group_delete_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-            self.group_delete_confirm_button.click()
-            expect(self.group_delete_confirm_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-            self.group_delete_yes_button.click()
-            expect(self.group_delete_popup).not_to_be_visible(timeout=WAITING_TIMEOUT_MS)
-            # Close tutorials popup
-            self._close_tutorials_popup_if_visible()
+
+            group_count = len(snapshot)
+            # Delete bottom-up, so the DOM index of every remaining unwanted group stays valid
+            for group in reversed(unwanted_groups):
+                group_name = group["name"]
+                print(f"Found unwanted group: '{group_name}'. Deleting it...")
+
+                # Click the cog icon of that group (the name filter guards against a shifted index)
+                group_to_delete = self.group_list_items.nth(group["index"]).filter(has_text=group_name)
+                group_to_delete.locator("i.icon.cog").click()
+
+                # Handle the popup confirmation
+                expect(self.group_delete_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+                self.group_delete_confirm_button.click()
+                expect(self.group_delete_confirm_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+                self.group_delete_yes_button.click()
+                expect(self.group_delete_popup).not_to_be_visible(timeout=WAITING_TIMEOUT_MS)
+                # Incremental refresh: confirm the row is gone instead of re-scanning every group
+                group_count -= 1
+                expect(self.group_list_items).to_have_count(group_count, timeout=WAITING_TIMEOUT_MS)
         print("Finished cleaning up groups.")
 
 
@@ -122,7 +149,9 @@ class CheckClearData:
     # --- Delete all unwanted groups before starting the test ---
     def check_clear_unwanted_groups(self):
         """Access the group screen and remove all unwanted groups."""
-        self._delete_unwanted_groups()
+        # The group pane is not re-rendered after API deletes; the next steps leave this screen anyway.
+        if not self._clear_with_api("groups"):
+            self._delete_unwanted_groups()
 
     # --- Delete all unwanted coupons before starting the test ---
     def check_clear_unwanted_coupons(self):
@@ -131,7 +160,8 @@ class CheckClearData:
         self.three_dots_popup.get_by_text("クーポン").click()
         expect(self.coupon_create_button).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         # Delete all unwanted coupons
-        self.delete_all_coupons()
+        if not self._clear_with_api("coupons"):
+            self.delete_all_coupons()
 
     # --- Delete all segments before starting the test ---
     def check_clear_unwanted_segment(self):
@@ -143,4 +173,13 @@ class CheckClearData:
         self.left_menu_all_button.click()               # すべて
         expect(self.mid_menu_bar).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         # Delete all segments
-        self._delete_all_segments()
\ No newline at end of file
+        if not self._clear_with_api("segments"):
+            self._delete_all_segments()
+
+    # --- Run the whole cleanup in one go (used by the per-worker setup in parallel runs) ---
+    def clear_all_previous_data(self):
+        """Verify the chatflow page and remove all previous created groups, coupons and segments."""
+        ChatflowPage(self.page).verify_ui_elements_are_visible()
+        self.check_clear_unwanted_groups()
+        self.check_clear_unwanted_coupons()
+        self.check_clear_unwanted_segment()
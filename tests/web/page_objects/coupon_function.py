@@ -6,50 +6,58 @@ from tests.web.test_data import (
     CP_SEGMENT_NAME, COUPON_NAME1, COUPON_DESCRIPTION,
     COUPON_DISCOUNT_CHANGE, COUPON_NAME2, COUPON_NAME3
     )
+from .locators import (
+    on_page, AUTOCOMPLETE_LIST, CONFIRM_POPUP, COUPON_CREATE_BUTTON,
+    COUPON_CREATE_POPUP, COUPON_DATA_ROWS, COUPON_DELETE_CONFIRM_BUTTON, COUPON_DELETE_ICON,
+    COUPON_LIST_VIEW_FIRST, COUPON_NAME_INPUT, HEADER_USER_TAB, LEFT_MENU_ALL_BUTTON,
+    LEFT_MENU_BAR, MID_MENU_BAR, SEGMENT_POPUP, THREE_DOTS_ICON,
+    THREE_DOTS_POPUP,
+    )
 
 class CouponFunction:
     """Page object for the test create coupon (クーポン) in クーポン screen."""
+    # --- User screen, create segment ---
+    header_user_tab = HEADER_USER_TAB
+    left_menu_bar = LEFT_MENU_BAR
+    left_menu_all_button = LEFT_MENU_ALL_BUTTON
+    mid_menu_bar = MID_MENU_BAR
+    segment_button = mid_menu_bar.locator("button[hint='セグメント追加']").get_by_text("セグメント")
+    segment_popup = SEGMENT_POPUP
+    segment_save_button = segment_popup.locator("button[class='icon save label']")
+    save_popup_name_input = on_page.locator("input[id='filter_name']")
+    # --- Access coupon screen ---
+    three_dots_icon = THREE_DOTS_ICON
+    three_dots_popup = THREE_DOTS_POPUP
+    # --- Create new coupon ---
+    coupon_create_button = COUPON_CREATE_BUTTON
+    coupon_create_popup = COUPON_CREATE_POPUP
+    coupon_name_input = COUPON_NAME_INPUT
+    coupon_segment_input = coupon_create_popup.locator("input[placeholder='Enter を入力して保存']")
+    coupon_segment_select = AUTOCOMPLETE_LIST
+    coupon_end_date = on_page.locator("input[class='dt-picker dt-picker-ipt']").last
+    coupon_description_input = on_page.locator("textarea[title='詳細説明']")
+    coupon_image_upload = on_page.locator('input[type="file"][name="image"]')
+    coupon_image_popup_confirm = CONFIRM_POPUP
+    coupon_list_view_first = COUPON_LIST_VIEW_FIRST
+    coupon_list_icon_send = coupon_list_view_first.locator(".icon.send")
+    # --- Edit coupon ---
+    coupon_discount_input = coupon_create_popup.locator("input[name='discount']")
+    coupon_discount_jpy = coupon_create_popup.locator("input[data-value='JPY']")
+    # --- Send coupon ---
+    coupon_sent_popup = on_page.locator("section[id='coupon_priview']")
+    coupon_sent_popup_icon_send = coupon_sent_popup.locator(".icon.send")
+    coupon_sent_complete_popup = on_page.locator("div[class='popup window']")
+    coupon_sent_complete_close = coupon_sent_complete_popup.locator("i.icon.close")
+    # --- Delete coupon ---
+    coupon_delete_icon = COUPON_DELETE_ICON
+    coupon_delete_popup = CONFIRM_POPUP
+    coupon_delete_confirm_button = COUPON_DELETE_CONFIRM_BUTTON
+    coupon_data_rows = COUPON_DATA_ROWS
+    # --- Search coupon ---
+    coupon_search_input = on_page.locator("input[placeholder='クーポンコードまたは名前で検索']")
+
     def __init__(self, page: Page):
         self.page = page
-        # --- User screen, create segment ---
-        self.header_user_tab = page.locator("//a[@name='user_list_view']")
-        self.left_menu_bar = page.locator("//section[@class='left-pane with-thumb']")
-        self.left_menu_all_button = self.left_menu_bar.get_by_text("すべて", exact=True)
-        self.mid_menu_bar = page.locator("//section[@class='left-pane subgroups']")
-        self.segment_button = self.mid_menu_bar.locator("button[hint='セグメント追加']").get_by_text("セグメント")
-        self.segment_popup = page.locator("//div[@class='wide-window']")
-        self.segment_save_button = self.segment_popup.locator("button[class='icon save label']")
-        self.save_popup_name_input = page.locator("input[id='filter_name']")
-        # --- Access coupon screen ---
-        self.three_dots_icon = page.locator("header[scope='controller']").locator("a[class='miniapps icon dots-v']")
-        self.three_dots_popup = page.locator("//section[@class='popover bottom white']")
-        # --- Create new coupon ---
-        self.coupon_create_button = page.get_by_role("button", name="クーポン発行")
-        self.coupon_create_popup = page.locator("//section[@class='popup white form coupon-edit-popup']")
-        self.coupon_name_input = self.coupon_create_popup.locator("input[placeholder='クーポン名']")
-        self.coupon_segment_input = self.coupon_create_popup.locator("input[placeholder='Enter を入力して保存']")
-        self.coupon_segment_select = page.locator("ul#form-item-autocomplete")
-        self.coupon_end_date = page.locator("input[class='dt-picker dt-picker-ipt']").last
-        self.coupon_description_input = page.locator("textarea[title='詳細説明']")
-        self.coupon_image_upload = page.locator('input[type="file"][name="image"]')
-        self.coupon_image_popup_confirm = page.locator("section[class='popup popup-confirm']")
-        self.coupon_list_view_first = page.locator(".list-view").locator("tr[i='0']")
-        self.coupon_list_icon_send = self.coupon_list_view_first.locator(".icon.send")
-        # --- Edit coupon ---
-        self.coupon_discount_input = self.coupon_create_popup.locator("input[name='discount']")
-        self.coupon_discount_jpy = self.coupon_create_popup.locator("input[data-value='JPY']")
-        # --- Send coupon ---
-        self.coupon_sent_popup = page.locator("section[id='coupon_priview']")
-        self.coupon_sent_popup_icon_send = self.coupon_sent_popup.locator(".icon.send")
-        self.coupon_sent_complete_popup = page.locator("div[class='popup window']")
-        self.coupon_sent_complete_close = self.coupon_sent_complete_popup.locator("i.icon.close")
-        # --- Delete coupon ---
-        self.coupon_delete_icon = self.coupon_list_view_first.locator("i.icon.trash")
-        self.coupon_delete_popup = page.locator("section[class='popup popup-confirm']")
-        self.coupon_delete_confirm_button = self.coupon_delete_popup.get_by_role("button", name="確定")
-        self.coupon_data_rows = page.locator("table.list-view tr[i]")
-        # --- Search coupon ---
-        self.coupon_search_input = page.locator("input[placeholder='クーポンコードまたは名前で検索']")
     # ==================================================================
     
 
@@ -94,19 +102,29 @@ class CouponFunction:
             self.coupon_delete_confirm_button.click()
             expect(self.coupon_delete_popup).not_to_be_visible(timeout=WAITING_TIMEOUT_MS)
 
+    # --- Navigation ---
+    def open_user_screen(self):
+        """Opens the user screen (ユーザ) with all users (すべて) listed."""
+        expect(self.header_user_tab).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.header_user_tab.click()                    # ユーザ
+        expect(self.left_menu_bar).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.left_menu_all_button.click()               # すべて
+        expect(self.mid_menu_bar).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+
+    def open_coupon_screen(self):
+        """Opens the coupon screen through the three dots menu."""
+        self.three_dots_icon.click()
+        self.three_dots_popup.get_by_text("クーポン").click()
+        expect(self.coupon_create_button).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+
     # ==================================================================
     # Verification start
     # ==================================================================
     # --- Test create new segments ---
     def create_segment(self):
         """Create new segment in the user screen."""
-        # Access user screen.
-        expect(self.header_user_tab).to_be_visible(timeout=WAITING_TIMEOUT_MS)
-        self.header_user_tab.click()                    # ユーザ
-        expect(self.left_menu_bar).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.open_user_screen()
         # Create new segment.
-        self.left_menu_all_button.click()               # すべて
-        expect(self.mid_menu_bar).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         self.segment_button.click()                     # +セグメント
         expect(self.segment_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         self.segment_save_button.click()                # 保存ボタン
@@ -118,9 +136,7 @@ class CouponFunction:
     # --- Test open coupon screen and delete all previous created coupon test data ---
     def access_coupon_screen(self):
         """Access the coupon screen."""
-        self.three_dots_icon.click()
-        self.three_dots_popup.get_by_text("クーポン").click()
-        expect(self.coupon_create_button).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        self.open_coupon_screen()
         # Delete all coupon before start the test
         self._delete_all_coupons	()
 
@@ -0,0 +1,52 @@
+# page_objects/locators.py
+from tests.web.utils.locator_registry import on_page
+
+# ==================================================================
+# Locators shared by several page objects
+# ==================================================================
+# --- Header, lists and popups of the admin screens ---
+HEADER_APP_TAB = on_page.locator("//a[@name='bot_edit_view']")
+HEADER_USER_TAB = on_page.locator("//a[@name='user_list_view']")
+THREE_DOTS_ICON = on_page.locator("header[scope='controller']").locator("a[class='miniapps icon dots-v']")
+THREE_DOTS_POPUP = on_page.locator("//section[@class='popover bottom white']")
+TUTORIALS_POPUP = on_page.locator(".popup:has-text('チャットボットの会話方法を選択')")
+TUTORIALS_POPUP_CLOSE = TUTORIALS_POPUP.locator(".icon.close")
+CONFIRM_POPUP = on_page.locator("section[class='popup popup-confirm']")
+AUTOCOMPLETE_LIST = on_page.locator("ul#form-item-autocomplete")
+LIST_VIEW = on_page.locator(".list-view")
+
+# --- Deploy (公開する) ---
+DEPLOY_BUTTON = on_page.get_by_role("button", name="公開する")
+DEPLOY_POPUP = on_page.locator(".popup:has-text('[公開]すると、以下のfacebook page、またはLINEアカウントに反映されます。')")
+DEPLOY_OK_BUTTON = DEPLOY_POPUP.get_by_role("button", name="OK")
+DEPLOY_COMPLETE_POPUP = on_page.locator(".popup:has-text('デプロイが完了しました！')")
+
+# --- 会話フロー editor ---
+GROUP_PANE = on_page.locator("section[class='left-pane group-pane']")
+GROUP_LIST = on_page.locator("ul.groups")
+KAIWA_TEXT_LIST = on_page.locator(".actions")
+REACT_CONTENT_CARDS = on_page.locator("div[class='cells rt-card rt-image rt-video rt-audio rt-imagemap rt-flyer rt-imagecard rt-flex']")
+MEDIA_CARDS = on_page.locator("div[class='cells-frame rt-card rt-imagecard rt-image rt-video rt-audio rt-imagemap rt-flyer rt-flex']")
+NODES_PANE = on_page.locator("section[class='nodes-pane']")
+BUTTON_NAME_INPUT = on_page.locator("input[id='input_bot_btn']")
+CARD_SRC_SELECT = on_page.locator("dl[class='card-src']")
+REACT_API_INPUT = on_page.locator("input[placeholder='Your API URL']")
+DESTINATION_CONVERSATION = on_page.locator("input[target_name='act']")
+DESTINATION_CONVERSATION_SELECT = on_page.locator("span[class='autocomplete-select']")
+SAVE_BUTTON = on_page.locator("button[id='save_btn_purple']")
+ICON_SIGNOUT = on_page.locator(".icon.signout")
+
+# --- User screen (segments) ---
+LEFT_MENU_BAR = on_page.locator("//section[@class='left-pane with-thumb']")
+LEFT_MENU_ALL_BUTTON = LEFT_MENU_BAR.get_by_text("すべて", exact=True)
+MID_MENU_BAR = on_page.locator("//section[@class='left-pane subgroups']")
+SEGMENT_POPUP = on_page.locator("//div[@class='wide-window']")
+
+# --- Coupon screen ---
+COUPON_CREATE_BUTTON = on_page.get_by_role("button", name="クーポン発行")
+COUPON_CREATE_POPUP = on_page.locator("//section[@class='popup white form coupon-edit-popup']")
+COUPON_NAME_INPUT = COUPON_CREATE_POPUP.locator("input[placeholder='クーポン名']")
+COUPON_LIST_VIEW_FIRST = LIST_VIEW.locator("tr[i='0']")
+COUPON_DELETE_ICON = COUPON_LIST_VIEW_FIRST.locator("i.icon.trash")
+COUPON_DELETE_CONFIRM_BUTTON = CONFIRM_POPUP.get_by_role("button", name="確定")
+COUPON_DATA_ROWS = on_page.locator("table.list-view tr[i]")
@@ -1,16 +1,19 @@
 # page_objects/login_page.py
 from playwright.sync_api import Page, expect
-from config import ADMIN_URL, WAITING_TIMEOUT_MS
+from config import WAITING_TIMEOUT_MS
+from tests.web.utils.timeouts import adaptive_timeouts
+from .locators import on_page
 
 class LoginPage:
     """Page object for the login screen."""
+    # Locators
+    email_input = on_page.locator("input[name='email']")
+    password_input = on_page.locator("input[name='pass']")
+    login_button = on_page.locator("button.show-mail-login")
+    new_app_button = on_page.locator("button[hint='新しいアプリ作成']")
+
     def __init__(self, page: Page):
         self.page = page
-        # Locators
-        self.email_input = page.locator("input[name='email']")
-        self.password_input = page.locator("input[name='pass']")
-        self.login_button = page.locator("button.show-mail-login")
-        self.new_app_button = page.locator("button[hint='新しいアプリ作成']")
     # ==================================================================
     
 
@@ -29,4 +32,17 @@ class LoginPage:
         self.password_input.fill(password)
         self.login_button.click()
         # Wait for a reliable element on the next page to confirm login
-        expect(self.new_app_button).to_be_visible(timeout=WAITING_TIMEOUT_MS)
\ No newline at end of file
+        with adaptive_timeouts.track("login") as login_timeout_ms:
+            expect(self.new_app_button).to_be_visible(timeout=login_timeout_ms)
+
+    # --- Login only when the cached session was rejected ---
+    def ensure_logged_in(self, email: str, password: str) -> bool:
+        """
+        Logs in only if the server redirected to the login form.
+        Returns True when a fresh login was performed, False when the existing session was accepted.
+        """
+        expect(self.new_app_button.or_(self.email_input)).to_be_visible(timeout=WAITING_TIMEOUT_MS)
+        if self.new_app_button.is_visible():
+            return False
+        self.login(email, password)
+        return True
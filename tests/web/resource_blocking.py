@@ -0,0 +1,53 @@
+# RESOURCE BLOCKING PROFILES (--block-profile)
+# Requests matching a profile are aborted before they reach the network. No test asserts on
+# fonts or third-party trackers, so "safe" is the default for headless runs. "aggressive" also
+# blocks images and media, except those of the admin host (and the local mock server). If the
+# uploaded images/videos are served from another host, add it to its allow_url_globs.
+
+# Analytics and tracking pixels
+TRACKER_URL_GLOBS = [
+    "**://*.google-analytics.com/**",
+    "**://www.googletagmanager.com/**",
+    "**://*.doubleclick.net/**",
+    "**://connect.facebook.net/**",
+    "**://www.facebook.com/tr*",
+    "**://*.hotjar.com/**",
+    "**://www.clarity.ms/**",
+]
+# Web fonts, matched by extension (also blocked on hosts exempted from the resource type rule)
+FONT_URL_GLOBS = ["**/*.woff", "**/*.woff2", "**/*.ttf", "**/*.otf"]
+#   resource_types: Playwright resource types blocked wherever they come from
+#   url_globs: URL globs blocked whatever their resource type
+#   allow_url_globs: URL globs exempt from the resource type rule (url_globs still apply)
+BLOCK_PROFILES = {
+    "none": {
+        "resource_types": set(),
+        "url_globs": [],
+        "allow_url_globs": [],
+    },
+    "safe": {
+        "resource_types": {"font"},
+        "url_globs": TRACKER_URL_GLOBS,
+        "allow_url_globs": [],
+    },
+    "aggressive": {
+        "resource_types": {"font", "image", "media"},
+        "url_globs": TRACKER_URL_GLOBS + FONT_URL_GLOBS,
+        # Images and videos of the admin host (uploads and their previews) are still loaded
+        "allow_url_globs": [
+            "**://pre.bonp.me/**",
+            "**://127.0.0.1:*/**",
+        ],
+    },
+}
+# Profile used for headless runs when --block-profile is not given (headed runs block nothing)
+DEFAULT_HEADLESS_BLOCK_PROFILE = "safe"
+
+# Blocked responses are never downloaded, so the bytes saved are estimated per resource type
+ESTIMATED_BYTES_PER_RESOURCE = {
+    "font": 60 * 1024,
+    "image": 80 * 1024,
+    "media": 1024 * 1024,
+    "script": 50 * 1024,
+}
+ESTIMATED_BYTES_DEFAULT = 5 * 1024
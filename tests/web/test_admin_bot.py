@@ -1,24 +1,30 @@
 from typing import Callable
 import pytest
 import logging
-from playwright.sync_api import Page, Error as PlaywrightError
+from playwright.sync_api import Page
 from datetime import datetime, date, time, timedelta
 from page_objects import (
     ChatflowPage, CheckClearData, CreateChat, CreateCarousel, CouponFunction, 
     CreateImageCarouselMap, CreateImageVideo, CreateConditionItem
     )
+from tests.web.utils.step_runner import StepRunner
+from tests.web.utils.media_registry import MediaRegistry
+from tests.web.test_data import (
+    GROUP_NAME_KAIWA, GROUP_NAME_CAROUSEL, GROUP_NAME_IMAGECAROUSEL, GROUP_NAME_IMGnVDO, GROUP_NAME_CONDITION,
+    CP_SEGMENT_NAME
+    )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 @pytest.mark.setup
-def test_clear_previous_created_data(logged_in_chatflow_page: Page):
+def test_clear_previous_created_data(logged_in_chatflow_page: Page, step_runner: StepRunner, api_cleanup: bool):
     """
     Check and clear created data test before start run the test.
     """
     logger.info("--- Starting test: Check and Clear previous created data ---")
-    check_clear_data = CheckClearData(logged_in_chatflow_page)
+    check_clear_data = CheckClearData(logged_in_chatflow_page, use_api=api_cleanup)
 
     test_steps = [
         (ChatflowPage(logged_in_chatflow_page).verify_ui_elements_are_visible, 
@@ -36,22 +42,12 @@ def test_clear_previous_created_data(logged_in_chatflow_page: Page):
         
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e: # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e: # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
 
 @pytest.mark.chatflow
-def test_chatflow_kaiwa(logged_in_chatflow_page: Page):
+@pytest.mark.flow(produces=(GROUP_NAME_KAIWA,))
+def test_chatflow_kaiwa(logged_in_chatflow_page: Page, step_runner: StepRunner):
     """
     Test creating a new 会話 flow and all related reaction.
      - Verifies the UI on the chatflow page.
@@ -87,21 +83,12 @@ def test_chatflow_kaiwa(logged_in_chatflow_page: Page):
          "[7] FAILED to deploy the chatflow."),
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e: # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e: # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
 @pytest.mark.coupon
-def test_coupon_function(logged_in_chatflow_page: Page, image_path_factory: Callable[..., str]):
+# "coupon_list": this test wipes every coupon, so coupons used by other flows must be created after it.
+@pytest.mark.flow(produces=(CP_SEGMENT_NAME, "coupon_list"))
+def test_coupon_function(logged_in_chatflow_page: Page, step_runner: StepRunner, image_path_factory: Callable[..., str]):
     """
     Verify the Coupon page functionality.
     - Create new coupon with segment, end date, description and image.
@@ -146,22 +133,12 @@ def test_coupon_function(logged_in_chatflow_page: Page, image_path_factory: Call
          "[8] FAILED to search the coupon."),
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e:  # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise  # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e:  # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise  # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
 @pytest.mark.chatflow
 @pytest.mark.carousel
-def test_chatflow_carousel(logged_in_chatflow_page: Page):
+@pytest.mark.flow(produces=(GROUP_NAME_CAROUSEL,), consumes=("coupon_list",))
+def test_chatflow_carousel(logged_in_chatflow_page: Page, step_runner: StepRunner):
     """
     Test creating a new カルーセル flow and all related reaction.
     -  Create a new Group2.
@@ -199,22 +176,12 @@ def test_chatflow_carousel(logged_in_chatflow_page: Page):
          "[8] FAILED to deploy the chatflow."),
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e:  # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise  # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e:  # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise  # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
 @pytest.mark.chatflow
 @pytest.mark.image_carousel_map
-def test_chatflow_image_carousel_map(logged_in_chatflow_page: Page, image_path_factory: Callable[..., str]):
+@pytest.mark.flow(produces=(GROUP_NAME_IMAGECAROUSEL,), consumes=(GROUP_NAME_KAIWA, GROUP_NAME_CAROUSEL))
+def test_chatflow_image_carousel_map(logged_in_chatflow_page: Page, step_runner: StepRunner, image_path_factory: Callable[..., str], seeded_groups: frozenset):
     """
     Test creating a new イメージカルーセル flow and イメージマップ flow and all related reaction.
     - Create a new group "Group3".
@@ -225,7 +192,7 @@ def test_chatflow_image_carousel_map(logged_in_chatflow_page: Page, image_path_f
     - Deploy and verify.
     """
     logger.info("--- Starting test: Test creating a new イメージカルーセル flow and all related reaction. ---")
-    create_image_carousel = CreateImageCarouselMap(logged_in_chatflow_page)
+    create_image_carousel = CreateImageCarouselMap(logged_in_chatflow_page, existing_groups=seeded_groups)
     
     imagemap_image_path = image_path_factory("image_map")
 
@@ -256,32 +223,24 @@ def test_chatflow_image_carousel_map(logged_in_chatflow_page: Page, image_path_f
          "[8] FAILED to deploy the chatflow."),
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e:  # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise  # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e:  # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise  # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
 
 @pytest.mark.chatflow
 @pytest.mark.image_video
-def test_chatflow_image_video(logged_in_chatflow_page: Page, image_path_factory: Callable[..., str]):
+@pytest.mark.flow(produces=(GROUP_NAME_IMGnVDO,))
+def test_chatflow_image_video(logged_in_chatflow_page: Page, step_runner: StepRunner, image_path_factory: Callable[..., str],
+                              media_registry: MediaRegistry):
     """
     Test creating a new 画像＆動画 flow and all related reaction.
     -  Create a new Group4.
      - Create a new Image/Video items.
      - Setting reaction (API)
+     - Upload the images/videos concurrently
     - Deploy and verify.
     """
     logger.info("--- Starting test: Test creating a new 画像＆動画 flow and all related reaction. ---")
-    create_image_video = CreateImageVideo(logged_in_chatflow_page)
+    create_image_video = CreateImageVideo(logged_in_chatflow_page, media_registry=media_registry)
 
     image_item_path = image_path_factory("image1")
     video_item_path = image_path_factory("video1")
@@ -305,25 +264,19 @@ def test_chatflow_image_video(logged_in_chatflow_page: Page, image_path_factory:
         (create_image_video.create_new_textitem_for_verification,
          "[6] Created a new text item for verification purpose.",
          "[6] FAILED to create a new text item for verification purpose."),
+        # The uploads of steps 3-5 run in the background until here ("6b" keeps the ids of the other steps)
+        (create_image_video.wait_for_uploads,
+         "[6b] Finished all image/video uploads.",
+         "[6b] FAILED to upload the images/videos."),
         (create_image_video.deploy_and_verify,
          "[7] Deployed the chatflow successfully.",
          "[7] FAILED to deploy the chatflow."),
     ]
 
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e:  # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise  # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e:  # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise  # IMPORTANT: Always re-raise the exception
+    step_runner.run(test_steps)
 
-def test_chatflow_condition_item(logged_in_chatflow_page: Page):
+@pytest.mark.flow(produces=(GROUP_NAME_CONDITION,), consumes=(GROUP_NAME_KAIWA, GROUP_NAME_CAROUSEL))
+def test_chatflow_condition_item(logged_in_chatflow_page: Page, step_runner: StepRunner, seeded_groups: frozenset):
     """
     Test creating a new 条件式 flow and all related reaction.
     -  Create a new Group5.
@@ -332,7 +285,7 @@ def test_chatflow_condition_item(logged_in_chatflow_page: Page):
     - Deploy and verify.
     """
     logger.info("--- Starting test: Test creating a new 条件式 flow and all related reaction. ---")
-    create_condition_item = CreateConditionItem(logged_in_chatflow_page)
+    create_condition_item = CreateConditionItem(logged_in_chatflow_page, existing_groups=seeded_groups)
     test_steps = [
         (create_condition_item.create_new_chat_group,
          "[1] Created a new Group5.",
@@ -347,15 +300,4 @@ def test_chatflow_condition_item(logged_in_chatflow_page: Page):
          "[4] Deployed the chatflow successfully.",
          "[4] FAILED to deploy the chatflow."),
     ]
-    for step_func, success_msg, failure_msg in test_steps:
-        try:
-            step_func()
-            logger.info(f"Test PASSED: {success_msg}")
-        except PlaywrightError as e:  # Catching specific Playwright errors is good practice
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
-            raise  # Re-raise the exception to make sure Pytest marks the test as failed
-        except Exception as e:  # Catch any other unexpected errors
-            logger.error(f"Test FAILED: {failure_msg}")
-            logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
-            raise  # IMPORTANT: Always re-raise the exception
\ No newline at end of file
+    step_runner.run(test_steps)
\ No newline at end of file
@@ -0,0 +1,39 @@
+from typing import Callable
+import pytest
+import logging
+from playwright.sync_api import Page
+from page_objects import ChatflowPage, ChatflowBuilder, CheckClearData
+from tests.web.utils.step_runner import StepRunner
+from tests.web.utils.media_registry import MediaRegistry
+from tests.web.utils.chatflow_compiler import compile_definition, plan_steps, dry_run_counts
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.mark.chatflow_definition
+def test_chatflow_definition(chatflow_definition: dict, logged_in_chatflow_page: Page, step_runner: StepRunner,
+                             image_path_factory: Callable[..., str], media_registry: MediaRegistry, api_cleanup: bool):
+    """
+    Builds a chatflow from a definition file (tests/web/chatflows/, selected with --chatflow-def)
+    through its compiled plan. Meant for load-style runs on their own: it starts from a cleared bot.
+    """
+    logger.info(f"--- Starting test: Chatflow definition '{chatflow_definition['name']}' ---")
+    stages = compile_definition(chatflow_definition)
+    actions, waits = dry_run_counts(stages)
+    logger.info(f"Compiled {len(stages)} stages ({actions} actions, {waits} waits).")
+
+    chatflow_page = ChatflowPage(logged_in_chatflow_page)
+    check_clear_data = CheckClearData(logged_in_chatflow_page, use_api=api_cleanup)
+    def clear_groups():
+        check_clear_data.check_clear_unwanted_groups()
+        chatflow_page.return_to_chatflow()  # re-renders the group pane after API deletes
+
+    test_steps = [
+        (clear_groups,
+         "[0] Cleared previous groups.",
+         "[0] FAILED to clear previous groups."),
+    ] + plan_steps(stages, ChatflowBuilder(logged_in_chatflow_page, media_registry=media_registry), image_path_factory)
+
+    step_runner.run(test_steps)
+    logger.info(f"--- Test Chatflow definition '{chatflow_definition['name']}' completed ---")
@@ -1,6 +1,30 @@
 # TEST DATA
 # DEPLOY API URL GLOB
 APP_JSON_DEPLOY_API = "**/app.json"
+# BOT ACTION API URL GLOB (uploads, API previews, chatflow edits)
+BOT_ACTION_API = "**/api/bot/action"
+BOT_ACTION_PATH = "/api/bot/action"
+
+# BACKEND API (used by the API cleanup engine with --api-cleanup, paths are relative to the admin host)
+# Not yet confirmed against the admin app's own requests: check them in a recorded HAR file
+# (--record-har) before making the API cleanup the default.
+# Extracts the bot id from the chatflow URL the admin app navigates to after selecting a bot.
+BOT_ID_URL_PATTERN = r"/bots?/([0-9A-Za-z_-]+)"
+# {bot_id} and {id} are filled in by the engine. List endpoints return the objects with their "id" and "name".
+CLEANUP_API_ENDPOINTS = {
+    "groups": {"list": "/api/bot/{bot_id}/groups", "delete": "/api/bot/{bot_id}/groups/{id}"},
+    "coupons": {"list": "/api/bot/{bot_id}/coupons", "delete": "/api/bot/{bot_id}/coupons/{id}"},
+    "segments": {"list": "/api/bot/{bot_id}/filters", "delete": "/api/bot/{bot_id}/filters/{id}"},
+}
+# Read-only GET APIs whose responses may be replayed from the network cache (--network-cache)
+CACHEABLE_API_GLOBS = [
+    "**/api/service/recipes/?format=list",
+]
+# Top-level keys of the /api/bot/action upload response that may hold the uploaded file's URL (--reuse-media).
+# Nested objects are never searched, and a response with another format records no URL.
+MEDIA_URL_KEYS = ("url", "src", "file_url", "image_url", "video_url")
+# Built-in groups that must never be deleted by the cleanup
+GROUPS_TO_KEEP = {"定期配信", "アーカイブ", "デフォルトグループ"}
 # IMAGE
 IMAGES = {
     "coupon": "coupon_img.png",
@@ -78,4 +102,28 @@ GROUP_NAME_CONDITION = "Group5"
 CONDITION_ITEM_NAME = "condition1"
 CONDITION_VALUE = "{{user.choice}}=choice1"
 REACTION_TEXTITEM1_ACT = "1:Textitem1"
-REACTION_CAROUSEL2_ACT = "2:carousel2"
\ No newline at end of file
+REACTION_CAROUSEL2_ACT = "2:carousel2"
+
+# API seeding of prerequisite groups with --api-seeding (see tests/web/utils/api_seeding.py)
+# Not yet confirmed against the editor's own requests: check them in a recorded HAR file
+# (--record-har) before making the API seeding the default.
+# Payloads posted to BOT_ACTION_PATH; they mirror the editor's menu items (dd[act='group'], dd[rt='text'],
+# dd[rt='card']). {bot_id}, {group_id} and the item fields are filled in by the seeder, and the
+# response must carry the new record's id under SEED_RESPONSE_ID_KEY.
+SEED_ACTION_PAYLOADS = {
+    "group": {"act": "group", "bot_id": "{bot_id}", "name": "{name}"},
+    "text": {"act": "action", "rt": "text", "bot_id": "{bot_id}", "group_id": "{group_id}", "name": "{name}", "msg": "{msg}"},
+    "card": {"act": "action", "rt": "card", "bot_id": "{bot_id}", "group_id": "{group_id}", "name": "{name}", "title": "{title}"},
+}
+SEED_RESPONSE_ID_KEY = "id"
+# Prerequisite groups referenced by other flows, as item specs of the ChatflowBuilder
+# (rt = the editor's item type). Seeded through the API with --api-seeding, else built through the UI.
+PREREQUISITE_GROUPS = {
+    GROUP_NAME_KAIWA: [
+        {"rt": "text", "name": CHAT_FLOW_TEXT_ITEMS[0], "msg": CHAT_FLOW_TEXT_ITEMS[4]},
+    ],
+    GROUP_NAME_CAROUSEL: [
+        {"rt": "card", "name": CHAT_FLOW_CAROUSEL_NAME[0], "title": "Test Carousel1 Title"},
+        {"rt": "card", "name": CHAT_FLOW_CAROUSEL_NAME[1], "title": "Test Carousel2 Title"},
+    ],
+}
\ No newline at end of file
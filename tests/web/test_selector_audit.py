@@ -0,0 +1,65 @@
+import pytest
+import logging
+from playwright.sync_api import Page
+from page_objects import (
+    LoginPage, BotListViewPage, ChatflowPage, ChatflowBuilder, CheckClearData, CreateChat, CreateCarousel,
+    CouponFunction, CreateImageCarouselMap, CreateImageVideo, CreateConditionItem
+    )
+from tests.web.utils.step_runner import StepRunner
+from tests.web.utils.selector_audit import audit_screen, rank, write_report, format_report
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PAGE_OBJECT_CLASSES = (
+    LoginPage, BotListViewPage, ChatflowPage, ChatflowBuilder, CheckClearData, CreateChat, CreateCarousel,
+    CouponFunction, CreateImageCarouselMap, CreateImageVideo, CreateConditionItem,
+)
+
+@pytest.mark.selector_audit
+def test_selector_audit(request, api_version: str, logged_in_chatflow_page: Page, step_runner: StepRunner):
+    """
+    Times every page object locator on the chatflow, coupon and user screens (query time, match count,
+    retries) and writes the ranked report of slow and ambiguous selectors to report/selector_audit.json.
+    Only reads the screens; the report is also written when a step fails.
+    """
+    logger.info(f"--- Starting test: Selector audit (API {api_version}) ---")
+    chatflow_page = ChatflowPage(logged_in_chatflow_page)
+    coupon_function = CouponFunction(logged_in_chatflow_page)
+    results, screens = [], []
+
+    def audit(screen: str):
+        results.extend(audit_screen(logged_in_chatflow_page, PAGE_OBJECT_CLASSES, screen))
+        screens.append(screen)
+
+    def audit_coupon_screen():
+        coupon_function.open_coupon_screen()
+        audit("coupon")
+
+    def audit_user_screen():
+        coupon_function.open_user_screen()
+        audit("user")
+
+    test_steps = [
+        (lambda: audit("chatflow"),
+         "[1] Audited the locators on the chatflow screen.",
+         "[1] FAILED to audit the locators on the chatflow screen."),
+        (audit_coupon_screen,
+         "[2] Audited the locators on the coupon screen.",
+         "[2] FAILED to audit the locators on the coupon screen."),
+        (audit_user_screen,
+         "[3] Audited the locators on the user screen.",
+         "[3] FAILED to audit the locators on the user screen."),
+        (chatflow_page.return_to_chatflow,
+         "[4] Returned to the chatflow screen.",
+         "[4] FAILED to return to the chatflow screen."),
+    ]
+    try:
+        step_runner.run(test_steps)
+    finally:
+        if results:
+            ranked = rank(results)
+            path = write_report(ranked, api_version=api_version, target=request.config.getoption("--target"), screens=screens)
+            logger.info(f"Selector audit saved to {path}:\n{format_report(ranked)}")
+    logger.info("--- Test Selector audit completed ---")
@@ -0,0 +1,73 @@
+import time
+import pytest
+import logging
+from playwright.sync_api import Page
+from page_objects import ChatflowPage, ChatflowBuilder, CheckClearData
+from config import STRESS_RENDER_TIMEOUT_MS
+from tests.web.utils.step_runner import StepRunner
+from tests.web.utils.chatflow_compiler import compile_definition, run_ops
+from tests.web.utils.stress_scenarios import (
+    stress_definition, stress_group_name, measurement_points, write_curve
+    )
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@pytest.mark.stress
+def test_chatflow_scaling(request, stress_scale: tuple, api_version: str, logged_in_chatflow_page: Page, step_runner: StepRunner,
+                          api_cleanup: bool):
+    """
+    Grows the bot to N groups x M items x K reactions and, at several sizes on the way, measures the
+    chatflow page's time-to-interactive, the group pane render time and the deploy latency.
+    The scaling curve is written to report/stress/ per API version, also when a step fails.
+    """
+    groups, items, reactions = stress_scale
+    logger.info(f"--- Starting test: Stress scenario {groups}x{items}x{reactions} (API {api_version}) ---")
+    chatflow_page = ChatflowPage(logged_in_chatflow_page)
+    builder = ChatflowBuilder(logged_in_chatflow_page)
+    check_clear_data = CheckClearData(logged_in_chatflow_page, use_api=api_cleanup)
+    curve = []
+
+    def clear_groups():
+        check_clear_data.check_clear_unwanted_groups()
+        chatflow_page.return_to_chatflow()  # re-renders the group pane after API deletes
+
+    def build(first_group: int, last_group: int):
+        for stage in compile_definition(stress_definition(first_group, last_group, items, reactions)):
+            run_ops(stage["ops"], builder)
+
+    def measure(group_count: int):
+        point = {"groups": group_count, "items": group_count * items, "reactions": group_count * items * reactions}
+        point.update(chatflow_page.measure_load(stress_group_name(group_count), STRESS_RENDER_TIMEOUT_MS))
+        start = time.perf_counter()
+        # Big bots deploy much slower than the normal ones the adaptive deploy timeout learns from
+        builder.deploy(timeout_ms=STRESS_RENDER_TIMEOUT_MS)
+        point["deploy_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        curve.append(point)
+        logger.info(f"Stress point: {point}")
+
+    test_steps = [
+        (clear_groups,
+         "[0] Cleared previous groups.",
+         "[0] FAILED to clear previous groups."),
+    ]
+    built = 0
+    for point_groups in measurement_points(groups, request.config.getoption("--stress-points")):
+        step = len(test_steps)
+        test_steps += [
+            (lambda first=built + 1, last=point_groups: build(first, last),
+             f"[{step}] Built {stress_group_name(built + 1)}-{stress_group_name(point_groups)}.",
+             f"[{step}] FAILED to build {stress_group_name(built + 1)}-{stress_group_name(point_groups)}."),
+            (lambda group_count=point_groups: measure(group_count),
+             f"[{step + 1}] Measured the bot at {point_groups} groups.",
+             f"[{step + 1}] FAILED to measure the bot at {point_groups} groups."),
+        ]
+        built = point_groups
+
+    try:
+        step_runner.run(test_steps)
+    finally:
+        if curve:
+            logger.info(f"Stress curve saved to {write_curve(api_version, stress_scale, curve)}.")
+    logger.info("--- Test Stress scenario completed ---")
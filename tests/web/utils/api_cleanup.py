@@ -0,0 +1,94 @@
+import logging
+from playwright.sync_api import Page
+from config import CLEANUP_API_CONCURRENCY
+from tests.web.test_data import CLEANUP_API_ENDPOINTS, GROUPS_TO_KEEP
+from tests.web.utils.api_helpers import ApiUnavailableError, api_url, bot_id_from_url, get_json
+
+logger = logging.getLogger(__name__)
+
+# Runs inside the page, so the deletes share the browser's cookies and run concurrently
+# (the sync Playwright API itself can only issue one request at a time).
+_DELETE_IN_BATCHES_JS = """
+async ({ urls, limit }) => {
+    const statuses = new Array(urls.length).fill(0);
+    let next = 0;
+    async function worker() {
+        while (next < urls.length) {
+            const index = next++;
+            try {
+                const response = await fetch(urls[index], {
+                    method: "DELETE",
+                    credentials: "same-origin",
+                    headers: { "X-Requested-With": "XMLHttpRequest" },
+                });
+                statuses[index] = response.status;
+            } catch (e) {
+                statuses[index] = 0;
+            }
+        }
+    }
+    await Promise.all(Array.from({ length: Math.min(limit, urls.length) }, worker));
+    return statuses;
+}
+"""
+
+def _as_records(payload) -> list:
+    """Normalizes a list response ([...], {"results": [...]} or {"data": [...]}) into a list of dicts."""
+    if isinstance(payload, dict):
+        payload = payload.get("results", payload.get("data"))
+    if not isinstance(payload, list):
+        raise ApiUnavailableError("Unexpected list response shape")
+    return [record for record in payload if isinstance(record, dict) and "id" in record]
+
+class ApiCleanupEngine:
+    """
+    Deletes previous created groups, coupons and segments through the backend API.
+
+    Uses the page's authenticated session: lists through `page.request` and deletes in
+    concurrent batches (at most `concurrency` requests in flight) from inside the page.
+    """
+    def __init__(self, page: Page, concurrency: int = CLEANUP_API_CONCURRENCY):
+        self.page = page
+        self.concurrency = concurrency
+        self.bot_id = bot_id_from_url(page.url)
+        if self.bot_id is None:
+            raise ApiUnavailableError(f"Could not resolve the bot id from {page.url}")
+
+    def _path(self, kind: str, action: str, **params) -> str:
+        return CLEANUP_API_ENDPOINTS[kind][action].format(bot_id=self.bot_id, **params)
+
+    def _targets(self, kind: str) -> list:
+        """Lists the records of a kind that should be deleted."""
+        records = _as_records(get_json(self.page, self._path(kind, "list")))
+        if kind == "groups":
+            records = [
+                record for record in records
+                if record.get("name") not in GROUPS_TO_KEEP and record.get("deletable", True)
+            ]
+        return records
+
+    def delete_batch(self, kind: str, ids: list) -> int:
+        """Deletes the given ids concurrently. Returns the number of deleted records."""
+        if not ids:
+            return 0
+        urls = [api_url(self.page, self._path(kind, "delete", id=record_id)) for record_id in ids]
+        statuses = self.page.evaluate(_DELETE_IN_BATCHES_JS, {"urls": urls, "limit": self.concurrency})
+        failed = [record_id for record_id, status in zip(ids, statuses) if not 200 <= status < 300]
+        if len(failed) == len(ids):
+            raise ApiUnavailableError(f"Every DELETE of {kind} was rejected (statuses: {sorted(set(statuses))})")
+        if failed:
+            raise AssertionError(f"Failed to delete {len(failed)} {kind} through the API: {failed}")
+        return len(ids)
+
+    def clear(self, kind: str) -> int:
+        """
+        Deletes every unwanted record of a kind ('groups', 'coupons' or 'segments') and verifies
+        with one more list call that none is left. Returns the number of deleted records.
+        """
+        targets = self._targets(kind)
+        deleted = self.delete_batch(kind, [record["id"] for record in targets])
+        remaining = self._targets(kind)
+        if remaining:
+            raise AssertionError(f"{len(remaining)} {kind} are still present after the API cleanup.")
+        logger.info(f"API cleanup: deleted {deleted} {kind} of bot {self.bot_id}.")
+        return deleted
@@ -0,0 +1,56 @@
+import re
+from typing import Optional
+from urllib.parse import urljoin
+from playwright.sync_api import Page
+from tests.web.test_data import BOT_ID_URL_PATTERN
+
+class ApiUnavailableError(Exception):
+    """Raised when the backend API cannot be used, so the caller should fall back to the UI."""
+
+def bot_id_from_url(url: str) -> Optional[str]:
+    """Extracts the bot id from an admin app URL, or returns None if the URL does not contain one."""
+    match = re.search(BOT_ID_URL_PATTERN, url)
+    return match.group(1) if match else None
+
+def api_url(page: Page, path: str) -> str:
+    """
+    Turns an API path (e.g. '/api/bot/action') into an absolute URL on the host the page is on
+    (staging, or the local mock server with --target=mock).
+    """
+    return urljoin(page.url, path)
+
+def get_json(page: Page, path: str):
+    """
+    GETs an API path with the page's authenticated request context and returns the decoded JSON.
+
+    Raises:
+        ApiUnavailableError: If the request fails, is rejected or does not return JSON.
+    """
+    try:
+        response = page.request.get(api_url(page, path))
+    except Exception as e:
+        raise ApiUnavailableError(f"GET {path} failed: {e}") from e
+    if not response.ok:
+        raise ApiUnavailableError(f"GET {path} returned status {response.status}")
+    try:
+        return response.json()
+    except Exception as e:
+        raise ApiUnavailableError(f"GET {path} did not return JSON") from e
+
+def post_json(page: Page, path: str, payload: dict):
+    """
+    POSTs a JSON payload to an API path with the page's authenticated request context and returns the decoded JSON.
+
+    Raises:
+        ApiUnavailableError: If the request fails, is rejected or does not return JSON.
+    """
+    try:
+        response = page.request.post(api_url(page, path), data=payload)
+    except Exception as e:
+        raise ApiUnavailableError(f"POST {path} failed: {e}") from e
+    if not response.ok:
+        raise ApiUnavailableError(f"POST {path} returned status {response.status}")
+    try:
+        return response.json()
+    except Exception as e:
+        raise ApiUnavailableError(f"POST {path} did not return JSON") from e
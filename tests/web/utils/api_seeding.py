@@ -0,0 +1,53 @@
+import logging
+from playwright.sync_api import Page
+from tests.web.test_data import (
+    BOT_ACTION_PATH, CLEANUP_API_ENDPOINTS, SEED_ACTION_PAYLOADS, PREREQUISITE_GROUPS, SEED_RESPONSE_ID_KEY
+    )
+from tests.web.utils.api_helpers import ApiUnavailableError, api_url, bot_id_from_url, post_json
+
+logger = logging.getLogger(__name__)
+
+def _fill(template: dict, **params) -> dict:
+    """Fills the {placeholders} of a payload template."""
+    return {key: value.format(**params) if isinstance(value, str) else value for key, value in template.items()}
+
+class ApiSeeder:
+    """
+    Creates prerequisite groups and their items (PREREQUISITE_GROUPS) through the same API the chatflow editor calls.
+
+    Tests that only reference these groups (e.g. as reaction destinations) use it instead of
+    building them through the UI. The page must be on the bot's chatflow, and has to be reloaded
+    afterwards to show the seeded groups.
+    """
+    def __init__(self, page: Page):
+        self.page = page
+        self.bot_id = bot_id_from_url(page.url)
+        if self.bot_id is None:
+            raise ApiUnavailableError(f"Could not resolve the bot id from {page.url}")
+
+    def _create(self, kind: str, **params) -> str:
+        """Posts one action and returns the id of the created record."""
+        result = post_json(self.page, BOT_ACTION_PATH, _fill(SEED_ACTION_PAYLOADS[kind], bot_id=self.bot_id, **params))
+        record_id = result.get(SEED_RESPONSE_ID_KEY) if isinstance(result, dict) else None
+        if record_id is None:
+            raise ApiUnavailableError(f"Creating a {kind} did not return its {SEED_RESPONSE_ID_KEY!r}")
+        return str(record_id)
+
+    def _delete_group(self, group_id: str):
+        """Best-effort removal of a half-seeded group, so the UI fallback can build it from scratch."""
+        path = CLEANUP_API_ENDPOINTS["groups"]["delete"].format(bot_id=self.bot_id, id=group_id)
+        try:
+            self.page.request.delete(api_url(self.page, path))
+        except Exception as e:
+            logger.warning(f"API seeding: could not remove the half-seeded group {group_id}. ({e})")
+
+    def seed_group(self, group_name: str):
+        """Creates a group and its items. Raises ApiUnavailableError (after removing the group) if any call fails."""
+        group_id = self._create("group", name=group_name)
+        try:
+            for item in PREREQUISITE_GROUPS[group_name]:
+                self._create(item["rt"], group_id=group_id, **item)
+        except ApiUnavailableError:
+            self._delete_group(group_id)
+            raise
+        logger.info(f"API seeding: created {group_name} ({len(PREREQUISITE_GROUPS[group_name])} items) in bot {self.bot_id}.")
@@ -0,0 +1,27 @@
+import hashlib
+import os
+from pathlib import Path
+from playwright.sync_api import BrowserContext
+
+def storage_state_path(state_dir: Path, email: str, url: str) -> Path:
+    """
+    Returns the on-disk location of the cached storage state for an account.
+
+    The file name is derived from the login email and the admin URL, so switching
+    either of them (e.g. another account or environment) never reuses a stale session.
+    """
+    key = hashlib.sha256(f"{email}|{url}".encode("utf-8")).hexdigest()[:16]
+    return Path(state_dir) / f"storage_state_{key}.json"
+
+def save_storage_state(context: BrowserContext, path: Path):
+    """
+    Persists the cookies/localStorage of a logged-in context to disk.
+
+    The state is written to a temporary file first and then moved into place,
+    so a concurrent reader never sees a half-written file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    context.storage_state(path=str(tmp_path))
+    os.replace(tmp_path, path)
@@ -0,0 +1,220 @@
+"""
+Declarative chatflow definitions (YAML/JSON files in tests/web/chatflows/) and their compiled plans.
+
+A definition lists the groups of a chatflow with the items of each group, in the item format of
+ChatflowBuilder (rt, name, msg, title, reactions, condition) plus:
+    upload:    IMAGES key of the file uploaded to an image/video item
+    thumbnail: IMAGES key of the thumbnail uploaded to a video item
+    repeat:    N copies of the item; "{n}" in its strings becomes 1..N
+
+    name: load_text_200
+    deploy: true
+    groups:
+      - group: LoadGroup1
+        items:
+          - {rt: text, name: "Load{n}", repeat: 200}
+          - {rt: image, name: LoadImage, upload: image1}
+
+The compiler turns a definition into a plan: a list of stages (one StepRunner step each) made of
+ChatflowBuilder operations. Compared to a plain item-by-item build, the plan
+  - merges the "item listed" waits of consecutive items without follow-up edits into one wait, and
+  - moves the uploads of a group behind its last item, so they run as one concurrent batch.
+imagemap items are created empty; their areas are not part of the definition format.
+
+Usage (prints the plan and its dry-run action/wait counts, without a browser):
+    python -m tests.web.utils.chatflow_compiler load_text_200
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Callable
+from tests.web.test_data import IMAGES
+
+DEFINITIONS_DIR = Path(__file__).resolve().parent.parent / "chatflows"
+ITEM_TYPES = ("text", "card", "image", "video", "imagecard", "imagemap", "logical")
+REACTION_TYPES = ("button", "choice_button")
+# Edits made right after an item is created; they need the item to be listed first
+FOLLOW_UP_KEYS = ("msg", "title", "reactions", "condition")
+BUILDER_KEYS = ("rt", "name") + FOLLOW_UP_KEYS
+
+# --- Loading ---
+def definition_path(name_or_path: str) -> Path:
+    """A definition file, given as a path or as a name in DEFINITIONS_DIR (e.g. 'load_text_200')."""
+    path = Path(name_or_path)
+    if path.is_file():
+        return path
+    for suffix in (".yaml", ".yml", ".json"):
+        candidate = DEFINITIONS_DIR / f"{name_or_path}{suffix}"
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"Chatflow definition '{name_or_path}' not found (looked in {DEFINITIONS_DIR}).")
+
+def available_definitions() -> list:
+    """Names of the definitions shipped in DEFINITIONS_DIR."""
+    return sorted(path.stem for suffix in ("*.yaml", "*.yml", "*.json") for path in DEFINITIONS_DIR.glob(suffix))
+
+def load_definition(name_or_path: str) -> dict:
+    """Loads and validates a definition; YAML needs PyYAML, JSON does not."""
+    path = definition_path(name_or_path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix == ".json":
+        definition = json.loads(text)
+    else:
+        import yaml
+        definition = yaml.safe_load(text)
+    definition.setdefault("name", path.stem)
+    validate(definition)
+    return definition
+
+# --- Validation ---
+def _substitute(value, n: int):
+    """Replaces "{n}" in the strings of an item (nested dicts/lists included)."""
+    if isinstance(value, str):
+        return value.replace("{n}", str(n))
+    if isinstance(value, list):
+        return [_substitute(element, n) for element in value]
+    if isinstance(value, dict):
+        return {key: _substitute(element, n) for key, element in value.items()}
+    return value
+
+def expand_items(items: list) -> list:
+    """Expands `repeat` items into their copies."""
+    expanded = []
+    for item in items:
+        repeat = item.get("repeat")
+        if repeat is None:
+            expanded.append(item)
+            continue
+        template = {key: value for key, value in item.items() if key != "repeat"}
+        expanded.extend(_substitute(template, n) for n in range(1, int(repeat) + 1))
+    return expanded
+
+def validate(definition: dict):
+    """Raises ValueError describing the first problem of the definition."""
+    name = definition.get("name", "?")
+    groups = definition.get("groups")
+    if not groups:
+        raise ValueError(f"Chatflow '{name}': 'groups' is empty.")
+    seen_groups = set()
+    for group in groups:
+        group_name = group.get("group")
+        if not group_name or group_name in seen_groups:
+            raise ValueError(f"Chatflow '{name}': missing or duplicate group name '{group_name}'.")
+        seen_groups.add(group_name)
+        seen_items = set()
+        for item in expand_items(group.get("items", [])):
+            where = f"Chatflow '{name}', group '{group_name}', item '{item.get('name')}'"
+            if not item.get("name") or item["name"] in seen_items:
+                raise ValueError(f"{where}: missing or duplicate item name.")
+            seen_items.add(item["name"])
+            if item.get("rt") not in ITEM_TYPES:
+                raise ValueError(f"{where}: rt must be one of {ITEM_TYPES}.")
+            unknown = set(item) - set(BUILDER_KEYS) - {"upload", "thumbnail"}
+            if unknown:
+                raise ValueError(f"{where}: unknown keys {sorted(unknown)}.")
+            for reaction in item.get("reactions", ()):
+                if reaction.get("type") not in REACTION_TYPES or not reaction.get("name"):
+                    raise ValueError(f"{where}: reactions need a name and a type in {REACTION_TYPES}.")
+            if "condition" in item and (item["rt"] != "logical" or "value" not in item["condition"]):
+                raise ValueError(f"{where}: a condition (with a value) is only allowed on logical items.")
+            if "upload" in item and item["rt"] not in ("image", "video"):
+                raise ValueError(f"{where}: upload is only allowed on image/video items.")
+            if "thumbnail" in item and item["rt"] != "video":
+                raise ValueError(f"{where}: thumbnail is only allowed on video items.")
+            for key in ("upload", "thumbnail"):
+                if key in item and item[key] not in IMAGES:
+                    raise ValueError(f"{where}: {key} '{item[key]}' is not an IMAGES key of test_data.py.")
+
+# --- Compilation ---
+def _uploads(item: dict, index: int) -> list:
+    """Uploads of one item; paths are IMAGES keys until the plan runs."""
+    uploads = []
+    if "upload" in item:
+        uploads.append({"item": item["name"], "index": index, "kind": item["rt"], "media": item["upload"]})
+    if "thumbnail" in item:
+        uploads.append({"item": item["name"], "index": index, "kind": "thumbnail", "media": item["thumbnail"]})
+    return uploads
+
+def compile_definition(definition: dict, optimize: bool = True) -> list:
+    """
+    Compiles a validated definition into stages: [{"title": ..., "ops": [(op, kwargs), ...]}, ...].
+    `op` is the ChatflowBuilder method to call. With `optimize=False` every item is verified and
+    every upload waited for on its own, which is what a hand-written page object does.
+    """
+    stages = []
+    for group in definition["groups"]:
+        group_name = group["group"]
+        ops = [("select_group" if group.get("existing") else "create_group", {"name": group_name})]
+        unverified, uploads = [], []
+        items = expand_items(group.get("items", []))
+        for index, item in enumerate(items):
+            builder_item = {key: value for key, value in item.items() if key in BUILDER_KEYS}
+            has_follow_ups = any(key in item for key in FOLLOW_UP_KEYS)
+            verify = not optimize or has_follow_ups
+            if verify and unverified:
+                # The next item is edited right away: first confirm the run of items before it
+                ops.append(("verify_items", {"names": unverified}))
+                unverified = []
+            ops.append(("add_item", {"item": builder_item, "index": index, "verify": verify}))
+            if not verify:
+                unverified.append(item["name"])
+            if optimize:
+                uploads.extend(_uploads(item, index))
+            else:
+                ops.extend(("upload_media", {"uploads": [upload]}) for upload in _uploads(item, index))
+        if unverified:
+            ops.append(("verify_items", {"names": unverified}))
+        stages.append({"title": f"Built {group_name} ({len(items)} items)", "ops": ops})
+        if uploads:
+            stages.append({
+                "title": f"Uploaded {len(uploads)} files to {group_name}",
+                "ops": [("upload_media", {"uploads": uploads})],
+            })
+    if definition.get("deploy"):
+        stages.append({"title": "Deployed the chatflow", "ops": [("deploy", {})]})
+    return stages
+
+# --- Execution ---
+def run_ops(ops: list, builder, media_path: Callable[[str], str] = None):
+    """Runs the operations of one stage on a ChatflowBuilder; `media_path` maps IMAGES keys to files."""
+    for op, kwargs in ops:
+        if op == "upload_media":
+            kwargs = {"uploads": [dict(upload, path=media_path(upload["media"])) for upload in kwargs["uploads"]]}
+        getattr(builder, op)(**kwargs)
+
+def plan_steps(stages: list, builder, media_path: Callable[[str], str]) -> list:
+    """The stages as StepRunner `(step_func, success_msg, failure_msg)` steps."""
+    return [
+        (lambda ops=stage["ops"]: run_ops(ops, builder, media_path),
+         f"[{position}] {stage['title']}.",
+         f"[{position}] FAILED: {stage['title']}.")
+        for position, stage in enumerate(stages, start=1)
+    ]
+
+def dry_run_counts(stages: list) -> tuple:
+    """(actions, waits) the plan issues, counted with a dry-run ChatflowBuilder."""
+    from tests.web.page_objects.chatflow_builder import ChatflowBuilder
+    builder = ChatflowBuilder(dry_run=True)
+    for stage in stages:
+        run_ops(stage["ops"], builder, media_path=lambda key: IMAGES[key])
+    return builder.action_count, builder.wait_count
+
+# --- CLI ---
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Compile chatflow definitions and show their plan and dry-run cost.")
+    parser.add_argument("definitions", nargs="*", help=f"Definition names or paths (default: all in {DEFINITIONS_DIR})")
+    args = parser.parse_args(argv)
+    for name in args.definitions or available_definitions():
+        definition = load_definition(name)
+        stages = compile_definition(definition)
+        print(f"{definition['name']}:")
+        for position, stage in enumerate(stages, start=1):
+            print(f"  [{position}] {stage['title']} - {len(stage['ops'])} operations")
+        naive_actions, naive_waits = dry_run_counts(compile_definition(definition, optimize=False))
+        actions, waits = dry_run_counts(stages)
+        print(f"  actions {naive_actions} -> {actions}, waits {naive_waits} -> {waits}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
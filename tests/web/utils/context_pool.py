@@ -0,0 +1,101 @@
+import logging
+import time
+from collections import defaultdict
+from typing import Callable
+from playwright.sync_api import Page
+
+logger = logging.getLogger(__name__)
+
+class ContextPool:
+    """
+    Keeps warm browser contexts, already logged in and parked on a bot's chatflow screen, between tests.
+
+    `open_page(key)` creates a new context and returns its page ready for a test (e.g. logged in
+    and on the chatflow of the bot `key`). `reset(page)` brings a returned page back to that state.
+    `warm(key)` opens `size` contexts for a key up front (a worker runs one test at a time, so one is
+    enough); a context is closed instead of reused after `max_uses` tests, when its test failed, or when
+    the reset fails, and the next `acquire` opens its replacement.
+    """
+    def __init__(self, open_page: Callable[[str], Page], reset: Callable[[Page], None], size: int, max_uses: int):
+        self.open_page = open_page
+        self.reset = reset
+        self.size = size
+        self.max_uses = max_uses
+        self._idle = defaultdict(list)
+        self._uses = {}
+        self._keys = {}
+        self.created = 0
+        self.reused = 0
+
+    def _open(self, key: str) -> Page:
+        start = time.perf_counter()
+        page = self.open_page(key)
+        self.created += 1
+        self._uses[page] = 0
+        self._keys[page] = key
+        logger.info(f"Context pool: Opened a new context for '{key}' in {time.perf_counter() - start:.2f}s.")
+        return page
+
+    def warm(self, key: str):
+        """Opens contexts for `key` until `size` of them are idle. A failure only stops the warm-up."""
+        while len(self._idle[key]) < self.size:
+            try:
+                self._idle[key].append(self._open(key))
+            except Exception as e:
+                logger.warning(f"Context pool: Could not warm up a context for '{key}'; opening them on demand. ({e})")
+                return
+
+    def acquire(self, key: str) -> Page:
+        """Hands out an idle page for `key`, or opens a new one."""
+        while self._idle[key]:
+            page = self._idle[key].pop()
+            if not page.is_closed():
+                self.reused += 1
+                self._uses[page] += 1
+                logger.info(f"Context pool: Reusing warm context for '{key}' (use {self._uses[page]}/{self.max_uses}).")
+                return page
+            self._forget(page)
+
+        page = self._open(key)
+        self._uses[page] = 1
+        return page
+
+    def release(self, page: Page, reusable: bool = True):
+        """Returns a page to the pool, resetting it for the next test, or closes it."""
+        key = self._keys[page]
+        if not reusable:
+            logger.info(f"Context pool: Discarding the context for '{key}' after a failed test.")
+        elif self._uses[page] >= self.max_uses:
+            logger.info(f"Context pool: Recycling the context for '{key}' after {self._uses[page]} tests.")
+        elif len(self._idle[key]) >= self.size:
+            logger.info(f"Context pool: Pool for '{key}' is full, closing the context.")
+        else:
+            start = time.perf_counter()
+            try:
+                self.reset(page)
+            except Exception as e:
+                logger.warning(f"Context pool: Could not reset the context for '{key}', closing it. ({e})")
+            else:
+                self._idle[key].append(page)
+                logger.info(f"Context pool: Reset the context for '{key}' in {time.perf_counter() - start:.2f}s.")
+                return
+        self._close(page)
+
+    def _forget(self, page: Page):
+        self._uses.pop(page, None)
+        self._keys.pop(page, None)
+
+    def _close(self, page: Page):
+        self._forget(page)
+        try:
+            page.context.close()
+        except Exception as e:
+            logger.warning(f"Context pool: Could not close a context. ({e})")
+
+    def close(self):
+        """Closes all idle contexts."""
+        for pages in self._idle.values():
+            for page in pages:
+                self._close(page)
+        self._idle.clear()
+        logger.info(f"Context pool: {self.created} contexts opened, {self.reused} tests served from a warm context.")
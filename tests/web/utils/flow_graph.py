@@ -0,0 +1,135 @@
+import pytest
+
+# Declared dependency graph between the chatflow tests.
+#
+# Every test declares the artifacts (groups, items, coupon list, ...) it produces and
+# consumes with `@pytest.mark.flow(produces=(...), consumes=(...))`. Tests are ordered
+# topologically from these declarations, tests that are connected through an artifact
+# share an xdist group (same worker, same bot), and independent branches can run
+# concurrently on different workers. When a producer fails, its consumers are skipped
+# with the root cause instead of running into the same broken state.
+
+def flow_artifacts(item) -> tuple:
+    """Returns the (produces, consumes) artifact sets declared by the item's `flow` marker."""
+    marker = item.get_closest_marker("flow")
+    if marker is None:
+        return frozenset(), frozenset()
+    return frozenset(marker.kwargs.get("produces", ())), frozenset(marker.kwargs.get("consumes", ()))
+
+def flow_scope(item) -> str:
+    """
+    Returns the scope the item's artifacts live in.
+    Artifacts of different API versions live in different bots, so they never satisfy each other.
+    """
+    callspec = getattr(item, "callspec", None)
+    return callspec.params.get("api_version", "") if callspec else ""
+
+def _producers(items: list) -> dict:
+    """Maps every item index to the indexes of the items producing what it consumes."""
+    produced_by = {}
+    for index, item in enumerate(items):
+        produces, _ = flow_artifacts(item)
+        for artifact in produces:
+            produced_by.setdefault((flow_scope(item), artifact), []).append(index)
+
+    producers = {}
+    for index, item in enumerate(items):
+        _, consumes = flow_artifacts(item)
+        producers[index] = {
+            producer
+            for artifact in consumes
+            for producer in produced_by.get((flow_scope(item), artifact), [])
+            if producer != index
+        }
+    return producers
+
+def order_by_dependencies(items: list) -> list:
+    """
+    Sorts the items topologically so producers always run before their consumers.
+
+    The sort is stable: among the tests that are ready to run, the one collected first wins,
+    so tests without declared dependencies keep their file order.
+    Consumers whose producer is not selected in this run keep their position (they build
+    their prerequisites themselves, as before).
+    """
+    producers = _producers(items)
+    remaining = list(range(len(items)))
+    done = set()
+    ordered = []
+    while remaining:
+        ready = next((index for index in remaining if producers[index] <= done), None)
+        if ready is None:
+            names = ", ".join(items[index].name for index in remaining)
+            raise pytest.UsageError(f"Circular flow dependency between: {names}")
+        remaining.remove(ready)
+        done.add(ready)
+        ordered.append(items[ready])
+    return ordered
+
+def flow_branches(items: list) -> dict:
+    """
+    Groups the items into independent branches of the dependency graph.
+    Returns {item: branch_name}; items of one branch must run in order on the same worker.
+    """
+    parent = list(range(len(items)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for consumer, producers in _producers(items).items():
+        for producer in producers:
+            parent[find(consumer)] = find(producer)
+
+    # Name every branch after its first test, e.g. "flow-default-test_chatflow_kaiwa"
+    first_of_branch = {}
+    for index in range(len(items)):
+        first_of_branch.setdefault(find(index), index)
+    return {
+        item: f"flow-{flow_scope(item) or 'default'}-{items[first_of_branch[find(index)]].originalname}"
+        for index, item in enumerate(items)
+    }
+
+class ArtifactRegistry:
+    """
+    Remembers which artifacts were already produced in this run (per process, per scope),
+    and which ones failed, with the root cause, so their consumers are skipped instead of timing out.
+    """
+    def __init__(self):
+        self._produced = {}
+        # scope -> {artifact: root cause}
+        self._failed = {}
+        # scope -> root cause of a failure every test of the scope depends on (cleanup, login)
+        self._blocked = {}
+
+    def record(self, scope: str, artifacts: frozenset):
+        """Records the artifacts produced by a passed test."""
+        self._produced.setdefault(scope, set()).update(artifacts)
+        failed = self._failed.get(scope, {})
+        for artifact in artifacts:
+            failed.pop(artifact, None)
+
+    def produced(self, scope: str) -> frozenset:
+        """Returns the artifacts produced so far in the given scope."""
+        return frozenset(self._produced.get(scope, ()))
+
+    def record_failure(self, scope: str, artifacts: frozenset, cause: str):
+        """Records the artifacts of a failed (or skipped) producer; the first root cause is kept."""
+        failed = self._failed.setdefault(scope, {})
+        for artifact in artifacts:
+            failed.setdefault(artifact, cause)
+
+    def block(self, scope: str, cause: str):
+        """Records a failure every later test of the scope depends on."""
+        self._blocked.setdefault(scope, cause)
+
+    def failure_cause(self, scope: str, consumes: frozenset) -> str:
+        """Returns the root cause why a test consuming these artifacts cannot succeed, or None."""
+        if scope in self._blocked:
+            return self._blocked[scope]
+        failed = self._failed.get(scope, {})
+        return next((failed[artifact] for artifact in sorted(consumes) if artifact in failed), None)
+
+artifact_registry = ArtifactRegistry()
@@ -0,0 +1,136 @@
+"""
+Per-request latency breakdown of recorded HAR files.
+
+Extracts the DNS / connect / TTFB / download timings of the deploy call (app.json),
+the /api/bot/action uploads and API previews and the recipes API, and summarises them
+per API version, so slow deploys can be attributed to the server (TTFB) or to the
+network/harness (everything else).
+
+Usage:
+    python -m tests.web.utils.har_analyzer report/har
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+from fnmatch import fnmatch
+from pathlib import Path
+from urllib.parse import urlsplit
+from tests.web.test_data import APP_JSON_DEPLOY_API, BOT_ACTION_API
+
+HAR_DIR = Path("report") / "har"
+TIMING_PHASES = ("dns", "connect", "ssl", "send", "wait", "receive")
+# "@<group>" suffix of the node ids under pytest-xdist's --dist loadgroup
+_XDIST_GROUP = re.compile(r"@[^@\[\]]*$")
+
+def har_path(nodeid: str, api_version: str, har_dir: Path = HAR_DIR) -> Path:
+    """HAR file of one test, e.g. report/har/api2.0/test_chatflow_kaiwa.har (same name in parallel runs)."""
+    test_name = re.sub(r"[^\w.-]+", "_", _XDIST_GROUP.sub("", nodeid).split("::")[-1])
+    return Path(har_dir) / f"api{api_version}" / f"{test_name}.har"
+
+def _matches(url: str, url_glob: str) -> bool:
+    """Playwright-style '**/x' glob match on the URL without its query string."""
+    parts = urlsplit(url)
+    return fnmatch(f"{parts.scheme}://{parts.netloc}{parts.path}", url_glob.replace("**", "*"))
+
+def classify(entry: dict) -> str:
+    """Returns the category of a HAR entry, or None if it is not one of the analysed calls."""
+    request = entry["request"]
+    url = request["url"]
+    if _matches(url, APP_JSON_DEPLOY_API):
+        return "deploy (app.json)"
+    if _matches(url, BOT_ACTION_API):
+        mime_type = request.get("postData", {}).get("mimeType", "")
+        return "upload (api/bot/action)" if mime_type.startswith("multipart/") else "bot action / API preview"
+    if "/api/service/recipes/" in url:
+        return "recipes API"
+    return None
+
+def _phase_ms(timings: dict, phase: str) -> float:
+    """HAR uses -1 for phases that did not happen (e.g. DNS on a reused connection)."""
+    value = timings.get(phase, -1)
+    return value if value is not None and value >= 0 else 0.0
+
+def _stats(values: list) -> dict:
+    ordered = sorted(values)
+    return {
+        "mean": round(statistics.fmean(ordered), 1),
+        "p50": round(ordered[len(ordered) // 2], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+def analyze_entries(entries: list) -> dict:
+    """Summarises the timings of the analysed calls per category."""
+    samples = {}
+    for entry in entries:
+        category = classify(entry)
+        if category is None:
+            continue
+        timings = entry.get("timings", {})
+        sample = {phase: _phase_ms(timings, phase) for phase in TIMING_PHASES}
+        # HAR 1.2: "connect" already includes the TLS handshake ("ssl"), so it is not added again
+        sample["total"] = entry.get("time") or sum(sample.values()) - sample["ssl"]
+        samples.setdefault(category, []).append(sample)
+
+    summary = {}
+    for category, category_samples in samples.items():
+        totals = [sample["total"] for sample in category_samples]
+        ttfb = [sample["wait"] for sample in category_samples]
+        summary[category] = {
+            "count": len(category_samples),
+            "dns_ms": _stats([sample["dns"] for sample in category_samples]),
+            "connect_ms": _stats([sample["connect"] for sample in category_samples]),
+            "ttfb_ms": _stats(ttfb),
+            "download_ms": _stats([sample["receive"] for sample in category_samples]),
+            "total_ms": _stats(totals),
+            # Share of the total time spent waiting for the server to answer
+            "server_share": round(sum(ttfb) / sum(totals), 2) if sum(totals) else None,
+        }
+    return summary
+
+def analyze_har_dir(har_dir: Path = HAR_DIR) -> dict:
+    """Returns {api_version: summary} for every api<version>/ folder of HAR files."""
+    summaries = {}
+    for version_dir in sorted(Path(har_dir).glob("api*")):
+        entries = []
+        for har_file in sorted(version_dir.glob("*.har")):
+            try:
+                entries.extend(json.loads(har_file.read_text(encoding="utf-8"))["log"]["entries"])
+            except (ValueError, KeyError):
+                continue
+        summaries[version_dir.name[len("api"):]] = analyze_entries(entries)
+    return summaries
+
+def write_summaries(har_dir: Path = HAR_DIR) -> dict:
+    """Writes report/har_summary_api<version>.json next to the HAR folder and returns the summaries."""
+    summaries = analyze_har_dir(har_dir)
+    for api_version, summary in summaries.items():
+        summary_path = Path(har_dir).parent / f"har_summary_api{api_version}.json"
+        summary_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    return summaries
+
+def format_summary(api_version: str, summary: dict) -> str:
+    lines = [f"API {api_version}: {'Call':<26} {'n':>3} {'DNS':>7} {'Connect':>8} {'TTFB':>8} {'Download':>9} {'Total':>8} {'Server':>7}"]
+    for category, stats in sorted(summary.items()):
+        server_share = "-" if stats["server_share"] is None else f"{stats['server_share']:.0%}"
+        lines.append(
+            f"{'':<{len(api_version) + 5}}{category:<26} {stats['count']:>3} {stats['dns_ms']['mean']:>6.0f}ms "
+            f"{stats['connect_ms']['mean']:>6.0f}ms {stats['ttfb_ms']['mean']:>6.0f}ms {stats['download_ms']['mean']:>7.0f}ms "
+            f"{stats['total_ms']['mean']:>6.0f}ms {server_share:>7}"
+        )
+    return "\n".join(lines)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Latency breakdown of the deploy, upload and API preview calls in HAR files.")
+    parser.add_argument("har_dir", nargs="?", default=str(HAR_DIR), help="Folder with one api<version>/ sub folder per API version")
+    args = parser.parse_args(argv)
+    summaries = write_summaries(Path(args.har_dir))
+    if not summaries:
+        print(f"No HAR files found in {args.har_dir}.")
+    for api_version, summary in summaries.items():
+        print(format_summary(api_version, summary))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
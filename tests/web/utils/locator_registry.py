@@ -0,0 +1,168 @@
+"""
+Lazily resolved page object locators (see tests/web/page_objects/locators.py) and their per-page registry.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+from playwright.sync_api import Page, Locator
+
+class LazyLocator:
+    """
+    Class attribute of a page object that describes a locator and resolves it on first use.
+
+    Written like the Playwright call chain it stands for, starting from `on_page`:
+        tutorials_popup = on_page.locator(".popup:has-text('チャットボットの会話方法を選択')")
+        close_popup_button = tutorials_popup.locator(".icon.close")
+    Reading `self.close_popup_button` resolves the chain against `self.page` through `locator_registry`,
+    which keeps one Locator per page and chain, shared by every page object on that page.
+    """
+    def __init__(self, parent: "LazyLocator" = None, step: tuple = None):
+        self.parent = parent
+        # (method or property name, args, kwargs); None for the page itself
+        self.step = step
+        self.key = parent.key + (_step_key(step),) if parent else ()
+
+    # --- Chain building (the Playwright Page/Locator methods the page objects use) ---
+    def _chain(self, method: str, /, *args, **kwargs) -> "LazyLocator":
+        return LazyLocator(self, (method, args, kwargs))
+
+    def locator(self, selector: str, **kwargs) -> "LazyLocator":
+        return self._chain("locator", selector, **kwargs)
+
+    def get_by_role(self, role: str, **kwargs) -> "LazyLocator":
+        return self._chain("get_by_role", role, **kwargs)
+
+    def get_by_text(self, text: str, **kwargs) -> "LazyLocator":
+        return self._chain("get_by_text", text, **kwargs)
+
+    def get_by_placeholder(self, text: str, **kwargs) -> "LazyLocator":
+        return self._chain("get_by_placeholder", text, **kwargs)
+
+    def nth(self, index: int) -> "LazyLocator":
+        return self._chain("nth", index)
+
+    def filter(self, **kwargs) -> "LazyLocator":
+        return self._chain("filter", **kwargs)
+
+    @property
+    def first(self) -> "LazyLocator":
+        return self._chain("first")
+
+    @property
+    def last(self) -> "LazyLocator":
+        return self._chain("last")
+
+    # --- Resolution ---
+    def build(self, page: Page):
+        """Creates the Playwright object of this chain (the parent comes from the registry)."""
+        if self.parent is None:
+            return page
+        target = locator_registry.resolve(page, self.parent)
+        name, args, kwargs = self.step
+        if name in ("first", "last"):
+            return getattr(target, name)
+        args = [locator_registry.resolve(page, arg) if isinstance(arg, LazyLocator) else arg for arg in args]
+        kwargs = {key: locator_registry.resolve(page, value) if isinstance(value, LazyLocator) else value
+                  for key, value in kwargs.items()}
+        return getattr(target, name)(*args, **kwargs)
+
+    def __set_name__(self, owner, name):
+        locator_registry.define(owner, name, self)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return locator_registry.resolve(instance.page, self, owner)
+
+    def __repr__(self):
+        return "on_page" + "".join(
+            f".{name}" if name in ("first", "last")
+            else f".{name}({', '.join([*map(repr, args), *(f'{key}={value!r}' for key, value in kwargs.items())])})"
+            for name, args, kwargs in self._steps()
+        )
+
+    def _steps(self) -> list:
+        return (self.parent._steps() + [self.step]) if self.parent else []
+
+def _step_key(step: tuple) -> tuple:
+    name, args, kwargs = step
+    to_key = lambda value: value.key if isinstance(value, LazyLocator) else value
+    return (name, tuple(map(to_key, args)), tuple(sorted((key, to_key(value)) for key, value in kwargs.items())))
+
+# Page attribute holding that page's memoized locators. Stored on the page itself rather than in a
+# registry-wide WeakKeyDictionary: every Locator references its Page, so such an entry never expires
+_PAGE_CACHE_ATTR = "_lazy_locators"
+
+class LocatorRegistry:
+    """
+    Memoizes the locators of the LazyLocator attributes per page and call chain (a chain declared by
+    several page objects is built once per page), and optionally profiles which attributes are used.
+    The locators of a page are kept on the page, so they are released with it.
+    """
+    def __init__(self):
+        # (class name, chain) -> attribute names; a chain can have several names in one class
+        self.definitions = {}
+        # (owner class, id(descriptor)) -> (class name, chain), for the usage profile
+        self._definition_keys = {}
+        self.profiling = False
+        self.uses = Counter()
+        self.built = 0
+        self.reused = 0
+
+    def define(self, owner, name: str, descriptor: LazyLocator):
+        # Keyed by class name, so both imports of a page object module share their entries
+        key = (owner.__name__, repr(descriptor))
+        names = self.definitions.setdefault(key, [])
+        if name not in names:
+            names.append(name)
+        self._definition_keys[(owner, id(descriptor))] = key
+
+    def resolve(self, page: Page, descriptor: LazyLocator, owner=None) -> Locator:
+        if self.profiling and owner is not None:
+            self.uses[self._definition_keys.get((owner, id(descriptor)), (owner.__name__, repr(descriptor)))] += 1
+        if descriptor.parent is None:
+            return page
+        locators = getattr(page, _PAGE_CACHE_ATTR, None)
+        if locators is None:
+            locators = {}
+            setattr(page, _PAGE_CACHE_ATTR, locators)
+        locator = locators.get(descriptor.key)
+        if locator is None:
+            locator = locators[descriptor.key] = descriptor.build(page)
+            self.built += 1
+        else:
+            self.reused += 1
+        return locator
+
+    def usage_report(self) -> dict:
+        """Per page object: used attributes (with their number of reads) and unused ones."""
+        report = {}
+        for key, names in self.definitions.items():
+            entry = report.setdefault(key[0], {"used": {}, "unused": []})
+            name = " / ".join(names)
+            count = self.uses.get(key, 0)
+            if count:
+                entry["used"][name] = count
+            else:
+                entry["unused"].append(name)
+        return report
+
+    def write_usage(self, path: Path) -> dict:
+        """Writes the usage report (plus build/reuse counts and the distinct selector chains) as JSON."""
+        report = self.usage_report()
+        summary = {
+            "definitions": len(self.definitions),
+            "distinct_chains": len({chain for _, chain in self.definitions}),
+            "used": sum(len(entry["used"]) for entry in report.values()),
+            "built": self.built,
+            "reused": self.reused,
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps({"summary": summary, "page_objects": report}, ensure_ascii=False, indent=2), encoding="utf-8")
+        return summary
+
+# One registry per process: the page objects are imported both as `page_objects` (test modules)
+# and as `tests.web.page_objects` (conftest, utils), and both copies resolve through it
+locator_registry = LocatorRegistry()
+# Start of every locator chain: the page object's page
+on_page = LazyLocator()
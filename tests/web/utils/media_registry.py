@@ -0,0 +1,121 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+class MediaRegistry:
+    """
+    Remembers where the server stored each test media file, so the same content is not uploaded again.
+
+    Files are identified by the sha256 of their content (hashed once per session). After the first
+    successful file upload to /api/bot/action, the asset URL the response returns for it (see `_find_url`)
+    is stored per admin origin; items whose UI accepts a URL instead of a file (the video items) then get that URL.
+    Entries are kept in `path` across runs and expire after `ttl_s` seconds.
+    """
+    def __init__(self, path: Path, ttl_s: int, url_keys: tuple):
+        self.path = Path(path)
+        self.ttl_s = ttl_s
+        self.url_keys = url_keys
+        self.entries = self._load()
+        # (path, size, mtime) -> sha256, so every file is hashed once per session
+        self._digests = {}
+        # URLs confirmed to still exist in this session, and keys of the URLs found to be gone
+        self.validated = set()
+        self._forgotten = set()
+        self.uploads = 0
+        self.bytes_uploaded = 0
+        self.reuses = 0
+        self.bytes_saved = 0
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def digest(self, file_path: str) -> str:
+        """sha256 of the file's content."""
+        stat = os.stat(file_path)
+        cache_key = (str(file_path), stat.st_size, stat.st_mtime)
+        if cache_key not in self._digests:
+            self._digests[cache_key] = hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+        return self._digests[cache_key]
+
+    def _key(self, origin: str, file_path: str) -> str:
+        return f"{origin}|{self.digest(file_path)}"
+
+    # --- Lookup ---
+    def url_for(self, origin: str, file_path: str) -> str:
+        """The known, not expired asset URL of the file's content on `origin`, else None."""
+        entry = self.entries.get(self._key(origin, file_path))
+        if entry is None or time.time() - entry["stored_at"] > self.ttl_s:
+            return None
+        return entry["url"]
+
+    def forget(self, origin: str, file_path: str):
+        """Drops an entry whose URL turned out to be gone."""
+        key = self._key(origin, file_path)
+        self.entries.pop(key, None)
+        self._forgotten.add(key)
+
+    # --- Recording ---
+    def _find_url(self, payload) -> str:
+        """
+        The http(s) URL stored directly under one of `url_keys` of the upload response object.
+        Nested values are not searched, because the response may echo other items and their media URLs.
+        Returns None for any other response format, or when several different URLs qualify.
+        """
+        if not isinstance(payload, dict):
+            return None
+        urls = {
+            payload[key] for key in self.url_keys
+            if isinstance(payload.get(key), str) and payload[key].startswith(("http://", "https://"))
+        }
+        return urls.pop() if len(urls) == 1 else None
+
+    def remember_upload(self, origin: str, file_path: str, response) -> str:
+        """Stores the asset URL of a successful file upload; returns it, or None if the response has none."""
+        self.uploads += 1
+        self.bytes_uploaded += os.path.getsize(file_path)
+        try:
+            payload = response.json()
+        except Exception:
+            return None
+        url = self._find_url(payload)
+        if url is None:
+            logger.info(f"Media registry: No asset URL of {Path(file_path).name} in the upload response; not recorded.")
+        else:
+            key = self._key(origin, file_path)
+            self._forgotten.discard(key)
+            self.entries[key] = {
+                "url": url, "file": Path(file_path).name, "stored_at": time.time(),
+            }
+            self.validated.add(url)
+        return url
+
+    def count_reuse(self, file_path: str):
+        self.reuses += 1
+        self.bytes_saved += os.path.getsize(file_path)
+
+    # --- Persistence ---
+    def save(self):
+        """Merges this process' entries into the registry file (keeps parallel workers' entries) and drops expired ones."""
+        merged = {key: entry for key, entry in self._load().items() if key not in self._forgotten}
+        for key, entry in self.entries.items():
+            if key not in merged or merged[key]["stored_at"] < entry["stored_at"]:
+                merged[key] = entry
+        now = time.time()
+        kept = {key: entry for key, entry in merged.items() if now - entry["stored_at"] <= self.ttl_s}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(kept, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.entries = kept
+        logger.info(
+            f"Media registry: {self.uploads} files uploaded ({self.bytes_uploaded / 1024 / 1024:.1f} MB), "
+            f"{self.reuses} reused by URL ({self.bytes_saved / 1024 / 1024:.1f} MB saved), {len(kept)} entries kept."
+        )
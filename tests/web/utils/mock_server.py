@@ -0,0 +1,212 @@
+"""
+Local stand-in for the bonp admin site, replaying responses recorded from staging.
+
+Recordings are HAR files with embedded content (run the suite once with --record-mock).
+Every request is answered with the recorded response of the same method + URL; repeated
+calls of one endpoint replay the recorded responses in order (e.g. the chatflow state
+before and after a deploy). Requests to other hosts (CDN, fonts, ...) are served from the
+recordings through Playwright routing, so a mock run never leaves the machine.
+
+Usage:
+    pytest tests/web --target=mock
+    python -m tests.web.utils.mock_server --port 8765    # serve the recordings standalone
+"""
+import argparse
+import base64
+import json
+import logging
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+from playwright.sync_api import Route
+from config import ADMIN_URL, MOCK_RECORDINGS_DIR
+
+logger = logging.getLogger(__name__)
+
+# Headers that describe the original transfer, not the replayed body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+_TEXT_TYPES = ("text/", "application/json", "application/javascript", "application/x-javascript")
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+class RecordedResponse:
+    """One response of a HAR entry."""
+    def __init__(self, status: int, headers: list, body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @classmethod
+    def from_har(cls, entry: dict) -> "RecordedResponse":
+        response = entry["response"]
+        content = response.get("content", {})
+        text = content.get("text") or ""
+        body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+        headers = [
+            (header["name"], header["value"]) for header in response.get("headers", [])
+            if header["name"].lower() not in _DROPPED_HEADERS
+        ]
+        return cls(response["status"], headers, body)
+
+class Recordings:
+    """Recorded responses indexed by (method, URL), replayed in recorded order."""
+    def __init__(self):
+        self._responses = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, recordings_dir: Path) -> "Recordings":
+        recordings = cls()
+        for har_file in sorted(Path(recordings_dir).rglob("*.har")):
+            try:
+                entries = json.loads(har_file.read_text(encoding="utf-8"))["log"]["entries"]
+            except (ValueError, KeyError):
+                logger.warning(f"Skipping unreadable recording {har_file}")
+                continue
+            for entry in entries:
+                if entry["response"].get("status", 0) <= 0:
+                    continue # aborted/failed requests
+                key = (entry["request"]["method"], entry["request"]["url"])
+                recordings._responses.setdefault(key, []).append(RecordedResponse.from_har(entry))
+        logger.info(f"Loaded {sum(map(len, recordings._responses.values()))} recorded responses from {recordings_dir}")
+        return recordings
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def lookup(self, method: str, url: str) -> RecordedResponse:
+        """
+        Returns the next recorded response for a request, or None.
+        Falls back to the same path without its query string, then to GET of the same path.
+        """
+        path_only = url.split("?", 1)[0]
+        candidates = [(method, url), (method, path_only), ("GET", path_only)]
+        for key in candidates:
+            if key in self._responses:
+                with self._lock:
+                    responses = self._responses[key]
+                    cursor = self._cursors.get(key, 0)
+                    # Replay in order, then keep answering with the last recorded response
+                    self._cursors[key] = min(cursor + 1, len(responses) - 1)
+                    return responses[cursor]
+        return None
+
+class MockAdminServer:
+    """HTTP server answering as the admin host (ADMIN_URL) from the recordings."""
+    def __init__(self, recordings: Recordings, admin_url: str = ADMIN_URL, host: str = "127.0.0.1", port: int = 0):
+        self.recordings = recordings
+        self.recorded_origin = _origin(admin_url)
+        self.admin_path = urlsplit(admin_url).path
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._thread = None
+
+    @property
+    def origin(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def admin_url(self) -> str:
+        """ADMIN_URL as served by the mock, e.g. http://127.0.0.1:54321/member/."""
+        return f"{self.origin}{self.admin_path}"
+
+    def start(self) -> "MockAdminServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-admin-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock admin server listening on {self.admin_url}")
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    # --- Response rewriting ---
+    def _rewrite_headers(self, headers: list) -> list:
+        rewritten = []
+        for name, value in headers:
+            if name.lower() == "set-cookie":
+                # Recorded cookies are bound to the staging domain and HTTPS
+                value = re.sub(r";\s*(Domain=[^;]*|Secure|SameSite=None)", "", value, flags=re.I)
+            elif name.lower() == "location":
+                value = value.replace(self.recorded_origin, self.origin)
+            rewritten.append((name, value))
+        return rewritten
+
+    def _rewrite_body(self, headers: list, body: bytes) -> bytes:
+        content_type = next((value for name, value in headers if name.lower() == "content-type"), "")
+        if not content_type.startswith(_TEXT_TYPES):
+            return body
+        return body.replace(self.recorded_origin.encode(), self.origin.encode())
+
+    def response_for(self, method: str, url: str) -> tuple:
+        """Returns (status, headers, body) for a request to the mock or to any recorded host."""
+        recorded_url = url.replace(self.origin, self.recorded_origin, 1) if url.startswith(self.origin) else url
+        recorded = self.recordings.lookup(method, recorded_url)
+        if recorded is None and url.startswith(self.origin) and urlsplit(url).path.startswith(self.admin_path):
+            # Client-side routes of the admin app all load the same document
+            recorded = self.recordings.lookup("GET", f"{self.recorded_origin}{self.admin_path}")
+        if recorded is None:
+            return 404, [("Content-Type", "text/plain")], f"No recorded response for {method} {recorded_url}".encode()
+        headers = self._rewrite_headers(recorded.headers)
+        return recorded.status, headers, self._rewrite_body(headers, recorded.body)
+
+    def route_handler(self, route: Route):
+        """
+        Playwright route handler for a mock run: requests to the mock go through to it,
+        requests to any other host are fulfilled from the recordings (or aborted).
+        """
+        request = route.request
+        if request.url.startswith(self.origin):
+            route.fallback()
+            return
+        status, headers, body = self.response_for(request.method, request.url)
+        if status == 404:
+            route.abort()
+            return
+        route.fulfill(status=status, headers=dict(headers), body=body)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length) # request bodies are not used for matching
+                status, headers, body = server.response_for(self.command, f"{server.origin}{self.path}")
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = _reply
+
+            def log_message(self, format, *args):
+                logger.debug(f"mock: {format % args}")
+
+        return Handler
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the recorded admin site locally.")
+    parser.add_argument("--recordings", default=str(MOCK_RECORDINGS_DIR))
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    server = MockAdminServer(Recordings.load(Path(args.recordings)), port=args.port).start()
+    print(f"Serving {args.recordings} as {server.admin_url} (Ctrl+C to stop)")
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
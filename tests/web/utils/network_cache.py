@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from urllib.parse import urlsplit
+from playwright.sync_api import Route
+
+logger = logging.getLogger(__name__)
+
+# Static resources that are identical for every test of a run
+CACHEABLE_RESOURCE_TYPES = {"font", "image"}
+# The frontend bundle under test: only cached when its URL changes with its content (a new
+# deploy of the admin app then is a cache miss, never a stale replay)
+FINGERPRINTED_RESOURCE_TYPES = {"script", "stylesheet"}
+# Content hash or version in the file name or query, e.g. app.3f9a1c2b.js or main.css?v=1718000000
+_FINGERPRINT = re.compile(r"[0-9a-f]{8,}", re.IGNORECASE)
+# Headers that describe the original transfer, not the replayed body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+class NetworkCache:
+    """
+    Record-and-replay cache for static assets and whitelisted read-only GET APIs.
+
+    Scripts and stylesheets are only cached when their URL is fingerprinted, and responses marked
+    `Cache-Control: no-store` are never stored. Used as a `context.route("**/*", cache.handle)` handler. Bodies are stored content-addressed
+    (file name = sha256 of the body) under `cache_dir/blobs`, the index maps request URLs to a
+    blob plus status/headers. Entries expire after `ttl_s` seconds, and the least recently used
+    ones are evicted when the cache grows beyond `max_bytes`.
+    """
+    def __init__(self, cache_dir: Path, ttl_s: int, max_bytes: int, api_globs: list):
+        self.cache_dir = Path(cache_dir)
+        self.blob_dir = self.cache_dir / "blobs"
+        self.index_path = self.cache_dir / "index.json"
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        self.api_globs = [url_glob.replace("**", "*") for url_glob in api_globs]
+        self.index = self._load_index()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+
+    def _load_index(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _fingerprinted(url: str) -> bool:
+        parts = urlsplit(url)
+        file_stem = parts.path.rsplit("/", 1)[-1].rsplit(".", 1)[0]
+        return bool(_FINGERPRINT.search(file_stem) or _FINGERPRINT.search(parts.query))
+
+    def _cacheable(self, request) -> bool:
+        if request.method != "GET":
+            return False
+        if request.resource_type in FINGERPRINTED_RESOURCE_TYPES:
+            return self._fingerprinted(request.url)
+        if request.resource_type in CACHEABLE_RESOURCE_TYPES:
+            return True
+        return any(fnmatch(request.url, url_glob) for url_glob in self.api_globs)
+
+    def _fresh_entry(self, url: str) -> dict:
+        entry = self.index.get(self._key(url))
+        if entry is None or time.time() - entry["stored_at"] > self.ttl_s:
+            return None
+        if not (self.blob_dir / entry["blob"]).is_file():
+            return None
+        return entry
+
+    def handle(self, route: Route):
+        """Route handler: replays cached responses, records cacheable misses, passes everything else on."""
+        request = route.request
+        if not self._cacheable(request):
+            route.fallback()
+            return
+
+        entry = self._fresh_entry(request.url)
+        body = None
+        if entry is not None:
+            try:
+                body = (self.blob_dir / entry["blob"]).read_bytes()
+            except FileNotFoundError:
+                # Evicted by another xdist worker since the check: fetch it again
+                pass
+        if body is not None:
+            entry["last_access"] = time.time()
+            self.hits += 1
+            self.bytes_served += len(body)
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+
+        self.misses += 1
+        response = route.fetch()
+        body = response.body()
+        if response.ok and "no-store" not in response.headers.get("cache-control", "").lower():
+            self._store(request.url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def _store(self, url: str, status: int, headers: dict, body: bytes):
+        blob = hashlib.sha256(body).hexdigest()
+        blob_path = self.blob_dir / blob
+        if not blob_path.is_file():
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            blob_path.write_bytes(body)
+        now = time.time()
+        self.index[self._key(url)] = {
+            "url": url,
+            "blob": blob,
+            "size": len(body),
+            "status": status,
+            "headers": {name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS},
+            "stored_at": now,
+            "last_access": now,
+        }
+
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def save(self):
+        """
+        Merges this process' index into the index file, evicts expired and least recently used
+        entries down to `max_bytes`, and removes the blobs of the evicted entries that no kept entry shares.
+        Other blobs are left alone: another xdist worker may have just written them, before saving its index.
+        """
+        merged = self._load_index()
+        for key, entry in self.index.items():
+            if key not in merged or merged[key]["last_access"] < entry["last_access"]:
+                merged[key] = entry
+
+        now = time.time()
+        entries = sorted(
+            (item for item in merged.items() if now - item[1]["stored_at"] <= self.ttl_s),
+            key=lambda item: item[1]["last_access"], reverse=True,
+        )
+        kept, kept_blobs, total_bytes = {}, set(), 0
+        for key, entry in entries:
+            # Blobs shared by several URLs only count once
+            size = 0 if entry["blob"] in kept_blobs else entry["size"]
+            if total_bytes + size > self.max_bytes:
+                continue
+            kept[key] = entry
+            kept_blobs.add(entry["blob"])
+            total_bytes += size
+
+        for blob in {entry["blob"] for entry in merged.values()} - kept_blobs:
+            (self.blob_dir / blob).unlink(missing_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(kept), encoding="utf-8")
+        os.replace(tmp_path, self.index_path)
+        self.index = kept
+        logger.info(
+            f"Network cache: {self.hits} hits / {self.misses} misses (hit ratio {self.hit_ratio():.0%}), "
+            f"{self.bytes_served / 1024 / 1024:.1f} MB served from cache, "
+            f"{len(kept)} entries / {total_bytes / 1024 / 1024:.1f} MB kept."
+        )
@@ -1,8 +1,11 @@
+from contextlib import nullcontext
 from playwright.sync_api import Page, Locator, expect
 from playwright.sync_api._generated import Response
 from config import WAITING_TIMEOUT_MS
+from tests.web.utils.timeouts import adaptive_timeouts
 
-def deploy_and_wait_for_response(page: Page, deploy_button: Locator, deploy_popup: Locator, ok_button: Locator, deploy_complete_popup: Locator, url_glob: str):
+def deploy_and_wait_for_response(page: Page, deploy_button: Locator, deploy_popup: Locator, ok_button: Locator, deploy_complete_popup: Locator, url_glob: str,
+                                 timeout_ms: int = None):
     """
     Clicks a locator and waits for a specific API response.
     
@@ -13,6 +16,8 @@ def deploy_and_wait_for_response(page: Page, deploy_button: Locator, deploy_popu
         ok_button: The locator of the OK button in the popup.
         deploy_complete_popup: The locator of the deploy completion popup.
         url_glob: A glob pattern for the API URL to wait for (e.g., "**/app.json").
+        timeout_ms: Fixed timeout for the deploy response (e.g. for stress bots). By default the adaptive
+            "deploy" timeout is used and the latency is recorded for it; a fixed timeout records nothing.
 
     Raises:
         AssertionError: If the API response is not successful (status not 2xx).
@@ -22,8 +27,10 @@ def deploy_and_wait_for_response(page: Page, deploy_button: Locator, deploy_popu
         deploy_button.click()
         expect(deploy_popup).to_be_visible(timeout=WAITING_TIMEOUT_MS)
         
-        with page.expect_response(url_glob, timeout=WAITING_TIMEOUT_MS * 2) as response_info:
-            ok_button.click()
+        deploy_timing = adaptive_timeouts.track("deploy") if timeout_ms is None else nullcontext(timeout_ms)
+        with deploy_timing as deploy_timeout_ms:
+            with page.expect_response(url_glob, timeout=deploy_timeout_ms) as response_info:
+                ok_button.click()
         
         response = response_info.value
         if not response.ok:
@@ -0,0 +1,196 @@
+"""
+Historical step timings and performance regression detection.
+
+Stores the step metrics of every run (see step_runner.py) in a local SQLite database,
+keyed by API version, git commit and step id, and compares a run against the rolling
+baseline of the previous runs.
+
+Usage:
+    python -m tests.web.utils.perf_history record report/test_run_api2_steps.jsonl
+    python -m tests.web.utils.perf_history compare --api-version 2.0 --threshold 0.25
+"""
+import argparse
+import json
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from config import PERF_HISTORY_DB, PERF_BASELINE_RUNS, PERF_REGRESSION_THRESHOLD
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    api_version TEXT NOT NULL,
+    git_commit TEXT,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS step_timings (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    step_key TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duration_ms REAL NOT NULL,
+    requests INTEGER,
+    bytes INTEGER,
+    actions INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_step_timings_step ON step_timings(step_key);
+"""
+
+def current_git_commit() -> str:
+    """Short hash of the checked out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# Parametrization id of the API matrix (e.g. "api2.0"), already stored as the run's api_version
+_API_VERSION_ID = re.compile(r"(?:^|-)api[\d.]+(?=-|$)")
+# Group suffix pytest-xdist appends to the node ids with --dist loadgroup, e.g. "@flow-default-test_chatflow_kaiwa"
+_XDIST_GROUP = re.compile(r"@[^@\[\]]*$")
+
+def step_key(record: dict) -> str:
+    """
+    Stable step id, e.g. 'test_chatflow_carousel:5' or 'test_chatflow_definition[mixed_items]:3'.
+    Other parametrization ids are kept, so different parameters never share a key; the API version one and
+    the xdist group are dropped, so sequential and parallel runs share their baseline.
+    """
+    test_name, _, params = _XDIST_GROUP.sub("", record["test"]).split("::")[-1].partition("[")
+    params = _API_VERSION_ID.sub("", params.rstrip("]")).strip("-")
+    return f"{test_name}[{params}]:{record['step_id']}" if params else f"{test_name}:{record['step_id']}"
+
+class PerfHistory:
+    """SQLite store of step timings per run."""
+    def __init__(self, db_path: Path = PERF_HISTORY_DB):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def record_run(self, records: list, git_commit: str = None) -> dict:
+        """
+        Stores one run per API version found in the step records.
+        Returns {api_version: run_id}.
+        """
+        started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        run_ids = {}
+        with self.connection:
+            for record in records:
+                api_version = record["api_version"]
+                if api_version not in run_ids:
+                    run_ids[api_version] = uuid.uuid4().hex
+                    self.connection.execute(
+                        "INSERT INTO runs VALUES (?, ?, ?, ?)",
+                        (run_ids[api_version], api_version, git_commit, started_at),
+                    )
+                self.connection.execute(
+                    "INSERT INTO step_timings VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_ids[api_version], step_key(record), record["status"], record["duration_ms"],
+                     record.get("requests"), record.get("bytes"), record.get("actions")),
+                )
+        return run_ids
+
+    def _runs(self, api_version: str) -> list:
+        """Run ids of an API version, newest first."""
+        rows = self.connection.execute(
+            "SELECT run_id FROM runs WHERE api_version = ? ORDER BY started_at DESC, rowid DESC", (api_version,)
+        )
+        return [row[0] for row in rows]
+
+    def _timings(self, run_ids: list) -> dict:
+        """{step_key: [duration_ms, ...]} of the passed steps of the given runs."""
+        timings = {}
+        if not run_ids:
+            return timings
+        placeholders = ",".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT step_key, duration_ms FROM step_timings WHERE status = 'passed' AND run_id IN ({placeholders})",
+            run_ids,
+        )
+        for key, duration_ms in rows:
+            timings.setdefault(key, []).append(duration_ms)
+        return timings
+
+    def compare(self, api_version: str, threshold: float = PERF_REGRESSION_THRESHOLD,
+                baseline_runs: int = PERF_BASELINE_RUNS) -> list:
+        """
+        Compares the latest run of an API version with the median of the previous `baseline_runs` runs.
+        Returns one dict per step; steps slower than baseline x (1 + threshold) have "regressed": True.
+        """
+        runs = self._runs(api_version)
+        if not runs:
+            return []
+        current = self._timings(runs[:1])
+        baseline = self._timings(runs[1:1 + baseline_runs])
+        results = []
+        for key, durations in sorted(current.items()):
+            # A step can repeat within a run (e.g. a rerun test); compare its median like the baseline's
+            current_ms = statistics.median(durations)
+            if key not in baseline:
+                results.append({"step": key, "current_ms": current_ms, "baseline_ms": None, "change": None, "regressed": False})
+                continue
+            baseline_ms = statistics.median(baseline[key])
+            change = (current_ms - baseline_ms) / baseline_ms if baseline_ms else 0.0
+            results.append({
+                "step": key, "current_ms": current_ms, "baseline_ms": baseline_ms,
+                "change": change, "regressed": change > threshold,
+            })
+        return results
+
+def load_step_records(paths: list) -> list:
+    """Reads the step metrics JSONL files written by the step runner."""
+    records = []
+    for path in paths:
+        with open(path, encoding="utf-8") as metrics_file:
+            records.extend(json.loads(line) for line in metrics_file if line.strip())
+    return records
+
+def _format_ms(value) -> str:
+    return "-" if value is None else f"{value / 1000:.2f}s"
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Step timing history and performance regression detection.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Store the step metrics of a run.")
+    record_parser.add_argument("metrics_files", nargs="+", help="report/*_steps.jsonl files of the run")
+    compare_parser = subparsers.add_parser("compare", help="Compare the latest run with the rolling baseline.")
+    compare_parser.add_argument("--api-version", default="2.0")
+    compare_parser.add_argument("--threshold", type=float, default=PERF_REGRESSION_THRESHOLD,
+                                help="Relative slow-down that counts as a regression (0.25 = 25%%)")
+    compare_parser.add_argument("--baseline-runs", type=int, default=PERF_BASELINE_RUNS)
+    for subparser in (record_parser, compare_parser):
+        subparser.add_argument("--db", default=str(PERF_HISTORY_DB))
+    args = parser.parse_args(argv)
+
+    history = PerfHistory(Path(args.db))
+    try:
+        if args.command == "record":
+            run_ids = history.record_run(load_step_records(args.metrics_files), current_git_commit())
+            for api_version, run_id in run_ids.items():
+                print(f"Recorded run {run_id} for API {api_version}.")
+            return 0
+
+        results = history.compare(args.api_version, args.threshold, args.baseline_runs)
+        if not results:
+            print(f"No recorded runs for API {args.api_version}.")
+            return 0
+        print(f"{'Step':<45} {'Current':>9} {'Baseline':>9} {'Change':>8}")
+        for result in results:
+            change = "new" if result["change"] is None else f"{result['change']:+.0%}"
+            flag = "  REGRESSED" if result["regressed"] else ""
+            print(f"{result['step']:<45} {_format_ms(result['current_ms']):>9} {_format_ms(result['baseline_ms']):>9} {change:>8}{flag}")
+        regressed = [result for result in results if result["regressed"]]
+        print(f"{len(regressed)} of {len(results)} steps regressed by more than {args.threshold:.0%}.")
+        return 1 if regressed else 0
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
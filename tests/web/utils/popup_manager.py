@@ -0,0 +1,50 @@
+import logging
+from collections import Counter
+from weakref import WeakSet
+from playwright.sync_api import Page, Dialog, Locator
+from tests.web.utils.locator_registry import locator_registry
+from tests.web.page_objects.locators import TUTORIALS_POPUP, TUTORIALS_POPUP_CLOSE
+
+logger = logging.getLogger(__name__)
+
+class PopupManager:
+    """
+    Dismisses the popups that open on their own, once registered on a page with `install(page)`.
+
+    The tutorials popup (チャットボットの会話方法を選択, also shown when a bot is opened from the bot
+    list) is handled with `page.add_locator_handler`: before every action or auto-waiting assertion,
+    Playwright checks whether it is visible, closes it and waits until it is hidden. So page objects
+    never wait for it themselves, and nothing waits when it does not open at all.
+    Native JS dialogs are logged; "leave page" (beforeunload) dialogs are accepted, others dismissed.
+    The confirm popups of the flows (delete, image upload, deploy) are part of the tested steps and
+    are not handled here.
+    """
+    def __init__(self):
+        self._pages = WeakSet()
+        self.pages_installed = 0
+        self.dismissed = Counter()
+
+    def install(self, page: Page):
+        """Registers the handlers on a page; does nothing if the page already has them."""
+        if page in self._pages:
+            return
+        page.add_locator_handler(locator_registry.resolve(page, TUTORIALS_POPUP), self._close_tutorials_popup)
+        page.on("dialog", self._handle_dialog)
+        self._pages.add(page)
+        self.pages_installed += 1
+
+    def _close_tutorials_popup(self, popup: Locator):
+        locator_registry.resolve(popup.page, TUTORIALS_POPUP_CLOSE).click()
+        self.dismissed["tutorials popup"] += 1
+
+    def _handle_dialog(self, dialog: Dialog):
+        logger.info(f"Popup manager: {dialog.type} dialog '{dialog.message}'.")
+        if dialog.type == "beforeunload":
+            dialog.accept()
+        else:
+            dialog.dismiss()
+        self.dismissed[f"{dialog.type} dialog"] += 1
+
+    def summary(self) -> str:
+        per_popup = ", ".join(f"{popup}: {count}" for popup, count in self.dismissed.most_common())
+        return f"Popup manager: {sum(self.dismissed.values())} popups closed on {self.pages_installed} pages ({per_popup or 'none'})."
@@ -0,0 +1,58 @@
+import logging
+from collections import Counter
+from fnmatch import fnmatch
+from playwright.sync_api import Route
+
+logger = logging.getLogger(__name__)
+
+def _matches(url: str, url_globs: list) -> bool:
+    # Playwright's "**" spans path separators, which fnmatch's "*" already does
+    return any(fnmatch(url, url_glob.replace("**", "*")) for url_glob in url_globs)
+
+class ResourceBlocker:
+    """
+    Aborts the requests matched by a blocking profile (see tests/web/resource_blocking.py).
+
+    Used as a `context.route("**/*", blocker.handle)` handler; requests that are not blocked
+    go on to the other handlers (mock server, network cache) or the network via `route.fallback()`.
+    Blocked requests are counted per resource type, with the bytes saved estimated per type.
+    """
+    def __init__(self, name: str, profile: dict, estimated_bytes: dict, estimated_bytes_default: int):
+        self.name = name
+        self.resource_types = set(profile["resource_types"])
+        self.url_globs = list(profile["url_globs"])
+        self.allow_url_globs = list(profile["allow_url_globs"])
+        self.estimated_bytes = estimated_bytes
+        self.estimated_bytes_default = estimated_bytes_default
+        self.blocked = Counter()
+
+    def is_empty(self) -> bool:
+        return not self.resource_types and not self.url_globs
+
+    def _blocks(self, request) -> bool:
+        if _matches(request.url, self.url_globs):
+            return True
+        return request.resource_type in self.resource_types and not _matches(request.url, self.allow_url_globs)
+
+    def handle(self, route: Route):
+        """Route handler: aborts blocked requests, passes everything else on."""
+        request = route.request
+        if not self._blocks(request):
+            route.fallback()
+            return
+        self.blocked[request.resource_type] += 1
+        route.abort("blockedbyclient")
+
+    def estimated_bytes_saved(self) -> int:
+        return sum(
+            count * self.estimated_bytes.get(resource_type, self.estimated_bytes_default)
+            for resource_type, count in self.blocked.items()
+        )
+
+    def summary(self) -> str:
+        """One-line report of the requests blocked and the (estimated) bytes saved."""
+        per_type = ", ".join(f"{resource_type}: {count}" for resource_type, count in self.blocked.most_common())
+        return (
+            f"Resource blocking ({self.name}): {sum(self.blocked.values())} requests blocked "
+            f"({per_type or 'none'}), ~{self.estimated_bytes_saved() / 1024 / 1024:.1f} MB saved (estimated)."
+        )
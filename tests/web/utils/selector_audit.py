@@ -0,0 +1,181 @@
+"""
+Selector performance audit of the page object locators.
+
+Resolves every locator the page objects declare (see locator_registry.py) on the screens the audit
+visits, and measures for each one: query time (median of SELECTOR_AUDIT_SAMPLES `count()` calls),
+number of matching elements, and the retries (polls) it needed before it matched. Together with the
+smells of the selector itself (XPath, exact class attribute match, `:has-text()` scan, position in
+the DOM), the locators are ranked so the slow and ambiguous ones are rewritten first.
+
+Usage:
+    pytest tests/web/test_selector_audit.py --selector-audit                 (live staging page)
+    pytest tests/web/test_selector_audit.py --selector-audit --target=mock   (recorded responses)
+    python -m tests.web.utils.selector_audit            (ranked report of the last audit)
+    python -m tests.web.utils.selector_audit --static   (selector smells only, no browser)
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from config import (
+    SELECTOR_AUDIT_FILE, SELECTOR_AUDIT_SAMPLES, SELECTOR_AUDIT_RETRIES,
+    SELECTOR_AUDIT_RETRY_INTERVAL_MS, SELECTOR_AUDIT_SLOW_MS
+    )
+from tests.web.utils.locator_registry import LazyLocator, locator_registry
+
+# (name, pattern on the locator chain, why it is a problem)
+SMELLS = (
+    ("xpath", re.compile(r"""\(['"]//"""), "XPath is evaluated outside the CSS engine"),
+    ("class-attribute", re.compile(r"""\[class=['"][^'"]* [^'"]*['"]\]"""), "exact match on the whole class list breaks when a class is added"),
+    ("has-text", re.compile(r":has-text\("), "scans the text of every candidate element"),
+    ("positional", re.compile(r"\.nth\(|\.first\b|\.last\b"), "depends on the DOM order"),
+)
+# Attribute names of locators meant to match several elements (not ambiguous when they do)
+LIST_NAME_SUFFIXES = ("s", "_list", "_items", "_rows", "_lists")
+
+def selector_smells(chain: str) -> list:
+    return [name for name, pattern, _ in SMELLS if pattern.search(chain)]
+
+def page_object_locators(classes: list) -> dict:
+    """The distinct locator chains of the page object classes: {chain: {"descriptor", "owners"}}."""
+    locators = {}
+    for cls in classes:
+        for name, attribute in vars(cls).items():
+            if isinstance(attribute, LazyLocator):
+                entry = locators.setdefault(repr(attribute), {"descriptor": attribute, "owners": []})
+                entry["owners"].append(f"{cls.__name__}.{name}")
+    return locators
+
+# --- Measuring ---
+def measure_locator(page, locator, samples: int = SELECTOR_AUDIT_SAMPLES, retries: int = SELECTOR_AUDIT_RETRIES,
+                    retry_interval_ms: int = SELECTOR_AUDIT_RETRY_INTERVAL_MS) -> dict:
+    """Polls the locator until it matches (at most `retries` more times), then times `samples` queries."""
+    attempts = 0
+    matches = locator.count()
+    while not matches and attempts < retries:
+        page.wait_for_timeout(retry_interval_ms)
+        attempts += 1
+        matches = locator.count()
+    timings = []
+    for _ in range(samples if matches else 1):
+        start = time.perf_counter()
+        locator.count()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {"matches": matches, "retries": attempts, "query_ms": round(statistics.median(timings), 2)}
+
+def audit_screen(page, classes: list, screen: str, **measure_kwargs) -> list:
+    """Measures every distinct locator of the page objects on the page's current screen."""
+    results = []
+    for chain, entry in page_object_locators(classes).items():
+        try:
+            measurement = measure_locator(page, locator_registry.resolve(page, entry["descriptor"]), **measure_kwargs)
+        except Exception as e:
+            # e.g. a selector the selector engine rejects
+            measurement = {"matches": 0, "retries": 0, "query_ms": None, "error": str(e).splitlines()[0]}
+        results.append({"chain": chain, "owners": entry["owners"], "screen": screen, **measurement})
+    print(f"Audited {len(results)} locators on the {screen} screen.")
+    return results
+
+# --- Ranking ---
+def _is_list_locator(owners: list) -> bool:
+    return all(owner.rsplit(".", 1)[1].endswith(LIST_NAME_SUFFIXES) for owner in owners)
+
+def rank(results: list, slow_ms: float = SELECTOR_AUDIT_SLOW_MS) -> list:
+    """
+    Merges the per-screen results of each chain (slowest screen where it matched) and sorts the
+    locators by measured problems (slow, ambiguous, retried, not found), then smells, then query time.
+    """
+    by_chain = {}
+    for result in results:
+        entry = by_chain.setdefault(result["chain"], {
+            "chain": result["chain"], "owners": result["owners"], "screens": [],
+            "matches": 0, "retries": result["retries"], "query_ms": None, "errors": [],
+        })
+        if result.get("error"):
+            entry["errors"].append(f"{result['screen']}: {result['error']}")
+        if not result["matches"]:
+            continue
+        entry["screens"].append(result["screen"])
+        if entry["query_ms"] is None or result["query_ms"] > entry["query_ms"]:
+            entry.update(matches=result["matches"], retries=result["retries"], query_ms=result["query_ms"])
+    ranked = []
+    for entry in by_chain.values():
+        problems = []
+        if not entry["screens"]:
+            problems.append("not found")
+        else:
+            if entry["query_ms"] > slow_ms:
+                problems.append("slow")
+            if entry["matches"] > 1 and not _is_list_locator(entry["owners"]):
+                problems.append("ambiguous")
+            if entry["retries"]:
+                problems.append("retried")
+        entry["problems"] = problems
+        entry["smells"] = selector_smells(entry["chain"])
+        ranked.append(entry)
+    ranked.sort(key=lambda entry: (
+        len([problem for problem in entry["problems"] if problem != "not found"]),
+        len(entry["smells"]),
+        entry["query_ms"] or 0,
+    ), reverse=True)
+    return ranked
+
+# --- Report ---
+def write_report(ranked: list, path: Path = SELECTOR_AUDIT_FILE, **details) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({**details, "locators": ranked}, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
+
+def load_report(path: Path = SELECTOR_AUDIT_FILE) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+def format_report(ranked: list, top: int = 30) -> str:
+    """Plain-text table of the `top` worst locators, with the locators found on no audited screen last."""
+    found = [entry for entry in ranked if "not found" not in entry["problems"]]
+    missing = [entry for entry in ranked if "not found" in entry["problems"]]
+    lines = [f"{'query_ms':>9} {'matches':>7} {'retries':>7}  {'problems':<24} {'smells':<34} locator"]
+    for entry in found[:top]:
+        lines.append(
+            f"{entry['query_ms']:>9} {entry['matches']:>7} {entry['retries']:>7}  {', '.join(entry['problems']) or '-':<24} "
+            f"{', '.join(entry['smells']) or '-':<34} {', '.join(entry['owners'])}"
+        )
+    if missing:
+        lines.append(f"Not found on any audited screen ({len(missing)}): "
+                     + ", ".join(owner for entry in missing for owner in entry["owners"]))
+    return "\n".join(lines)
+
+def format_static(classes: list) -> str:
+    """Smells of every page object locator, without a browser."""
+    lines = []
+    for chain, entry in page_object_locators(classes).items():
+        smells = selector_smells(chain)
+        if smells:
+            lines.append(f"{', '.join(smells):<34} {', '.join(entry['owners'])}\n{'':<34} {chain}")
+    descriptions = "\n".join(f"  {name}: {description}" for name, _, description in SMELLS)
+    return f"{len(lines)} locators with selector smells:\n{descriptions}\n" + "\n".join(lines)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the ranked selector audit report of the page object locators.")
+    parser.add_argument("report", nargs="?", default=str(SELECTOR_AUDIT_FILE), help="Report written by test_selector_audit")
+    parser.add_argument("--static", action="store_true", help="Only list the selector smells (no audit run needed)")
+    parser.add_argument("--top", type=int, default=30, help="Number of ranked locators to show")
+    args = parser.parse_args(argv)
+    if args.static:
+        from tests.web import page_objects
+        classes = [getattr(page_objects, name) for name in dir(page_objects) if isinstance(getattr(page_objects, name), type)]
+        print(format_static(classes))
+        return 0
+    if not Path(args.report).is_file():
+        print(f"No selector audit report at {args.report}; run test_selector_audit with --selector-audit first.")
+        return 1
+    report = load_report(Path(args.report))
+    print(f"Selector audit (API {report.get('api_version', '-')}, {report.get('target', '-')}, screens: {', '.join(report.get('screens', []))}):")
+    print(format_report(report["locators"], args.top))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import html
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Callable
+from playwright.sync_api import Page, Locator, Mouse, Keyboard, Error as PlaywrightError
+
+logger = logging.getLogger(__name__)
+
+# --- Playwright action counting ---
+# Every user-level action goes through one of these methods, so wrapping them once
+# gives a cheap global action counter that the runner reads before/after each step.
+_COUNTED_ACTIONS = {
+    Locator: ("click", "dblclick", "fill", "press", "press_sequentially", "type", "hover", "check",
+              "uncheck", "select_option", "set_input_files", "tap", "focus", "clear"),
+    Mouse: ("click", "dblclick", "move", "down", "up", "wheel"),
+    Keyboard: ("press", "type", "insert_text", "down", "up"),
+}
+_action_count = 0
+
+def _counting(method: Callable) -> Callable:
+    def wrapper(*args, **kwargs):
+        global _action_count
+        _action_count += 1
+        return method(*args, **kwargs)
+    wrapper.__wrapped__ = method
+    return wrapper
+
+def _install_action_counter():
+    """Wraps the Playwright action methods once (idempotent)."""
+    for cls, names in _COUNTED_ACTIONS.items():
+        for name in names:
+            method = getattr(cls, name, None)
+            if method is not None and not hasattr(method, "__wrapped__"):
+                setattr(cls, name, _counting(method))
+
+def action_count() -> int:
+    """Number of Playwright actions issued so far in this process."""
+    return _action_count
+
+# --- Network accounting ---
+class NetworkCounter:
+    """Counts requests and transferred bytes (from Content-Length) of a browser context."""
+    def __init__(self, page: Page):
+        self.requests = 0
+        self.bytes = 0
+        self.context = page.context
+        self.context.on("request", self._on_request)
+        self.context.on("response", self._on_response)
+
+    def close(self):
+        """Stops counting; needed when the context outlives the test (--reuse-contexts)."""
+        self.context.remove_listener("request", self._on_request)
+        self.context.remove_listener("response", self._on_response)
+
+    def _on_request(self, request):
+        self.requests += 1
+
+    def _on_response(self, response):
+        content_length = response.headers.get("content-length")
+        if content_length and content_length.isdigit():
+            self.bytes += int(content_length)
+
+def _step_id(success_msg: str, position: int) -> str:
+    """Extracts the step id from messages like '[3] Created ...', falling back to the position."""
+    match = re.match(r"\s*\[(\w+)\]", success_msg)
+    return match.group(1) if match else str(position)
+
+# --- Step executor ---
+class StepRunner:
+    """
+    Runs a test's `(step_func, success_msg, failure_msg)` steps in order and measures each one.
+
+    For every step it records wall time, number of network requests, bytes transferred
+    and Playwright action count. The first failing step is logged and re-raised, so pytest
+    still marks the test as failed.
+    """
+    def __init__(self, page: Page):
+        _install_action_counter()
+        self.page = page
+        self.network = NetworkCounter(page)
+        self.metrics = []
+
+    def close(self):
+        """Detaches the network counter from the page's context."""
+        self.network.close()
+
+    def run(self, test_steps: list):
+        """Executes the steps, stopping at (and re-raising) the first failure."""
+        for position, (step_func, success_msg, failure_msg) in enumerate(test_steps, start=1):
+            start_requests, start_bytes, start_actions = self.network.requests, self.network.bytes, action_count()
+            start = time.perf_counter()
+            status = "passed"
+            try:
+                step_func()
+            except PlaywrightError as e: # Catching specific Playwright errors is good practice
+                status = "failed"
+                logger.error(f"Test FAILED: {failure_msg}")
+                logger.error(f"--- Playwright Error Details ---\n{e}\n-------------------------------")
+                raise # Re-raise the exception to make sure Pytest marks the test as failed
+            except Exception as e: # Catch any other unexpected errors
+                status = "failed"
+                logger.error(f"Test FAILED: {failure_msg}")
+                logger.error(f"--- Unexpected Error Details ---\n{e}\n---------------------------------")
+                raise # IMPORTANT: Always re-raise the exception
+            finally:
+                step = {
+                    "step_id": _step_id(success_msg, position),
+                    "description": success_msg if status == "passed" else failure_msg,
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                    "requests": self.network.requests - start_requests,
+                    "bytes": self.network.bytes - start_bytes,
+                    "actions": action_count() - start_actions,
+                }
+                self.metrics.append(step)
+            logger.info(
+                f"Test PASSED: {success_msg} "
+                f"({step['duration_ms'] / 1000:.2f}s, {step['requests']} requests, {step['actions']} actions)"
+            )
+
+# --- Reporting ---
+def step_metrics_path(config) -> Path:
+    """Structured step metrics live next to the text log, e.g. report/test_run_api2_steps.jsonl."""
+    log_file = Path(config.option.log_file or "report/test_run.log")
+    return log_file.with_name(f"{log_file.stem}_steps.jsonl")
+
+def run_step_metrics_files(config) -> list:
+    """
+    All metrics files of this run: its own file and the per-worker files of parallel runs
+    (e.g. test_run_api2_gw0_steps.jsonl), but not the files of other runs sharing the report folder.
+    """
+    path = step_metrics_path(config)
+    worker_files = path.parent.glob(f"{Path(config.option.log_file or 'report/test_run.log').stem}_gw*_steps.jsonl")
+    return sorted(file for file in {path, *worker_files} if file.is_file())
+
+def reset_step_metrics(config):
+    """Starts every run with empty metrics files (done once, by the controller in parallel runs)."""
+    if hasattr(config, "workerinput"):
+        return
+    for path in run_step_metrics_files(config):
+        path.unlink(missing_ok=True)
+
+def write_step_metrics(config, nodeid: str, api_version: str, metrics: list):
+    """Appends one JSON record per step to the structured metrics file."""
+    path = step_metrics_path(config)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as metrics_file:
+        for step in metrics:
+            metrics_file.write(json.dumps({"test": nodeid, "api_version": api_version, **step}, ensure_ascii=False) + "\n")
+
+def step_metrics_html(metrics: list) -> str:
+    """Renders the per-step timing table shown in the pytest-html report."""
+    rows = "".join(
+        f"<tr><td>{step['step_id']}</td><td>{html.escape(step['description'])}</td><td>{step['status']}</td>"
+        f"<td>{step['duration_ms'] / 1000:.2f}</td><td>{step['requests']}</td>"
+        f"<td>{step['bytes'] / 1024:.1f}</td><td>{step['actions']}</td></tr>"
+        for step in metrics
+    )
+    return (
+        "<table class='step-metrics'><thead><tr><th>Step</th><th>Description</th><th>Status</th>"
+        "<th>Time (s)</th><th>Requests</th><th>KB</th><th>Actions</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table>"
+    )
@@ -0,0 +1,103 @@
+"""
+Large-scale chatflow stress scenarios and their scaling curves.
+
+Generates bots of a configurable scale - N groups x M items x K button reactions per item - as
+chatflow definitions (see chatflow_compiler.py). The items alternate between the text items of
+CreateChat (name + message) and the cards of CreateCarousel (name + title). test_chatflow_scaling
+grows the bot in steps and measures it at every step: time-to-interactive of the chatflow page,
+group pane render time and deploy latency. The resulting curve is stored per API version and scale.
+
+Usage:
+    pytest tests/web/test_stress.py --stress 20x30x2 --api-version all
+    python -m tests.web.utils.stress_scenarios report/stress
+"""
+import argparse
+import json
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from config import STRESS_CURVE_DIR
+from tests.web.utils.perf_history import current_git_commit
+
+# Timings of one measured size, in the column order of the report
+CURVE_COLUMNS = ("groups", "items", "reactions", "tti_ms", "group_pane_ms", "deploy_ms")
+
+def parse_scale(text: str) -> tuple:
+    """'20x30x2' -> (20 groups, 30 items per group, 2 reactions per item)."""
+    match = re.fullmatch(r"\s*(\d+)\s*x\s*(\d+)\s*x\s*(\d+)\s*", text)
+    if not match or int(match.group(1)) < 1 or int(match.group(2)) < 1:
+        raise ValueError(f"Stress scale must look like NxMxK (e.g. 20x30x2), got '{text}'.")
+    return tuple(int(value) for value in match.groups())
+
+def stress_group_name(number: int) -> str:
+    """Zero padded, so the names sort like the groups were created."""
+    return f"Stress{number:03d}"
+
+def stress_definition(first_group: int, last_group: int, items: int, reactions: int) -> dict:
+    """Definition of the stress groups first_group..last_group (1-based, inclusive)."""
+    groups = []
+    for group_number in range(first_group, last_group + 1):
+        group_items = []
+        for item_number in range(1, items + 1):
+            name = f"S{group_number}-{item_number}"
+            if item_number % 2:
+                item = {"rt": "text", "name": f"{name} text", "msg": f"Stress message {name}"}
+            else:
+                item = {"rt": "card", "name": f"{name} card", "title": f"Stress card {name}"}
+            if reactions:
+                item["reactions"] = [{"type": "button", "name": f"{name} button{k}"} for k in range(1, reactions + 1)]
+            group_items.append(item)
+        groups.append({"group": stress_group_name(group_number), "items": group_items})
+    return {"name": f"stress_{first_group}-{last_group}x{items}x{reactions}", "groups": groups}
+
+def measurement_points(groups: int, points: int) -> list:
+    """Numbers of groups at which the bot is measured, evenly spread and ending at `groups`."""
+    points = max(1, min(points, groups))
+    return sorted({round(groups * step / points) for step in range(1, points + 1)})
+
+# --- Scaling curves ---
+def curve_path(api_version: str, scale: tuple, curve_dir: Path = STRESS_CURVE_DIR) -> Path:
+    groups, items, reactions = scale
+    return Path(curve_dir) / f"stress_curve_api{api_version}_{groups}x{items}x{reactions}.json"
+
+def write_curve(api_version: str, scale: tuple, points: list, curve_dir: Path = STRESS_CURVE_DIR) -> Path:
+    """Stores the measured points of a run (the last run per API version and scale is kept)."""
+    path = curve_path(api_version, scale, curve_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    curve = {
+        "api_version": api_version,
+        "scale": "x".join(str(value) for value in scale),
+        "git_commit": current_git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "points": points,
+    }
+    path.write_text(json.dumps(curve, indent=2), encoding="utf-8")
+    return path
+
+def load_curves(curve_dir: Path = STRESS_CURVE_DIR) -> list:
+    return [json.loads(path.read_text(encoding="utf-8")) for path in sorted(Path(curve_dir).glob("stress_curve_*.json"))]
+
+def format_curve(curve: dict) -> str:
+    """Plain-text table of one curve."""
+    lines = [
+        f"Stress curve API {curve['api_version']} ({curve['scale']}, commit {curve.get('git_commit') or '-'}):",
+        "  " + "".join(f"{column:>14}" for column in CURVE_COLUMNS),
+    ]
+    for point in curve["points"]:
+        lines.append("  " + "".join(f"{point.get(column, '-'):>14}" for column in CURVE_COLUMNS))
+    return "\n".join(lines)
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the stored stress scaling curves per API version.")
+    parser.add_argument("curve_dir", nargs="?", default=str(STRESS_CURVE_DIR), help="Folder with the stress_curve_*.json files")
+    args = parser.parse_args(argv)
+    curves = load_curves(Path(args.curve_dir))
+    if not curves:
+        print(f"No stress curves found in {args.curve_dir}.")
+    for curve in curves:
+        print(format_curve(curve))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from config import (
+    WAITING_TIMEOUT_MS, ADAPTIVE_TIMEOUT_FILE, ADAPTIVE_TIMEOUT_MARGIN, ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_FLOOR_MS, ADAPTIVE_TIMEOUT_CEILING_MS
+    )
+
+logger = logging.getLogger(__name__)
+
+# Timeouts used until enough latencies of an operation class have been observed.
+DEFAULT_TIMEOUTS_MS = {
+    "login": WAITING_TIMEOUT_MS,
+    "deploy": WAITING_TIMEOUT_MS * 2,
+    "image_upload": WAITING_TIMEOUT_MS * 2,
+    "api_preview": WAITING_TIMEOUT_MS * 2,
+}
+MAX_SAMPLES_PER_OPERATION = 500
+
+def _percentile(samples: list, percent: float) -> float:
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+class AdaptiveTimeouts:
+    """
+    Learns how long each operation class takes and derives its timeout from it.
+
+    Latencies are persisted in a local JSON file across runs. Once an operation has at least
+    `min_samples` observations, its timeout is p99 x `margin`, clamped to [floor_ms, ceiling_ms];
+    before that the fixed defaults are used.
+    """
+    def __init__(self, path: Path, margin: float, min_samples: int, floor_ms: int, ceiling_ms: int):
+        self.path = Path(path)
+        self.margin = margin
+        self.min_samples = min_samples
+        self.floor_ms = floor_ms
+        self.ceiling_ms = ceiling_ms
+        self._samples = self._load().get("samples", {})
+        self._new_samples = {}
+        # Off for runs whose latencies say nothing about staging (e.g. --target=mock)
+        self.recording = True
+
+    def _load(self) -> dict:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def timeout_for(self, operation: str) -> int:
+        """Returns the timeout (ms) to use for an operation class."""
+        samples = self._samples.get(operation, [])
+        if len(samples) < self.min_samples:
+            return DEFAULT_TIMEOUTS_MS.get(operation, WAITING_TIMEOUT_MS)
+        timeout_ms = _percentile(samples, 99) * self.margin
+        return int(min(self.ceiling_ms, max(self.floor_ms, timeout_ms)))
+
+    def record(self, operation: str, elapsed_ms: float):
+        """Records one observed latency of an operation class."""
+        if not self.recording:
+            return
+        self._samples.setdefault(operation, []).append(round(elapsed_ms, 1))
+        self._new_samples.setdefault(operation, []).append(round(elapsed_ms, 1))
+
+    @contextmanager
+    def track(self, operation: str):
+        """
+        Yields the timeout to use for an operation and records its latency if it succeeds.
+
+        Usage:
+            with adaptive_timeouts.track("deploy") as timeout_ms:
+                expect(popup).to_be_visible(timeout=timeout_ms)
+        """
+        start = time.perf_counter()
+        yield self.timeout_for(operation)
+        self.record(operation, (time.perf_counter() - start) * 1000)
+
+    def save(self):
+        """
+        Merges this run's samples into the stats file and stores the percentiles next to them.
+        Merging (instead of overwriting) keeps the samples of parallel xdist workers.
+        """
+        if not self._new_samples:
+            return
+        samples = self._load().get("samples", {})
+        for operation, new_samples in self._new_samples.items():
+            samples[operation] = (samples.get(operation, []) + new_samples)[-MAX_SAMPLES_PER_OPERATION:]
+        percentiles = {
+            operation: {
+                "count": len(values),
+                "p50": _percentile(values, 50),
+                "p90": _percentile(values, 90),
+                "p99": _percentile(values, 99),
+            }
+            for operation, values in samples.items() if values
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"samples": samples, "percentiles": percentiles}, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self._samples = samples
+        self._new_samples = {}
+        for operation, stats in percentiles.items():
+            logger.info(
+                f"Latency {operation}: p50={stats['p50']:.0f}ms p99={stats['p99']:.0f}ms "
+                f"(n={stats['count']}) -> timeout {self.timeout_for(operation)}ms"
+            )
+
+adaptive_timeouts = AdaptiveTimeouts(
+    ADAPTIVE_TIMEOUT_FILE, ADAPTIVE_TIMEOUT_MARGIN, ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+    ADAPTIVE_TIMEOUT_FLOOR_MS, ADAPTIVE_TIMEOUT_CEILING_MS
+)
@@ -0,0 +1,173 @@
+import logging
+import time
+from fnmatch import fnmatch
+from typing import Callable
+from urllib.parse import urlsplit
+from playwright.sync_api import Page, Locator, Request
+from config import UPLOAD_MAX_IN_FLIGHT
+from tests.web.utils.timeouts import adaptive_timeouts
+from tests.web.utils.media_registry import MediaRegistry
+from tests.web.test_data import BOT_ACTION_API
+
+logger = logging.getLogger(__name__)
+
+# How often pending uploads are checked while waiting (Playwright dispatches the network events meanwhile)
+POLL_INTERVAL_MS = 50
+
+def is_file_upload(request: Request) -> bool:
+    """File uploads are posted as multipart forms."""
+    return request.headers.get("content-type", "").startswith("multipart/")
+
+class UploadPipeline:
+    """
+    Runs media uploads to /api/bot/action concurrently.
+
+    `submit`/`submit_file` trigger an upload and return immediately; at most `max_in_flight` uploads are
+    pending at any time (a further submit waits for a free slot). `wait_all` waits for every response,
+    raises on failed or timed out uploads and returns the time each upload took.
+    Every upload gets the adaptive "image_upload" timeout from its own start, and its duration is recorded.
+
+    Each upload is matched to the first /api/bot/action POST its `matches` predicate accepts,
+    in submission order. The page listeners only exist between the first submit and `wait_all`,
+    so a pooled page does not keep them.
+
+    With a MediaRegistry (--reuse-media), file uploads record the asset URL the server returns, and
+    files already on the server are given by URL where the item accepts one (`enter_url`).
+    """
+    def __init__(self, page: Page, max_in_flight: int = UPLOAD_MAX_IN_FLIGHT, url_glob: str = BOT_ACTION_API,
+                 media_registry: MediaRegistry = None):
+        self.page = page
+        self.max_in_flight = max_in_flight
+        self.url_glob = url_glob
+        self.media_registry = media_registry
+        self.uploads = []
+        self._listening = False
+
+    # --- Network events ---
+    def _listen(self, attach: bool):
+        if attach == self._listening:
+            return
+        method = self.page.on if attach else self.page.remove_listener
+        method("request", self._on_request)
+        method("response", self._on_response)
+        method("requestfailed", self._on_request_failed)
+        self._listening = attach
+
+    def _on_request(self, request: Request):
+        if request.method != "POST" or not fnmatch(request.url.split("?")[0], self.url_glob.replace("**", "*")):
+            return
+        for upload in self.uploads:
+            if upload["request"] is None and upload["matches"](request):
+                upload["request"] = request
+                return
+
+    def _upload_of(self, request: Request) -> dict:
+        return next((upload for upload in self.uploads if upload["request"] is request), None)
+
+    def _on_response(self, response):
+        upload = self._upload_of(response.request)
+        if upload and upload["finished"] is None:
+            upload["finished"] = time.perf_counter()
+            upload["response"] = response
+
+    def _on_request_failed(self, request: Request):
+        upload = self._upload_of(request)
+        if upload and upload["finished"] is None:
+            upload["finished"] = time.perf_counter()
+            upload["error"] = request.failure
+
+    # --- Waiting ---
+    def _pending(self) -> list:
+        return [upload for upload in self.uploads if upload["finished"] is None]
+
+    def _poll(self):
+        """Raises for pending uploads past their timeout, otherwise lets the network events come in."""
+        now = time.perf_counter()
+        for upload in self._pending():
+            if (now - upload["started"]) * 1000 > upload["timeout_ms"]:
+                state = "no request sent" if upload["request"] is None else "no response"
+                raise AssertionError(f"Upload '{upload['label']}' timed out after {upload['timeout_ms']}ms ({state}).")
+        self.page.wait_for_timeout(POLL_INTERVAL_MS)
+
+    # --- Uploads ---
+    def submit(self, label: str, trigger: Callable[[], None], matches: Callable[[Request], bool] = is_file_upload) -> dict:
+        """Starts an upload: `trigger` performs the UI action that sends it. Returns its bookkeeping entry."""
+        self._listen(True)
+        try:
+            while len(self._pending()) >= self.max_in_flight:
+                self._poll()
+            upload = {
+                "label": label, "matches": matches, "request": None, "response": None, "error": None,
+                "timeout_ms": adaptive_timeouts.timeout_for("image_upload"),
+                "started": time.perf_counter(), "finished": None, "file_path": None, "reused": False,
+            }
+            self.uploads.append(upload)
+            trigger()
+        except Exception:
+            self._listen(False)
+            raise
+        return upload
+
+    def _origin(self) -> str:
+        parts = urlsplit(self.page.url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _known_url(self, file_path: str) -> str:
+        """The registered asset URL of the file, checked once per session with a HEAD request."""
+        url = self.media_registry.url_for(self._origin(), file_path)
+        if url is None or url in self.media_registry.validated:
+            return url
+        if not self.page.request.head(url).ok:
+            self.media_registry.forget(self._origin(), file_path)
+            return None
+        self.media_registry.validated.add(url)
+        return url
+
+    def submit_file(self, label: str, trigger_locator: Locator, file_path: str, enter_url: Callable[[str], None] = None):
+        """
+        Starts a file upload through the file chooser opened by `trigger_locator`.
+        `enter_url(url)` gives the item a URL instead; it is used when the registry knows the file's asset URL.
+        """
+        if self.media_registry and enter_url:
+            url = self._known_url(file_path)
+            if url:
+                upload = self.submit(f"{label} (reused URL)", lambda: enter_url(url), matches=lambda request: not is_file_upload(request))
+                upload.update(file_path=file_path, reused=True)
+                return
+        def choose_file():
+            with self.page.expect_file_chooser() as fc_info:
+                trigger_locator.click()
+            fc_info.value.set_files(file_path)
+        self.submit(label, choose_file)["file_path"] = file_path
+
+    def wait_all(self) -> list:
+        """
+        Waits for every submitted upload and returns [{"label", "duration_ms"}] in submission order.
+        Raises AssertionError for uploads that failed or timed out.
+        """
+        try:
+            while self._pending():
+                self._poll()
+        finally:
+            self._listen(False)
+        uploads, self.uploads = self.uploads, []
+
+        timings, failures = [], []
+        for upload in uploads:
+            duration_ms = round((upload["finished"] - upload["started"]) * 1000, 1)
+            response = upload["response"]
+            if upload["error"] or not response.ok:
+                detail = upload["error"] or f"status {response.status}: {response.text()}"
+                failures.append(f"'{upload['label']}' ({detail})")
+                continue
+            if self.media_registry and upload["file_path"]:
+                if upload["reused"]:
+                    self.media_registry.count_reuse(upload["file_path"])
+                else:
+                    self.media_registry.remember_upload(self._origin(), upload["file_path"], response)
+            adaptive_timeouts.record("image_upload", duration_ms)
+            timings.append({"label": upload["label"], "duration_ms": duration_ms})
+            logger.info(f"Uploaded '{upload['label']}' in {duration_ms / 1000:.2f}s.")
+        if failures:
+            raise AssertionError(f"Upload API failed for {', '.join(failures)}")
+        return timings